@@ -5,21 +5,39 @@
 import base64
 import json
 import asyncio
+from collections import OrderedDict
+from typing import Optional
 import cv2
 import numpy as np
 
-from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, Response
 from sqlalchemy.orm import Session
 
 from backend.database import get_db
 from backend.models.schemas import DetectionRequest
-from backend.services.face_detection import process_detection
+from backend.services import face_detection
+from backend.services.face_detection import process_detection, detect_faces_in_frames
+from backend.services.adaptive_resolution import DetResolutionController
+from backend.services.roi_detection import RoiDetectionPlanner
+from backend.services.recognition_cache import RecognitionCache
+from backend.services.frame_preprocessing import FramePreprocessor
+from backend.services.inference_server import inference_server
+from backend.services.snapshot_service import SnapshotScheduler, snapshot_service
+from backend.config import (
+    INFERENCE_BATCHING_ENABLED, DEPLOYMENT_PROFILE, ADAPTIVE_DET_ENABLED, ROI_DETECTION_ENABLED, REC_CACHE_ENABLED,
+    PREPROC_GATED_ENABLED, DECODE_SCALE_ENABLED, SNAPSHOT_SERVICE_ENABLED, COMPACT_RESPONSE_ENABLED,
+)
 from backend.services.temporal_filter import apply_temporal_filter
 from backend.services.bank_manager import (
     add_embedding_to_bank_async,
     add_embedding_to_dynamic_bank_async
 )
-from backend.utils.image_utils import base64_to_image
+from backend.utils.image_utils import base64_to_image, base64_to_buffer
+from backend.utils.frame_protocol import decode_binary_frame, split_binary_frame, FLAG_SCENE_CUT
+from backend.utils.jpeg_decode import decode_for_detection, decode_summary
+from backend.utils.response_schema import compact_result
+from backend.utils.model_profile import stage_timings
+from backend.utils.device_config import get_device_info
 from backend.utils.websocket_manager import (
     active_connections,
     register_connection,
@@ -29,14 +47,70 @@ from backend.utils.websocket_manager import (
 
 router = APIRouter()
 
+# /api/detect는 연결 상태가 없으므로 스냅샷 스케줄러를 (클라이언트 주소, stream_id)별로 보관
+# (클라이언트끼리 같은 person_id의 스냅샷 간격을 공유하지 않도록, 오래 안 쓴 것부터 삭제)
+HTTP_SNAPSHOT_STREAMS = 256
+http_snapshots: "OrderedDict[tuple, SnapshotScheduler]" = OrderedDict()
+
+
+def http_snapshot_scheduler(http_request: Request, stream_id: Optional[str]) -> SnapshotScheduler:
+    """HTTP 클라이언트 / 스트림의 스냅샷 스케줄러"""
+    key = (http_request.client.host if http_request.client else None, stream_id)
+    scheduler = http_snapshots.get(key)
+    if scheduler is None:
+        scheduler = http_snapshots[key] = SnapshotScheduler()
+        while len(http_snapshots) > HTTP_SNAPSHOT_STREAMS:
+            http_snapshots.popitem(last=False)
+    http_snapshots.move_to_end(key)
+    return scheduler
+
+
+def new_stream_state() -> dict:
+    """스트림 하나의 tracking / 캐시 상태 (연결의 기본 스트림, 바이너리 프로토콜의 stream_id별)"""
+    return {
+        "match_counters": {},  # person_id별 연속 매칭 프레임 카운터 (하위 호환용 유지)
+        "match_history": {},   # person_id별 최근 프레임 이력: {person_id: [(confidence, matched), ...]}
+        "tracking_state": {
+            "tracks": {}  # bbox tracking 상태
+        },
+        # 스트림별 detection 입력 크기 (얼굴 크기 분포 기반, ADAPTIVE_DET_ENABLED일 때만)
+        "det_resolution": DetResolutionController() if ADAPTIVE_DET_ENABLED else None,
+        # 키프레임 사이에는 트랙 주변 ROI만 탐지 (ROI_DETECTION_ENABLED일 때만)
+        "roi_planner": RoiDetectionPlanner() if ROI_DETECTION_ENABLED else None,
+        # 얼굴별 임베딩 / 매칭 결과 재사용 (REC_CACHE_ENABLED일 때만)
+        "recognition_cache": RecognitionCache() if REC_CACHE_ENABLED else None,
+        # 밝기 / 선명도 통계 기반 조건부 전처리 (PREPROC_GATED_ENABLED일 때만)
+        "preprocessor": FramePreprocessor() if PREPROC_GATED_ENABLED else None,
+        # 인물별 스냅샷 간격 / 최고 화질 후보 (SNAPSHOT_SERVICE_ENABLED일 때만)
+        "snapshots": SnapshotScheduler() if SNAPSHOT_SERVICE_ENABLED else None
+    }
+
+
+def stream_state(websocket: WebSocket, stream_id: int) -> dict:
+    """연결의 stream_id 상태 (0 = 연결 상태 자체, JSON 프로토콜과 공유)"""
+    state = connection_states[websocket]
+    if stream_id == 0:
+        return state
+    return state["streams"].setdefault(stream_id, new_stream_state())
+
+
+def all_stream_states() -> list:
+    """모든 연결의 모든 스트림 상태 (health 통계용)"""
+    states = []
+    for state in list(connection_states.values()):
+        states.append(state)
+        states.extend(state.get("streams", {}).values())
+    return states
+
 
 @router.post("/api/detect")
-async def detect_faces(request: DetectionRequest, db: Session = Depends(get_db)):
+async def detect_faces(request: DetectionRequest, http_request: Request, db: Session = Depends(get_db)):
     """
     얼굴 감지 및 인식 (HTTP API - 호환성 유지)
     
     Args:
-        request: DetectionRequest (image: Base64, suspect_id: 선택적)
+        request: DetectionRequest (image: Base64, suspect_id: 선택적, stream_id: 선택적)
+        http_request: 클라이언트 주소 (스냅샷 스케줄러 구분용)
         db: 데이터베이스 세션
     
     Returns:
@@ -64,7 +138,13 @@ async def detect_faces(request: DetectionRequest, db: Session = Depends(get_db))
     snapshot_base64 = None
     video_timestamp = None
     
-    if result.get("alert"):  # 범죄자 감지됨
+    snapshots = []
+    
+    if result.get("alert") and SNAPSHOT_SERVICE_ENABLED:
+        # 얼굴 crop을 스레드 풀에서 인코딩 (클라이언트 / 스트림의 인물별 간격마다 한 장, 응답에는 URL만)
+        scheduler = http_snapshot_scheduler(http_request, request.stream_id)
+        snapshots = scheduler.capture(result.get("detections", []), lambda: frame)
+    elif result.get("alert"):  # 범죄자 감지됨
         print(f"🚨 HTTP API: 범죄자 감지됨! 스냅샷 생성 중...")
         try:
             # 프레임을 JPEG로 인코딩하여 Base64 생성
@@ -79,10 +159,10 @@ async def detect_faces(request: DetectionRequest, db: Session = Depends(get_db))
             import traceback
             traceback.print_exc()
     
-    # 4. 결과 반환
+    # 4. 결과 반환 (COMPACT_RESPONSE_ENABLED면 정수 bbox / 짧은 상태 코드 / 임베딩 없는 학습 이벤트)
     response = {
         "success": True,
-        **result
+        **(compact_result(result) if COMPACT_RESPONSE_ENABLED else result)
     }
     
     # 범죄자 감지 시 스냅샷 추가
@@ -90,10 +170,22 @@ async def detect_faces(request: DetectionRequest, db: Session = Depends(get_db))
         response["snapshot_base64"] = snapshot_base64
         response["video_timestamp"] = video_timestamp  # None이지만 필드 추가
         print(f"📤 HTTP API 응답에 스냅샷 포함: {len(snapshot_base64)} bytes")
+    if snapshots:
+        response["snapshot_url"] = snapshots[0]["snapshot_url"]
+        response["snapshots"] = snapshots
     
     return response
 
 
+@router.get("/api/snapshots/{snapshot_id}")
+async def get_snapshot(snapshot_id: str):
+    """스냅샷 JPEG (감지 응답의 snapshot_url, 인코딩 중이면 완료까지 대기)"""
+    data = await snapshot_service.get(snapshot_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+    return Response(content=data, media_type="image/jpeg", headers={"Cache-Control": "private, max-age=86400"})
+
+
 @router.websocket("/ws/detect")
 async def websocket_detect(websocket: WebSocket):
     """
@@ -147,13 +239,10 @@ async def websocket_detect(websocket: WebSocket):
         # 연결 등록
         active_connections.add(websocket)
         connection_states[websocket] = {
-            "suspect_ids": [],  # 여러 명 선택 가능
+            "suspect_ids": [],  # 여러 명 선택 가능 (연결의 모든 스트림 공통)
             "connected_at": asyncio.get_event_loop().time(),
-            "match_counters": {},  # person_id별 연속 매칭 프레임 카운터 (하위 호환용 유지)
-            "match_history": {},   # person_id별 최근 프레임 이력: {person_id: [(confidence, matched), ...]}
-            "tracking_state": {
-                "tracks": {}  # bbox tracking 상태
-            }
+            **new_stream_state(),  # 기본 스트림 (JSON 프로토콜, 바이너리 stream_id 0)
+            "streams": {}  # 바이너리 프로토콜의 stream_id(1 이상)별 상태
         }
         print(f"✅ [메인] WebSocket 연결됨 (총 {len(active_connections)}개 연결)")
         
@@ -167,11 +256,209 @@ async def websocket_detect(websocket: WebSocket):
             pass
         return
     
+    async def handle_frame(frame, frame_id, video_time, stream, suspect_id=None, suspect_ids=None,
+                           stream_id=None, force_keyframe=False, source=None):
+        """
+        디코딩된 프레임 한 장 처리 → 감지 결과 전송 + 학습 이벤트 저장 (JSON / 바이너리 프로토콜 공통)
+        
+        Args:
+            stream: 스트림별 상태 (JSON 프로토콜은 연결 상태 자체, 바이너리는 stream_id별 상태)
+            stream_id: 바이너리 프로토콜의 stream_id (응답에 포함, JSON 프로토콜은 None)
+            force_keyframe: 클라이언트가 알린 장면 전환 (ROI detection 사용 시 전체 프레임 탐지)
+            source: frame을 축소 디코딩한 ScaledFrame (DECODE_SCALE_ENABLED일 때, 박스 / 스냅샷은 원본 기준)
+        """
+        # 이 스트림의 탐지 영역 (ROI detection 사용 시, None이면 전체 프레임 = 키프레임)
+        roi_planner = stream.get("roi_planner")
+        rois = roi_planner.plan(frame, force_keyframe=force_keyframe) if roi_planner is not None else None
+        
+        # 이 스트림의 detection 입력 크기 (적응형 크기 사용 시, 전체 프레임 탐지에만 적용)
+        det_resolution = stream.get("det_resolution")
+        det_size = det_resolution.next_size() if det_resolution is not None and rois is None else None
+        
+        # 움직임 / 자세 변화가 없는 얼굴은 직전 임베딩 재사용
+        rec_cache = stream.get("recognition_cache")
+        preprocessor = stream.get("preprocessor")
+        
+        # 탐지/특징 추출은 다른 연결의 프레임과 함께 배치 처리 (별도 스레드, 이벤트 루프 비차단)
+        if INFERENCE_BATCHING_ENABLED:
+            detected = await inference_server.submit(frame, det_size=det_size, rois=rois,
+                                                     rec_cache=rec_cache, preprocessor=preprocessor, source=source,
+                                                     producer=id(websocket))
+        elif any(hint is not None for hint in (det_resolution, roi_planner, rec_cache, preprocessor, source)):
+            detected = detect_faces_in_frames([frame], det_sizes=[det_size], rois=[rois],
+                                              rec_caches=[rec_cache], preprocessors=[preprocessor],
+                                              sources=[source])[0]
+        else:
+            detected = None
+        if det_resolution is not None and rois is None:
+            det_resolution.observe(*detected)
+        if roi_planner is not None:
+            roi_planner.observe(*detected)
+        
+        # 각 요청마다 새로운 DB 세션 생성 (연결 유지 시 세션 문제 방지)
+        db = next(get_db())
+        try:
+            # tracking_state 가져오기
+            tracking_state = stream.get("tracking_state", {"tracks": {}})
+            
+            # 공통 감지 로직 사용 (suspect_ids 우선)
+            result = process_detection(
+                frame, 
+                suspect_id=suspect_id if not suspect_ids else None,
+                suspect_ids=suspect_ids if suspect_ids else None,
+                db=db,
+                tracking_state=tracking_state,
+                detected=detected,
+                recognition_cache=rec_cache,
+                frame_shape=source.full_shape if source is not None else None
+            )
+            
+            # tracking_state 업데이트
+            stream["tracking_state"] = tracking_state
+        finally:
+            db.close()
+        
+        # Temporal Consistency 필터 적용 (연속 프레임 기반 매칭 확정)
+        result = apply_temporal_filter(websocket, result, state=stream)
+        
+        # 범죄자 감지 시 스냅샷 Base64 인코딩 추가 (스냅샷 서비스 사용 시 URL만)
+        snapshot_base64 = None
+        snapshots = []
+        snapshot_scheduler = stream.get("snapshots")
+        
+        # 비디오 타임스탬프 계산 (모든 응답에 포함)
+        if video_time is not None:
+            video_timestamp = float(video_time)
+        else:
+            # 프레임 ID를 사용하여 대략적인 타임스탬프 계산 (10 FPS 가정)
+            video_timestamp = frame_id / 10.0
+        
+        print(f"🔍 WebSocket 감지 결과: alert={result.get('alert')}, detections={len(result.get('detections', []))}, video_time={video_timestamp:.2f}s")
+        
+        if result.get("alert") and snapshot_scheduler is not None:
+            # 얼굴 crop을 스레드 풀에서 인코딩 (인물별 간격마다 가장 좋은 얼굴 한 장, 축소 디코딩한 프레임은 원본에서 crop)
+            snapshots = snapshot_scheduler.capture(result.get("detections", []),
+                                                   source.full if source is not None else (lambda: frame))
+        elif result.get("alert"):  # 범죄자 감지됨
+            print(f"🚨 범죄자 감지됨! 스냅샷 생성 중...")
+            try:
+                # 프레임을 JPEG로 인코딩하여 Base64 생성 (축소 디코딩한 프레임은 받은 원본 JPEG 그대로 사용)
+                if source is not None:
+                    success, buffer = True, source.jpeg
+                else:
+                    success, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+                if success and buffer is not None and len(buffer) > 0:
+                    snapshot_base64 = "data:image/jpeg;base64," + base64.b64encode(buffer).decode('utf-8')
+                    print(f"✅ 스냅샷 생성 완료: 크기={len(snapshot_base64)} bytes, 타임스탬프={video_timestamp:.1f}s")
+                else:
+                    print(f"⚠️ WebSocket: 스냅샷 인코딩 실패 (success={success}, buffer={buffer is not None})")
+            except Exception as e:
+                print(f"❌ WebSocket: 스냅샷 생성 중 오류 발생: {e}")
+                import traceback
+                traceback.print_exc()
+        
+        # 결과 전송 (응답 먼저 - 성능 최우선, COMPACT_RESPONSE_ENABLED면 간결한 스키마)
+        # 학습 이벤트 저장은 아래에서 result의 임베딩을 그대로 사용
+        response_data = {
+            "type": "detection",
+            "data": {
+                "frame_id": frame_id,
+                "video_timestamp": video_timestamp,  # 항상 포함
+                **(compact_result(result) if COMPACT_RESPONSE_ENABLED else result)
+            }
+        }
+        
+        # 범죄자 감지 시 스냅샷 추가
+        if snapshot_base64:
+            response_data["data"]["snapshot_base64"] = snapshot_base64
+            print(f"📤 WebSocket 응답에 스냅샷 포함: {len(snapshot_base64)} bytes")
+        if snapshots:
+            response_data["data"]["snapshot_url"] = snapshots[0]["snapshot_url"]
+            response_data["data"]["snapshots"] = snapshots
+        
+        # 바이너리 프로토콜 프레임은 어느 스트림의 결과인지 함께 전송
+        if stream_id is not None:
+            response_data["data"]["stream_id"] = stream_id
+        
+        await websocket.send_json(response_data)
+
+        
+        # 학습 이벤트가 있으면 파일 저장 (비동기, 응답 후)
+        learning_events = result.get("learning_events", [])
+        for event in learning_events:
+            # 임베딩을 numpy 배열로 변환
+            embedding_array = np.array(event["embedding"], dtype=np.float32)
+            bank_type = event.get("bank_type", "base")
+            
+            # 동적 bank 저장 (각도별 다양성 체크 및 수집 완료 로직 포함)
+            # ⚠️ Dynamic Bank 자동 수집 활성화
+            if bank_type == "dynamic":
+                # 파일 저장은 백그라운드에서 비동기 처리 (응답 지연 없음)
+                asyncio.create_task(add_embedding_to_dynamic_bank_async(
+                    event["person_id"],
+                    embedding_array,
+                    event.get("angle_type"),
+                    event.get("yaw_angle"),
+                    similarity_threshold=0.9,
+                    verbose=True
+                ))
+            else: # Dynamic이 아니면 Masked/Base 처리
+                # 기존 masked/base bank 저장 (호환성 유지)
+                asyncio.create_task(add_embedding_to_bank_async(
+                    event["person_id"],
+                    embedding_array,
+                    event.get("angle_type"),
+                    event.get("yaw_angle"),
+                    bank_type=bank_type
+                ))
+    
     try:
         while True:
-            # 클라이언트로부터 메시지 수신
-            data = await websocket.receive_text()
+            # 클라이언트로부터 메시지 수신 (텍스트 = JSON 프로토콜, 바이너리 = 프레임 헤더 + JPEG)
+            received = await websocket.receive()
+            if received["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(received.get("code", 1000))
+            
+            if received.get("bytes") is not None:
+                source = None
+                try:
+                    if DECODE_SCALE_ENABLED:
+                        # detection 해상도로 축소 디코딩 (원본은 필요할 때만)
+                        header, jpeg = split_binary_frame(received["bytes"])
+                        source = decode_for_detection(jpeg)
+                        frame = source.image if source is not None else None
+                    else:
+                        header, frame = decode_binary_frame(received["bytes"])
+                except ValueError as e:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": str(e)
+                    })
+                    continue
+                if frame is None:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": "Invalid image data"
+                    })
+                    continue
+                try:
+                    await handle_frame(
+                        frame, header["frame_id"], header["video_time"],
+                        stream_state(websocket, header["stream_id"]),
+                        suspect_ids=connection_states[websocket].get("suspect_ids", []),
+                        stream_id=header["stream_id"],
+                        force_keyframe=bool(header["flags"] & FLAG_SCENE_CUT),
+                        source=source
+                    )
+                except Exception as e:
+                    print(f"⚠️ WebSocket 처리 오류: {e}")
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": str(e)
+                    })
+                continue
             
+            data = received.get("text")
             try:
                 message = json.loads(data)
                 msg_type = message.get("type")
@@ -202,8 +489,14 @@ async def websocket_detect(websocket: WebSocket):
                         })
                         continue
                     
-                    # 이미지 디코딩
-                    frame = base64_to_image(image_base64)
+                    # 이미지 디코딩 (DECODE_SCALE_ENABLED면 detection 해상도로 축소 디코딩)
+                    source = None
+                    if DECODE_SCALE_ENABLED:
+                        jpeg = base64_to_buffer(image_base64)
+                        source = decode_for_detection(jpeg) if jpeg is not None else None
+                        frame = source.image if source is not None else None
+                    else:
+                        frame = base64_to_image(image_base64)
                     if frame is None:
                         await websocket.send_json({
                             "type": "error",
@@ -211,102 +504,8 @@ async def websocket_detect(websocket: WebSocket):
                         })
                         continue
                     
-                    # 각 요청마다 새로운 DB 세션 생성 (연결 유지 시 세션 문제 방지)
-                    db = next(get_db())
-                    try:
-                        # tracking_state 가져오기
-                        tracking_state = connection_states[websocket].get("tracking_state", {"tracks": {}})
-                        
-                        # 공통 감지 로직 사용 (suspect_ids 우선)
-                        result = process_detection(
-                            frame, 
-                            suspect_id=suspect_id if not suspect_ids else None,
-                            suspect_ids=suspect_ids if suspect_ids else None,
-                            db=db,
-                            tracking_state=tracking_state
-                        )
-                        
-                        # tracking_state 업데이트
-                        connection_states[websocket]["tracking_state"] = tracking_state
-                    finally:
-                        db.close()
-                    
-                    # Temporal Consistency 필터 적용 (연속 프레임 기반 매칭 확정)
-                    result = apply_temporal_filter(websocket, result)
-                    
-                    # 범죄자 감지 시 스냅샷 Base64 인코딩 추가
-                    snapshot_base64 = None
-                    
-                    # 비디오 타임스탬프 계산 (모든 응답에 포함)
-                    if video_time is not None:
-                        video_timestamp = float(video_time)
-                    else:
-                        # 프레임 ID를 사용하여 대략적인 타임스탬프 계산 (10 FPS 가정)
-                        video_timestamp = frame_id / 10.0
-                    
-                    print(f"🔍 WebSocket 감지 결과: alert={result.get('alert')}, detections={len(result.get('detections', []))}, video_time={video_timestamp:.2f}s")
-                    
-                    if result.get("alert"):  # 범죄자 감지됨
-                        print(f"🚨 범죄자 감지됨! 스냅샷 생성 중...")
-                        try:
-                            # 프레임을 JPEG로 인코딩하여 Base64 생성
-                            success, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                            if success and buffer is not None and len(buffer) > 0:
-                                snapshot_base64 = "data:image/jpeg;base64," + base64.b64encode(buffer).decode('utf-8')
-                                print(f"✅ 스냅샷 생성 완료: 크기={len(snapshot_base64)} bytes, 타임스탬프={video_timestamp:.1f}s")
-                            else:
-                                print(f"⚠️ WebSocket: 스냅샷 인코딩 실패 (success={success}, buffer={buffer is not None})")
-                        except Exception as e:
-                            print(f"❌ WebSocket: 스냅샷 생성 중 오류 발생: {e}")
-                            import traceback
-                            traceback.print_exc()
-                    
-                    # 결과 전송 (응답 먼저 - 성능 최우선)
-                    response_data = {
-                        "type": "detection",
-                        "data": {
-                            "frame_id": frame_id,
-                            "video_timestamp": video_timestamp,  # 항상 포함
-                            **result
-                        }
-                    }
-                    
-                    # 범죄자 감지 시 스냅샷 추가
-                    if snapshot_base64:
-                        response_data["data"]["snapshot_base64"] = snapshot_base64
-                        print(f"📤 WebSocket 응답에 스냅샷 포함: {len(snapshot_base64)} bytes")
-                    
-                    await websocket.send_json(response_data)
-
-                    
-                    # 학습 이벤트가 있으면 파일 저장 (비동기, 응답 후)
-                    learning_events = result.get("learning_events", [])
-                    for event in learning_events:
-                        # 임베딩을 numpy 배열로 변환
-                        embedding_array = np.array(event["embedding"], dtype=np.float32)
-                        bank_type = event.get("bank_type", "base")
-                        
-                        # 동적 bank 저장 (각도별 다양성 체크 및 수집 완료 로직 포함)
-                        # ⚠️ Dynamic Bank 자동 수집 활성화
-                        if bank_type == "dynamic":
-                            # 파일 저장은 백그라운드에서 비동기 처리 (응답 지연 없음)
-                            asyncio.create_task(add_embedding_to_dynamic_bank_async(
-                                event["person_id"],
-                                embedding_array,
-                                event.get("angle_type"),
-                                event.get("yaw_angle"),
-                                similarity_threshold=0.9,
-                                verbose=True
-                            ))
-                        else: # Dynamic이 아니면 Masked/Base 처리
-                            # 기존 masked/base bank 저장 (호환성 유지)
-                            asyncio.create_task(add_embedding_to_bank_async(
-                                event["person_id"],
-                                embedding_array,
-                                event.get("angle_type"),
-                                event.get("yaw_angle"),
-                                bank_type=bank_type
-                            ))
+                    await handle_frame(frame, frame_id, video_time, connection_states[websocket],
+                                       suspect_id=suspect_id, suspect_ids=suspect_ids, source=source)
                 
                 elif msg_type == "config":
                     # 설정 변경 (suspect_ids 등)
@@ -363,7 +562,29 @@ async def health_check():
         "status": "ok",
         "websocket_endpoint": "/ws/detect",
         "active_connections": len(active_connections),
-        "websocket_url": "ws://localhost:5000/ws/detect"
+        "websocket_url": "ws://localhost:5000/ws/detect",
+        "device": get_device_info(),
+        "model_profile": getattr(face_detection.model, "profile", None),
+        "deployment_profile": DEPLOYMENT_PROFILE,
+        "model_pack": getattr(face_detection.model, "model_pack", None),
+        "det_size": getattr(face_detection.model, "det_size", None),
+        "stage_timings": stage_timings.summary(),
+        "inference_batching": inference_server.summary(),
+        "adaptive_detection": [state["det_resolution"].summary() for state in all_stream_states()
+                               if state.get("det_resolution") is not None],
+        "roi_detection": [state["roi_planner"].summary() for state in all_stream_states()
+                          if state.get("roi_planner") is not None],
+        "recognition_cache": [state["recognition_cache"].summary() for state in all_stream_states()
+                              if state.get("recognition_cache") is not None],
+        "preprocessing": [state["preprocessor"].summary() for state in all_stream_states()
+                          if state.get("preprocessor") is not None],
+        "decode": decode_summary() if DECODE_SCALE_ENABLED else None,
+        "snapshots": {
+            "service": snapshot_service.summary(),
+            "streams": [state["snapshots"].summary() for state in all_stream_states()
+                        if state.get("snapshots") is not None],
+            "http_streams": len(http_snapshots),
+        } if SNAPSHOT_SERVICE_ENABLED else None,
     }
 
 
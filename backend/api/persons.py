@@ -13,7 +13,9 @@ from pathlib import Path
 
 from backend.database import get_db, get_all_persons, get_person_by_id, create_person
 from backend.services import data_loader
-from backend.services.data_loader import load_persons_from_db
+from backend.services.data_loader import load_persons_from_db, upsert_person, remove_person
+from backend.services.person_directory import person_directory
+from backend.utils.embedding_tag import tag_mismatch, write_tag
 
 # 프로젝트 경로 설정
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -32,9 +34,13 @@ def get_model():
     """모델 가져오기 (지연 로딩)"""
     global _model
     if _model is None:
-        # Fallback: main.py에서 injection 안됐으면 직접 import
-        from backend.services.face_detection import get_model as fd_get_model
-        _model = fd_get_model()
+        # Fallback: main.py에서 injection 안됐으면 감지 서비스의 모델을 공유하고,
+        # 그것도 없으면 같은 프로파일(INSIGHTFACE_PROFILE)로 직접 생성
+        from backend.services import face_detection
+        _model = face_detection.model
+        if _model is None:
+            from backend.utils.model_profile import create_face_analysis
+            _model, _ = create_face_analysis()
     return _model
 
 # face_enroll 함수들 import
@@ -49,25 +55,6 @@ async def get_persons(db: Session = Depends(get_db)):
     
     print(f"🔍 [API /persons] 요청 받음 - data_loader.persons_cache 길이: {len(data_loader.persons_cache) if data_loader.persons_cache else 0}")
     
-    # 이미지 경로 찾기 헬퍼 함수
-    def find_person_image(person_id: str) -> Optional[str]:
-        """인물의 등록 이미지 경로 찾기"""
-        enroll_dir = PROJECT_ROOT / "images" / "enroll" / person_id
-        if enroll_dir.exists():
-            # 지원하는 이미지 확장자
-            image_exts = [".jpg", ".jpeg", ".png", ".JPG", ".JPEG", ".PNG"]
-            # person_id로 시작하는 파일 찾기
-            for ext in image_exts:
-                img_file = enroll_dir / f"{person_id}{ext}"
-                if img_file.exists():
-                    return f"/api/images/enroll/{person_id}/{img_file.name}"
-            # 또는 첫 번째 이미지 파일 찾기
-            for ext in image_exts:
-                for img_file in enroll_dir.glob(f"*{ext}"):
-                    if img_file.exists():
-                        return f"/api/images/enroll/{person_id}/{img_file.name}"
-        return None
-    
     # ⭐ 버그 수정: 쪼시를 사용하지 않고 항상 DB에서 직접 조회
     # 이렇게 해야 삭제/수정된 인물 정보가 즉시 반영됨
     # 캐시에서 반환 (성능 향상)
@@ -83,7 +70,7 @@ async def get_persons(db: Session = Depends(get_db)):
     #                 "is_criminal": p["is_criminal"],
     #                 "person_type": p.get("info", {}).get("person_type", "criminal" if p["is_criminal"] else "unknown"),
     #                 "info": p.get("info", {}),
-    #                 "image_url": find_person_image(p["id"])  # 이미지 URL 추가
+    #                 "image_url": person_directory.image_url(p["id"])  # 이미지 URL 추가
     #             }
     #             for p in data_loader.persons_cache
     #         ]
@@ -97,32 +84,7 @@ async def get_persons(db: Session = Depends(get_db)):
         persons = get_all_persons(db)
         print(f"📋 [API] DB에서 조회: {len(persons)}명")
         
-        # DB에서 조회한 데이터로 캐시 갱신 (다음 요청을 위해)
-        if persons:
-            # 캐시 갱신을 위해 load_persons_from_db 호출
-            try:
-                load_persons_from_db(db)
-                print(f"✅ [API] 캐시 갱신 완료: {len(data_loader.persons_cache)}명")
-            except Exception as cache_error:
-                print(f"⚠️ [API] 캐시 갱신 실패: {cache_error}")
-                import traceback
-                traceback.print_exc()
-        
-        # 이미지 경로 찾기 헬퍼 함수 (중복 정의 방지)
-        def find_person_image_db(person_id: str) -> Optional[str]:
-            """인물의 등록 이미지 경로 찾기"""
-            enroll_dir = PROJECT_ROOT / "images" / "enroll" / person_id
-            if enroll_dir.exists():
-                image_exts = [".jpg", ".jpeg", ".png", ".JPG", ".JPEG", ".PNG"]
-                for ext in image_exts:
-                    img_file = enroll_dir / f"{person_id}{ext}"
-                    if img_file.exists():
-                        return f"/api/images/enroll/{person_id}/{img_file.name}"
-                for ext in image_exts:
-                    for img_file in enroll_dir.glob(f"*{ext}"):
-                        if img_file.exists():
-                            return f"/api/images/enroll/{person_id}/{img_file.name}"
-            return None
+        # 갤러리 캐시는 등록/수정/삭제 시 인물 단위로 갱신되므로 여기서는 재로딩하지 않음
         
         result = {
             "success": True,
@@ -134,7 +96,7 @@ async def get_persons(db: Session = Depends(get_db)):
                     "is_criminal": p.is_criminal,
                     "person_type": (p.info or {}).get("person_type", "criminal" if p.is_criminal else "unknown"),
                     "info": p.info or {},
-                    "image_url": find_person_image_db(p.person_id)  # 이미지 URL 추가
+                    "image_url": person_directory.image_url(p.person_id)  # 이미지 URL (PersonDirectory 캐시)
                 }
                 for p in persons
             ]
@@ -226,23 +188,10 @@ async def delete_person(person_id: str, db: Session = Depends(get_db)):
             print(f"  ❌ DB 레코드 삭제 실패: {e}")
             raise HTTPException(status_code=500, detail=f"데이터베이스 삭제 중 오류 발생: {str(e)}")
         
-        # 5. 캐시 갱신
-        try:
-            # 전역 함수 직접 호출
-            load_persons_from_db(db)
-            print(f"  ✅ 캐시 갱신 완료")
-        except Exception as cache_error:
-            print(f"  ⚠️ 캐시 갱신 실패: {cache_error}")
-            # 캐시 갱신 실패 시 수동으로 제거
-            persons_cache
-            if data_loader.persons_cache:
-                data_loader.persons_cache = [p for p in data_loader.persons_cache if p.get('id') != person_id]
-        
-        # 6. 갤러리 캐시에서도 제거
-        if person_id in data_loader.gallery_base_cache:
-            del data_loader.gallery_base_cache[person_id]
-        if person_id in data_loader.gallery_masked_cache:
-            del data_loader.gallery_masked_cache[person_id]
+        # 5. 갤러리 캐시에서 해당 인물만 제거 (전체 재로딩 없음)
+        remove_person(person_id)
+        person_directory.forget(person_id)
+        print(f"  ✅ 캐시 갱신 완료")
         
         print(f"  ✅ 인물 삭제 완료: {person_name} ({person_id})")
         print(f"  📁 삭제된 파일: {', '.join(deleted_files) if deleted_files else '없음'}")
@@ -325,9 +274,9 @@ async def update_person(person_id: str, db: Session = Depends(get_db),
         db.refresh(person)
         print(f"  ✅ DB 업데이트 완료")
         
-        # 4. 캐시 갱신
+        # 4. 캐시 갱신 (해당 인물만)
         try:
-            load_persons_from_db(db)
+            upsert_person(db, person_id)
             print(f"  ✅ 캐시 갱신 완료")
         except Exception as cache_error:
             print(f"  ⚠️ 캐시 갱신 실패: {cache_error}")
@@ -404,6 +353,7 @@ async def enroll_person(
             f.write(image_bytes)
         
         print(f"  💾 이미지 저장: {saved_image_path}")
+        person_directory.refresh_image(person_id)
         
         # face_enroll.py의 함수를 사용하여 임베딩 추출
         embedding_normalized = get_main_face_embedding(get_model(), saved_image_path)
@@ -412,6 +362,7 @@ async def enroll_person(
             # 이미지 파일 삭제 (얼굴 감지 실패 시)
             if saved_image_path.exists():
                 saved_image_path.unlink()
+            person_directory.refresh_image(person_id)
             raise HTTPException(status_code=400, detail="이미지에서 얼굴을 감지할 수 없습니다. 정면 사진을 업로드해주세요.")
         
         # Bank 저장 경로
@@ -419,6 +370,11 @@ async def enroll_person(
         person_dir.mkdir(parents=True, exist_ok=True)
         bank_base_path = person_dir / "bank_base.npy"
         
+        # 다른 모델로 만든 bank에는 추가하지 않음 (임베딩 공간이 다름)
+        mismatch = tag_mismatch(person_dir) if bank_base_path.exists() else None
+        if mismatch:
+            raise HTTPException(status_code=409, detail=f"기존 임베딩이 다른 모델로 생성되었습니다 ({mismatch}). 현재 모델로 다시 등록해주세요.")
+        
         # 기존 bank_base.npy 로드 (중복 체크용)
         existing_bank = None
         if bank_base_path.exists():
@@ -453,6 +409,8 @@ async def enroll_person(
             
             # bank_base.npy 저장
             np.save(bank_base_path, updated_bank)
+            if existing_bank is None:
+                write_tag(person_dir)
             
             # Centroid 재계산 및 저장
             centroid = updated_bank.mean(axis=0)
@@ -496,9 +454,9 @@ async def enroll_person(
             embedding_count = 1
             print(f"  ✅ 새 인물 등록 완료: {person_id}")
         
-        # 캐시 갱신
+        # 캐시 갱신 (해당 인물의 bank만 다시 읽음)
         try:
-            load_persons_from_db(db)
+            upsert_person(db, person_id)
             print(f"  ✅ 캐시 갱신 완료")
         except Exception as cache_error:
             print(f"  ⚠️ 캐시 갱신 실패: {cache_error}")
@@ -518,3 +476,30 @@ async def enroll_person(
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"등록 중 오류 발생: {str(e)}")
+
+@router.post("/api/admin/reload-gallery")
+async def reload_gallery(db: Session = Depends(get_db)):
+    """
+    갤러리 전체 재로딩 (관리자용)
+    
+    모든 인물의 bank 파일을 디스크에서 다시 읽습니다.
+    파일을 직접 수정한 경우에만 사용하세요 (등록/수정/삭제 API는 인물 단위로 자동 반영).
+    
+    Returns:
+        {
+            "success": bool,
+            "count": int  # 로드된 인물 수
+        }
+    """
+    try:
+        print(f"🔄 [ADMIN] 갤러리 전체 재로딩 요청")
+        load_persons_from_db(db)
+        return {
+            "success": True,
+            "count": len(data_loader.persons_cache)
+        }
+    except Exception as e:
+        print(f"❌ [ADMIN] 갤러리 재로딩 실패: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"재로딩 중 오류 발생: {str(e)}")
@@ -0,0 +1,123 @@
+"""
+각도 분할 dynamic bank 매칭 리포트
+전체 dynamic bank 비교(match_batch)와 같은/이웃 각도 버킷만 비교(AnglePartitionedIndex)의
+얼굴당 비교 행 수, 지연시간, top-1 정답률을 비교
+
+사용 예시:
+    # 합성 갤러리 (3000명, 인물당 각도별 4개 dynamic 임베딩)
+    python backend/benchmarks/bench_angle_partition.py --persons 3000 --rows-per-angle 4
+
+    # 실제 outputs/embeddings 사용 (bank_dynamic.npy + angles_dynamic.json)
+    python backend/benchmarks/bench_angle_partition.py --embeddings-dir outputs/embeddings
+"""
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.services.gallery_index import GalleryIndex, normalize_rows
+from backend.services.angle_partition import AnglePartitionedIndex, ANGLE_BUCKETS, encode_angles
+
+
+def make_synthetic_dynamic(num_persons: int, rows_per_angle: int, dim: int = 512, seed: int = 0):
+    """인물 중심 + 각도별 방향 성분으로 dynamic bank와 행별 각도 라벨 생성"""
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((num_persons, dim)).astype(np.float32))
+    angle_dirs = normalize_rows(rng.standard_normal((len(ANGLE_BUCKETS), dim)).astype(np.float32))
+    gallery, labels = {}, {}
+    for i in range(num_persons):
+        rows, names = [], []
+        for a, angle in enumerate(ANGLE_BUCKETS):
+            noise = rng.standard_normal((rows_per_angle, dim)).astype(np.float32) * 0.05
+            rows.append(centers[i] + 0.5 * angle_dirs[a] + noise)
+            names.extend([angle] * rows_per_angle)
+        gallery[f"p{i:06d}"] = normalize_rows(np.vstack(rows))
+        labels[f"p{i:06d}"] = names
+    return gallery, labels
+
+
+def load_real_dynamic(emb_dir: Path):
+    """outputs/embeddings/<person>/bank_dynamic.npy + angles_dynamic.json 로드"""
+    gallery, labels = {}, {}
+    for person_dir in sorted(d for d in emb_dir.iterdir() if d.is_dir()):
+        bank_path = person_dir / "bank_dynamic.npy"
+        if not bank_path.exists():
+            continue
+        gallery[person_dir.name] = normalize_rows(np.load(bank_path).reshape(-1, 512))
+        angles_path = person_dir / "angles_dynamic.json"
+        if angles_path.exists():
+            with open(angles_path, 'r', encoding='utf-8') as f:
+                labels[person_dir.name] = json.load(f).get("angle_types", [])
+    return gallery, labels
+
+
+def make_angle_queries(gallery, labels, num_queries: int, seed: int = 1):
+    """라벨이 있는 dynamic 행에 잡음을 더한 쿼리 → (쿼리, 정답 person_id, 쿼리 각도)"""
+    rng = np.random.default_rng(seed)
+    person_ids = [pid for pid in gallery if len(labels.get(pid, [])) == gallery[pid].shape[0]]
+    queries, truth, angles = [], [], []
+    for p in rng.choice(len(person_ids), num_queries):
+        pid = person_ids[p]
+        row = rng.integers(gallery[pid].shape[0])
+        queries.append(gallery[pid][row] + rng.standard_normal(512).astype(np.float32) * 0.04)
+        truth.append(pid)
+        angles.append(labels[pid][row])
+    return normalize_rows(np.stack(queries)), truth, angles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="각도 분할 dynamic bank 매칭 리포트")
+    parser.add_argument("--persons", type=int, default=3000)
+    parser.add_argument("--rows-per-angle", type=int, default=4)
+    parser.add_argument("--embeddings-dir", type=str, default=None)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 4, 15], help="프레임당 얼굴 수")
+    args = parser.parse_args()
+
+    if args.embeddings_dir:
+        gallery, labels = load_real_dynamic(PROJECT_ROOT / args.embeddings_dir)
+    else:
+        gallery, labels = make_synthetic_dynamic(args.persons, args.rows_per_angle)
+    codes = {pid: encode_angles(labels.get(pid), bank.shape[0]) for pid, bank in gallery.items()}
+    queries, truth, angles = make_angle_queries(gallery, labels, args.queries)
+
+    full = GalleryIndex.from_gallery(gallery)
+    partitioned = AnglePartitionedIndex.from_gallery(gallery, codes)
+    for angle in ANGLE_BUCKETS:
+        partitioned.for_angle(angle)  # 버킷 인덱스 미리 생성 (지연시간에서 제외)
+    print(f"📊 dynamic bank: {len(full)}명, {full.num_rows}개 임베딩, 쿼리 {queries.shape[0]}개")
+
+    def run(match_fn, batch_size):
+        results, elapsed = [], 0.0
+        for start in range(0, queries.shape[0], batch_size):
+            t0 = time.perf_counter()
+            results.extend(match_fn(start, queries[start:start + batch_size]))
+            elapsed += time.perf_counter() - t0
+        return results, elapsed * 1000 / queries.shape[0]
+
+    part_rows = np.mean([partitioned.for_angle(a).num_rows for a in angles])
+    print(f"얼굴당 비교 행: full {full.num_rows} → partitioned {part_rows:.0f} ({part_rows / max(full.num_rows, 1):.1%})")
+
+    print(f"\n{'batch':>5} | {'full ms/face':>12} | {'part ms/face':>12} | {'speedup':>7} | {'full acc':>8} | {'part acc':>8} | {'agree':>6}")
+    for batch_size in args.batch_size:
+        full_results, full_ms = run(lambda start, q: full.match_batch(q), batch_size)
+        part_results, part_ms = run(lambda start, q: partitioned.match_batch(q, angles[start:start + q.shape[0]]),
+                                    batch_size)
+        full_acc = np.mean([r[0] == t for r, t in zip(full_results, truth)])
+        part_acc = np.mean([r[0] == t for r, t in zip(part_results, truth)])
+        agreement = np.mean([a[0] == b[0] for a, b in zip(part_results, full_results)])
+        print(f"{batch_size:>5} | {full_ms:>12.3f} | {part_ms:>12.3f} | {full_ms / part_ms:>6.1f}x | "
+              f"{full_acc:>8.4f} | {part_acc:>8.4f} | {agreement:>6.4f}")
+    print("\n버킷별 비교 행 수:")
+    for angle in ANGLE_BUCKETS:
+        print(f"  {angle:>13}: {partitioned.for_angle(angle).num_rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+ANN 검색 recall / latency 리포트
+정확 검색(GalleryIndex)과 ANN(IVFIndex)의 best 인물 일치율과 쿼리 지연시간을 비교
+
+사용 예시:
+    # 합성 갤러리 (10만 명 x 3 임베딩)
+    python backend/benchmarks/bench_ann_recall.py --persons 100000 --rows-per-person 3
+
+    # 실제 outputs/embeddings의 base bank 사용
+    python backend/benchmarks/bench_ann_recall.py --embeddings-dir outputs/embeddings
+"""
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.services.gallery_index import GalleryIndex, normalize_rows
+from backend.services.ann_index import IVFIndex
+
+
+def make_synthetic_gallery(num_persons: int, rows_per_person: int, dim: int = 512, seed: int = 0):
+    """사람별 중심 벡터 주변에 임베딩을 생성한 합성 갤러리"""
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((num_persons, dim)).astype(np.float32))
+    gallery = {}
+    for i in range(num_persons):
+        noise = rng.standard_normal((rows_per_person, dim)).astype(np.float32) * 0.04
+        gallery[f"p{i:06d}"] = normalize_rows(centers[i] + noise)
+    return gallery, centers
+
+
+def load_real_gallery(emb_dir: Path, bank_name: str = "bank_base.npy"):
+    """outputs/embeddings/<person>/<bank_name> 로드"""
+    gallery = {}
+    for person_dir in sorted(d for d in emb_dir.iterdir() if d.is_dir()):
+        bank_path = person_dir / bank_name
+        if bank_path.exists():
+            gallery[person_dir.name] = normalize_rows(np.load(bank_path).reshape(-1, 512))
+    return gallery
+
+
+def make_queries(gallery, num_queries: int, seed: int = 1):
+    """갤러리 임베딩에 잡음을 더한 쿼리 (정답 person_id 포함)"""
+    rng = np.random.default_rng(seed)
+    person_ids = list(gallery.keys())
+    picks = rng.choice(len(person_ids), num_queries)
+    queries = []
+    for p in picks:
+        bank = gallery[person_ids[p]]
+        row = bank[rng.integers(bank.shape[0])]
+        queries.append(row + rng.standard_normal(row.shape[0]).astype(np.float32) * 0.04)
+    return normalize_rows(np.stack(queries)), [person_ids[p] for p in picks]
+
+
+def time_batches(match_fn, queries, batch_size: int):
+    """배치 단위 매칭 시간 측정 → (결과, 얼굴당 지연시간 ms 배열)"""
+    results, latencies = [], []
+    for start in range(0, queries.shape[0], batch_size):
+        batch = queries[start:start + batch_size]
+        t0 = time.perf_counter()
+        results.extend(match_fn(batch))
+        latencies.append((time.perf_counter() - t0) * 1000 / batch.shape[0])
+    return results, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN vs 정확 검색 recall/latency 리포트")
+    parser.add_argument("--persons", type=int, default=100000)
+    parser.add_argument("--rows-per-person", type=int, default=3)
+    parser.add_argument("--embeddings-dir", type=str, default=None)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=15, help="프레임당 얼굴 수")
+    parser.add_argument("--nlist", type=int, default=0)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--backend", type=str, default="auto")
+    args = parser.parse_args()
+
+    if args.embeddings_dir:
+        gallery = load_real_gallery(PROJECT_ROOT / args.embeddings_dir)
+    else:
+        gallery, _ = make_synthetic_gallery(args.persons, args.rows_per_person)
+    queries, truth = make_queries(gallery, args.queries)
+
+    exact = GalleryIndex.from_gallery(gallery)
+    print(f"📊 갤러리: {len(exact)}명, {exact.num_rows}개 임베딩, 쿼리 {queries.shape[0]}개 (배치 {args.batch_size})")
+
+    exact_results, exact_lat = time_batches(exact.match_batch, queries, args.batch_size)
+    exact_ids = [r[0] for r in exact_results]
+    exact_acc = np.mean([a == b for a, b in zip(exact_ids, truth)])
+    print(f"\n[exact] {exact_lat.mean():.3f} ms/face (p95 {np.percentile(exact_lat, 95):.3f}), top-1 정답률 {exact_acc:.4f}")
+
+    t0 = time.perf_counter()
+    ann = IVFIndex(nlist=args.nlist, backend=args.backend)
+    ann.build(gallery)
+    build_sec = time.perf_counter() - t0
+    print(f"[ann build] backend={ann.backend}, nlist={ann.nlist}, {build_sec:.1f}s")
+
+    print(f"\n{'nprobe':>7} | {'ms/face':>8} | {'p95':>8} | {'speedup':>7} | {'recall@1 vs exact':>17} | {'max |Δbest|':>11}")
+    for nprobe in args.nprobe:
+        ann.nprobe = nprobe
+        if ann.backend == "faiss":
+            ann._faiss_index.nprobe = nprobe
+        ann_results, ann_lat = time_batches(ann.match_batch, queries, args.batch_size)
+        recall = np.mean([a[0] == b for a, b in zip(ann_results, exact_ids)])
+        delta = max(abs(a[1] - b[1]) for a, b in zip(ann_results, exact_results))
+        speedup = exact_lat.mean() / ann_lat.mean()
+        print(f"{nprobe:>7} | {ann_lat.mean():>8.3f} | {np.percentile(ann_lat, 95):>8.3f} | {speedup:>6.1f}x | {recall:>17.4f} | {delta:>11.4f}")
+
+
+if __name__ == "__main__":
+    main()
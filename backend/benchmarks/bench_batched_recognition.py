@@ -0,0 +1,86 @@
+"""
+배치 recognition 처리량 리포트 (얼굴 수별)
+얼굴마다 session.run을 호출하는 기존 방식(ArcFaceONNX.get)과
+프레임의 모든 aligned crop을 한 번에 실행하는 recognize_batch의 처리량과 embedding 차이를 비교
+
+사용 예시:
+    python backend/benchmarks/bench_batched_recognition.py --image images/enroll/<person>/<person>.jpg
+    python backend/benchmarks/bench_batched_recognition.py --faces 1 2 4 8 16 32 --repeat 20
+"""
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2
+
+from backend.utils.model_profile import create_face_analysis, recognize_batch
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+def find_face(app, image_dir: Path, image: str = None):
+    """얼굴이 하나 이상 검출되는 이미지와 첫 번째 얼굴"""
+    paths = [PROJECT_ROOT / image] if image else sorted(p for p in image_dir.rglob("*") if p.suffix.lower() in IMAGE_EXTS)
+    for path in paths:
+        img = cv2.imread(str(path))
+        if img is None:
+            continue
+        faces = app.get(img)
+        if faces:
+            return img, faces[0]
+    return None, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 recognition 처리량 리포트")
+    parser.add_argument("--image", type=str, default=None)
+    parser.add_argument("--images-dir", type=str, default="images/enroll")
+    parser.add_argument("--faces", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app, device_id = create_face_analysis("recognition-only", timings=None)
+    rec_model = app.models["recognition"]
+    img, face = find_face(app, PROJECT_ROOT / args.images_dir, args.image)
+    if face is None:
+        print("⚠️ 얼굴이 검출되는 이미지가 없습니다")
+        return
+    print(f"📊 {'GPU' if device_id >= 0 else 'CPU'}, 반복 {args.repeat}회")
+
+    print(f"\n{'faces':>5} | {'per-face ms':>11} | {'batched ms':>10} | {'per-face f/s':>12} | {'batched f/s':>11} | {'speedup':>7} | {'max diff':>8}")
+    for num_faces in args.faces:
+        # 같은 얼굴을 조금씩 이동시켜 서로 다른 crop 생성
+        faces = []
+        for i in range(num_faces):
+            clone = type(face)(bbox=face.bbox.copy(), kps=face.kps + (i % 5) * 0.5, det_score=face.det_score)
+            faces.append(clone)
+
+        rec_model.get(img, faces[0])  # 워밍업
+        recognize_batch(rec_model, img, faces, timings=None)
+
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            for f in faces:
+                rec_model.get(img, f)
+        per_face_ms = (time.perf_counter() - t0) * 1000 / args.repeat
+        per_face_embeddings = np.stack([f.embedding for f in faces])
+
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            recognize_batch(rec_model, img, faces, timings=None)
+        batched_ms = (time.perf_counter() - t0) * 1000 / args.repeat
+        batched_embeddings = np.stack([f.embedding for f in faces])
+
+        max_diff = np.abs(per_face_embeddings - batched_embeddings).max()
+        print(f"{num_faces:>5} | {per_face_ms:>11.2f} | {batched_ms:>10.2f} | {num_faces * 1000 / per_face_ms:>12.1f} | "
+              f"{num_faces * 1000 / batched_ms:>11.1f} | {per_face_ms / batched_ms:>6.2f}x | {max_diff:>8.1e}")
+
+
+if __name__ == "__main__":
+    main()
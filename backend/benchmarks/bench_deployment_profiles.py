@@ -0,0 +1,96 @@
+"""
+배포 프로파일별 처리 속도 리포트
+DEPLOYMENT_PROFILES(server-accurate / edge / edge-lite)와 custom(INSIGHTFACE_MODEL / INSIGHTFACE_DET_SIZE)마다
+images/enroll 이미지를 처리해서 fps, 프레임당 detection / recognition 시간, 검출 얼굴 수를 비교
+
+사용 예시:
+    python backend/benchmarks/bench_deployment_profiles.py
+    python backend/benchmarks/bench_deployment_profiles.py --profiles edge edge-lite --repeat 5 --ctx-id -1
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2
+
+from backend.config import DEPLOYMENT_PROFILES, INSIGHTFACE_MODEL, INSIGHTFACE_DET_SIZE
+from backend.utils.model_profile import StageTimings, create_face_analysis, get_faces_batched
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+def load_images(image_dir: Path, limit: int):
+    """등록 이미지 로드 (BGR)"""
+    images = []
+    for path in sorted(image_dir.rglob("*")):
+        if path.suffix.lower() in IMAGE_EXTS:
+            img = cv2.imread(str(path))
+            if img is not None:
+                images.append(img)
+        if len(images) >= limit:
+            break
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배포 프로파일별 fps 리포트")
+    parser.add_argument("--images-dir", type=str, default="images/enroll")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--profiles", type=str, nargs="+", default=list(DEPLOYMENT_PROFILES) + ["custom"])
+    parser.add_argument("--ctx-id", type=int, default=None, help="None이면 INSIGHTFACE_CTX_ID / 자동 감지")
+    args = parser.parse_args()
+
+    images = load_images(PROJECT_ROOT / args.images_dir, args.limit)
+    if not images:
+        print(f"⚠️ 이미지가 없습니다: {args.images_dir}")
+        return
+    print(f"📊 이미지 {len(images)}장 x {args.repeat}회")
+
+    rows = []
+    for profile in args.profiles:
+        if profile == "custom":
+            model, det_size = INSIGHTFACE_MODEL, INSIGHTFACE_DET_SIZE
+        elif profile in DEPLOYMENT_PROFILES:
+            model, det_size = DEPLOYMENT_PROFILES[profile]["model"], DEPLOYMENT_PROFILES[profile]["det_size"]
+        else:
+            print(f"⚠️ 알 수 없는 프로파일: {profile}")
+            continue
+
+        timings = StageTimings()
+        app, device_id = create_face_analysis("recognition-only", name=model, det_size=det_size,
+                                              device_id=args.ctx_id, timings=timings)
+        for img in images[:3]:
+            get_faces_batched(app, img, timings=None)  # 워밍업
+        timings.reset()
+
+        num_faces = 0
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            for img in images:
+                num_faces += len(get_faces_batched(app, img, timings=timings))
+        elapsed = time.perf_counter() - t0
+        frames = len(images) * args.repeat
+        summary = timings.summary()
+        rows.append((
+            profile, model, f"{det_size[0]}x{det_size[1]}", "GPU" if device_id >= 0 else "CPU",
+            frames / elapsed,
+            summary.get("detection", {}).get("total_ms", 0.0) / frames,
+            summary.get("recognition_batch", summary.get("recognition", {})).get("total_ms", 0.0) / frames,
+            num_faces / frames,
+        ))
+
+    print(f"\n{'profile':>16} | {'model':>10} | {'det_size':>8} | {'device':>6} | {'fps':>7} | "
+          f"{'det ms/f':>8} | {'rec ms/f':>8} | {'faces/f':>7}")
+    for profile, model, size, device, fps, det_ms, rec_ms, faces in rows:
+        print(f"{profile:>16} | {model:>10} | {size:>8} | {device:>6} | {fps:>7.1f} | "
+              f"{det_ms:>8.2f} | {rec_ms:>8.2f} | {faces:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+/ws/detect 프레임 수신 리포트: JSON(base64 data URL) vs 바이너리(고정 헤더 + JPEG)
+images/enroll 이미지를 --width 크기로 맞춰 JPEG로 인코딩한 뒤
+- 메시지 크기 (바이트)
+- 서버 측 파싱 + 디코딩 시간 (json.loads → base64_to_image / decode_binary_frame)
+을 비교합니다. 네트워크 전송 시간은 포함하지 않습니다.
+
+사용 예시:
+    python backend/benchmarks/bench_frame_protocol.py
+    python backend/benchmarks/bench_frame_protocol.py --width 1920 --quality 80 --repeat 20
+"""
+import sys
+import json
+import time
+import base64
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2
+
+from backend.utils.frame_protocol import decode_binary_frame, encode_binary_frame
+from backend.utils.image_utils import base64_to_image
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+def load_jpegs(image_dir: Path, limit: int, width: int, quality: int):
+    """등록 이미지 → width 크기로 맞춘 JPEG 바이트 리스트"""
+    jpegs = []
+    for path in sorted(image_dir.rglob("*")):
+        if path.suffix.lower() not in IMAGE_EXTS:
+            continue
+        img = cv2.imread(str(path))
+        if img is None:
+            continue
+        height = max(1, int(img.shape[0] * width / img.shape[1]))
+        img = cv2.resize(img, (width, height), interpolation=cv2.INTER_AREA)
+        ok, encoded = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if ok:
+            jpegs.append(encoded.tobytes())
+        if len(jpegs) >= limit:
+            break
+    return jpegs
+
+
+def json_message(jpeg: bytes, frame_id: int) -> str:
+    """web/script.js와 같은 형태의 JSON 프레임 메시지"""
+    return json.dumps({
+        "type": "frame",
+        "data": {
+            "image": "data:image/jpeg;base64," + base64.b64encode(jpeg).decode("ascii"),
+            "suspect_ids": [],
+            "frame_id": frame_id,
+            "video_time": frame_id / 10.0,
+        }
+    })
+
+
+def decode_json(message: str):
+    data = json.loads(message)["data"]
+    return base64_to_image(data["image"])
+
+
+def measure(messages, decode, repeat: int):
+    """메시지 리스트 → (평균 바이트, 파싱 + 디코딩 ms/frame)"""
+    for message in messages[:3]:
+        decode(message)  # 워밍업
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            decode(message)
+    elapsed = (time.perf_counter() - t0) * 1000
+    size = sum(len(message) for message in messages) / len(messages)
+    return size, elapsed / (len(messages) * repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON vs 바이너리 프레임 수신 리포트")
+    parser.add_argument("--images-dir", type=str, default="images/enroll")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--width", type=int, default=1280, help="프레임 가로 크기 (비율 유지)")
+    parser.add_argument("--quality", type=int, default=85, help="JPEG 품질")
+    args = parser.parse_args()
+
+    jpegs = load_jpegs(PROJECT_ROOT / args.images_dir, args.limit, args.width, args.quality)
+    if not jpegs:
+        print(f"⚠️ 이미지가 없습니다: {args.images_dir}")
+        return
+    print(f"📊 프레임 {len(jpegs)}장 x {args.repeat}회 (width={args.width}, quality={args.quality})")
+
+    json_messages = [json_message(jpeg, i) for i, jpeg in enumerate(jpegs)]
+    binary_messages = [encode_binary_frame(jpeg, i, video_time=i / 10.0) for i, jpeg in enumerate(jpegs)]
+    results = (
+        ("json", *measure(json_messages, decode_json, args.repeat)),
+        ("binary", *measure(binary_messages, lambda message: decode_binary_frame(message)[1], args.repeat)),
+    )
+
+    json_size, json_ms = results[0][1], results[0][2]
+    print(f"\n{'protocol':>8} | {'bytes/frame':>11} | {'size':>6} | {'decode ms/f':>11} | {'speedup':>7}")
+    for name, size, ms in results:
+        print(f"{name:>8} | {size:>11.0f} | {size / json_size * 100:>5.1f}% | {ms:>11.2f} | {json_ms / ms:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
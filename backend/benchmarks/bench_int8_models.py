@@ -0,0 +1,152 @@
+"""
+INT8 모델 팩 vs FP32 모델 팩 정확도 / 지연시간 리포트
+images/enroll 이미지를 두 팩으로 처리해서
+- 단계별(detection / recognition) 평균 시간
+- 검출 일치율 (IoU >= 0.5로 매칭된 얼굴 비율)과 같은 얼굴의 FP32 / INT8 임베딩 cosine 유사도
+- 기존 갤러리(outputs/embeddings의 FP32 임베딩)에 대한 top-1 인물 일치율과 점수 변화
+를 비교합니다. INT8 팩은 backend/quantize_models.py로 먼저 생성해야 합니다.
+
+사용 예시:
+    python backend/benchmarks/bench_int8_models.py
+    python backend/benchmarks/bench_int8_models.py --model buffalo_s --limit 100 --repeat 5
+"""
+import sys
+import argparse
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2
+
+from backend.config import INSIGHTFACE_MODEL, QUANTIZED_PACK_SUFFIX, MAIN_THRESHOLD
+from backend.services.gallery_index import GalleryIndex, normalize_rows
+from backend.utils.model_profile import StageTimings, create_face_analysis, model_pack_dir, QUANTIZATION_MANIFEST
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+def load_images(image_dir: Path, limit: int):
+    """등록 이미지 로드 → [(person_id(폴더 이름), BGR 이미지)]"""
+    images = []
+    for path in sorted(image_dir.rglob("*")):
+        if path.suffix.lower() in IMAGE_EXTS:
+            img = cv2.imread(str(path))
+            if img is not None:
+                images.append((path.parent.name, img))
+        if len(images) >= limit:
+            break
+    return images
+
+
+def load_real_gallery(emb_dir: Path, bank_name: str = "bank_base.npy"):
+    """outputs/embeddings/<person>/<bank_name> 로드"""
+    gallery = {}
+    if not emb_dir.exists():
+        return gallery
+    for person_dir in sorted(d for d in emb_dir.iterdir() if d.is_dir()):
+        bank_path = person_dir / bank_name
+        if bank_path.exists():
+            gallery[person_dir.name] = normalize_rows(np.load(bank_path).reshape(-1, 512))
+    return gallery
+
+
+def iou(a: np.ndarray, b: np.ndarray) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def run_pack(quantized: bool, model: str, images, repeat: int):
+    """팩 하나로 모든 이미지 처리 → (이미지별 얼굴 리스트, 단계별 시간 summary)"""
+    timings = StageTimings()
+    app, device_id = create_face_analysis("recognition-only", name=model, device_id=-1,
+                                          timings=timings, quantized=quantized)
+    for _, img in images[:3]:
+        app.get(img)  # 워밍업
+    timings.reset()
+    results = []
+    for r in range(repeat):
+        faces = [app.get(img) for _, img in images]
+        if r == 0:
+            results = faces
+    return results, timings.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 vs FP32 모델 팩 정확도/지연시간 리포트")
+    parser.add_argument("--model", type=str, default=INSIGHTFACE_MODEL, help="FP32 모델 팩 이름")
+    parser.add_argument("--images-dir", type=str, default="images/enroll")
+    parser.add_argument("--embeddings-dir", type=str, default="outputs/embeddings")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if not (model_pack_dir(args.model + QUANTIZED_PACK_SUFFIX) / QUANTIZATION_MANIFEST).exists():
+        print(f"⚠️ INT8 모델 팩이 없습니다. 먼저 실행: python backend/quantize_models.py --model {args.model}")
+        return
+    images = load_images(PROJECT_ROOT / args.images_dir, args.limit)
+    if not images:
+        print(f"⚠️ 이미지가 없습니다: {args.images_dir}")
+        return
+    print(f"📊 CPU, 이미지 {len(images)}장 x {args.repeat}회")
+
+    fp32_faces, fp32_timings = run_pack(False, args.model, images, args.repeat)
+    int8_faces, int8_timings = run_pack(True, args.model, images, args.repeat)
+
+    print(f"\n{'stage':>12} | {'FP32 avg ms':>11} | {'INT8 avg ms':>11} | {'speedup':>7}")
+    for stage in ("detection", "recognition", "total"):
+        if stage in fp32_timings and stage in int8_timings:
+            fp32_ms, int8_ms = fp32_timings[stage]["avg_ms"], int8_timings[stage]["avg_ms"]
+            print(f"{stage:>12} | {fp32_ms:>11.3f} | {int8_ms:>11.3f} | {fp32_ms / max(int8_ms, 1e-6):>6.2f}x")
+
+    # 검출 매칭 (IoU >= 0.5) + 같은 얼굴의 임베딩 비교
+    pairs, fp32_total, int8_total, ious = [], 0, 0, []
+    for (person_id, _), fp32_list, int8_list in zip(images, fp32_faces, int8_faces):
+        fp32_total += len(fp32_list)
+        int8_total += len(int8_list)
+        for face in fp32_list:
+            scores = [iou(face.bbox, other.bbox) for other in int8_list]
+            if scores and max(scores) >= 0.5:
+                ious.append(max(scores))
+                pairs.append((person_id, face.embedding, int8_list[int(np.argmax(scores))].embedding))
+    print(f"\n검출: FP32 {fp32_total}개, INT8 {int8_total}개, 매칭 {len(pairs)}개 "
+          f"({len(pairs) / max(fp32_total, 1) * 100:.1f}%), 평균 IoU {np.mean(ious) if ious else 0:.3f}")
+    if not pairs:
+        return
+
+    fp32_emb = normalize_rows(np.stack([p[1] for p in pairs]).astype(np.float32))
+    int8_emb = normalize_rows(np.stack([p[2] for p in pairs]).astype(np.float32))
+    cosine = np.sum(fp32_emb * int8_emb, axis=1)
+    print(f"임베딩 cosine (FP32 vs INT8): 평균 {cosine.mean():.4f}, 최소 {cosine.min():.4f}, "
+          f"p5 {np.percentile(cosine, 5):.4f}")
+
+    # 기존 FP32 갤러리 대비 인식 결과
+    gallery = load_real_gallery(PROJECT_ROOT / args.embeddings_dir)
+    if not gallery:
+        print(f"ℹ️ 갤러리가 없어 인식 비교 생략: {args.embeddings_dir}")
+        return
+    index = GalleryIndex.from_gallery(gallery)
+    fp32_matches = index.match_batch(fp32_emb)
+    int8_matches = index.match_batch(int8_emb)
+    truth = [p[0] for p in pairs]
+    labeled = [i for i, pid in enumerate(truth) if pid in gallery]
+
+    def accuracy(matches):
+        hits = [i for i in labeled if matches[i][0] == truth[i] and matches[i][1] >= MAIN_THRESHOLD]
+        return len(hits) / max(len(labeled), 1) * 100
+
+    agree = np.mean([a[0] == b[0] for a, b in zip(fp32_matches, int8_matches)]) * 100
+    score_drop = np.array([a[1] - b[1] for a, b in zip(fp32_matches, int8_matches)])
+    print(f"\n갤러리 {len(gallery)}명, 정답 라벨 얼굴 {len(labeled)}개 (임계값 {MAIN_THRESHOLD})")
+    print(f"   top-1 정확도: FP32 {accuracy(fp32_matches):.1f}% / INT8 {accuracy(int8_matches):.1f}%")
+    print(f"   top-1 인물 일치율 (FP32 vs INT8): {agree:.1f}%")
+    print(f"   best 점수 변화 (FP32 - INT8): 평균 {score_drop.mean():+.4f}, 최대 {score_drop.max():+.4f}")
+
+
+if __name__ == "__main__":
+    main()
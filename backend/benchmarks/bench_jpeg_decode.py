@@ -0,0 +1,162 @@
+"""
+JPEG 디코딩 리포트: 전체 디코딩(IMREAD_COLOR) vs detection 해상도 축소 디코딩(IMREAD_REDUCED_COLOR_2/4/8)
+images/enroll 이미지를 --width 크기(1080p / 4K 카메라 흉내)로 맞춰 JPEG로 인코딩한 뒤
+- 프레임당 디코딩 시간
+- 디코딩된 프레임 크기 / tracemalloc 최대 할당량 (MB)
+- 전체 디코딩 후 detector 입력 크기로 축소한 것과 축소 디코딩의 픽셀 차이 (평균 절대 오차)
+를 비교합니다.
+
+--check-occlusion을 주면 얼굴 모델로 같은 프레임을 전체 디코딩 / 축소 디코딩해서 탐지한 뒤
+얼굴별 가림 여부(face_clear)가 같은지 확인합니다 (다르면 종료 코드 1):
+- 축소 디코딩 얼굴의 가림 여부가 원본 좌표 변환 배율과 무관한지 (항상 일치해야 함)
+- IoU >= 0.5로 짝지은 전체 디코딩 얼굴과 가림 여부 불일치 비율이 --occlusion-tolerance 이하인지
+
+사용 예시:
+    python backend/benchmarks/bench_jpeg_decode.py
+    python backend/benchmarks/bench_jpeg_decode.py --width 3840 --det-size 640 --repeat 10
+    python backend/benchmarks/bench_jpeg_decode.py --width 3840 --check-occlusion
+"""
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2
+import numpy as np
+
+from backend.utils.bbox_utils import calculate_bbox_iou
+from backend.utils.jpeg_decode import decode_for_detection, jpeg_size, reduction_factor
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+def load_jpegs(image_dir: Path, limit: int, width: int, quality: int):
+    """등록 이미지 → width 크기로 맞춘 JPEG 버퍼(np.uint8) 리스트"""
+    jpegs = []
+    for path in sorted(image_dir.rglob("*")):
+        if path.suffix.lower() not in IMAGE_EXTS:
+            continue
+        img = cv2.imread(str(path))
+        if img is None:
+            continue
+        height = max(1, int(img.shape[0] * width / img.shape[1]))
+        img = cv2.resize(img, (width, height), interpolation=cv2.INTER_CUBIC)
+        ok, encoded = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if ok:
+            jpegs.append(encoded.reshape(-1))
+        if len(jpegs) >= limit:
+            break
+    return jpegs
+
+
+def measure(jpegs, decode, repeat: int):
+    """디코딩 함수 → (ms/frame, 프레임 MB, tracemalloc 최대 MB)"""
+    for jpeg in jpegs[:2]:
+        decode(jpeg)  # 워밍업
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for jpeg in jpegs:
+            decode(jpeg)
+    elapsed = (time.perf_counter() - t0) * 1000 / (len(jpegs) * repeat)
+    tracemalloc.start()
+    frame_mb = decode(jpegs[0]).nbytes / 1e6
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return elapsed, frame_mb, peak_mb
+
+
+def detector_input(image: np.ndarray, det_size):
+    """detector가 실제로 보는 크기(비율 유지, det_size 안)로 축소"""
+    scale = min(det_size[0] / image.shape[1], det_size[1] / image.shape[0])
+    size = (int(image.shape[1] * scale), int(image.shape[0] * scale))
+    return cv2.resize(image, size, interpolation=cv2.INTER_LINEAR)
+
+
+def check_occlusion(jpegs, det_size, ctx_id, tolerance: float) -> bool:
+    """전체 디코딩 vs 축소 디코딩 얼굴의 가림 여부(face_clear) 비교 → 통과 여부"""
+    from backend.services import face_detection
+    from backend.services.face_detection import detect_faces_in_frames, describe_faces
+    from backend.utils.model_profile import create_face_analysis
+
+    app, _ = create_face_analysis(device_id=ctx_id)
+    face_detection.set_model(app)
+
+    faces_total, scale_mismatch, compared, mismatch = 0, 0, 0, 0
+    for jpeg in jpegs:
+        source = decode_for_detection(jpeg, det_size)
+        faces, (height, width) = detect_faces_in_frames([source.image], sources=[source])[0]
+        boxes, _, clear = describe_faces(faces, source.full_shape[1] / width, source.full_shape[0] / height)
+        _, _, unscaled_clear = describe_faces(faces, 1.0, 1.0)
+        faces_total += len(faces)
+        scale_mismatch += sum(a != b for a, b in zip(clear, unscaled_clear))
+
+        full = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+        full_faces, (full_height, full_width) = detect_faces_in_frames([full])[0]
+        full_boxes, _, full_clear = describe_faces(full_faces, full.shape[1] / full_width,
+                                                   full.shape[0] / full_height)
+        for box, is_clear in zip(boxes, clear):
+            ious = [calculate_bbox_iou(box, ref) for ref in full_boxes]
+            if ious and max(ious) >= 0.5:
+                compared += 1
+                mismatch += int(full_clear[int(np.argmax(ious))] != is_clear)
+
+    mismatch_rate = mismatch / max(compared, 1)
+    print(f"\n가림 여부(face_clear): 축소 디코딩 얼굴 {faces_total}개 중 배율 의존 {scale_mismatch}개, "
+          f"전체 디코딩과 짝지은 {compared}개 중 불일치 {mismatch}개 ({mismatch_rate:.1%})")
+    passed = scale_mismatch == 0 and mismatch_rate <= tolerance
+    print("✅ 가림 여부 일치" if passed else f"❌ 가림 여부 불일치 (허용 {tolerance:.1%})")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 디코딩 vs 축소 디코딩 리포트")
+    parser.add_argument("--images-dir", type=str, default="images/enroll")
+    parser.add_argument("--limit", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--width", type=int, default=1920, help="프레임 가로 크기 (1920 = 1080p, 3840 = 4K)")
+    parser.add_argument("--quality", type=int, default=90, help="JPEG 품질")
+    parser.add_argument("--det-size", type=int, default=640, help="detection 입력 크기 (정사각형)")
+    parser.add_argument("--check-occlusion", action="store_true", help="얼굴 모델로 가림 여부 일치 확인")
+    parser.add_argument("--occlusion-tolerance", type=float, default=0.05,
+                        help="전체 디코딩과의 가림 여부 불일치 허용 비율 (랜드마크 위치 차이)")
+    parser.add_argument("--ctx-id", type=int, default=None, help="None이면 INSIGHTFACE_CTX_ID / 자동 감지")
+    args = parser.parse_args()
+
+    jpegs = load_jpegs(PROJECT_ROOT / args.images_dir, args.limit, args.width, args.quality)
+    if not jpegs:
+        print(f"⚠️ 이미지가 없습니다: {args.images_dir}")
+        return
+    det_size = (args.det_size, args.det_size)
+    shape = jpeg_size(jpegs[0])
+    factor = reduction_factor(shape, det_size)
+    print(f"📊 프레임 {len(jpegs)}장 x {args.repeat}회 ({shape[1]}x{shape[0]}, det_size={args.det_size}, 축소 배율 1/{factor})")
+
+    full = measure(jpegs, lambda jpeg: cv2.imdecode(jpeg, cv2.IMREAD_COLOR), args.repeat)
+    full_resize = measure(jpegs, lambda jpeg: detector_input(cv2.imdecode(jpeg, cv2.IMREAD_COLOR), det_size),
+                          args.repeat)
+    reduced = measure(jpegs, lambda jpeg: decode_for_detection(jpeg, det_size).image, args.repeat)
+
+    print(f"\n{'mode':>14} | {'decode ms/f':>11} | {'frame MB':>8} | {'peak MB':>7}")
+    for name, (ms, frame_mb, peak_mb) in (("full", full), ("full+resize", full_resize), ("reduced", reduced)):
+        print(f"{name:>14} | {ms:>11.2f} | {frame_mb:>8.2f} | {peak_mb:>7.2f}")
+
+    # detector 입력 기준 픽셀 차이 (축소 디코딩이 detection 품질을 바꾸지 않는지)
+    errors = []
+    for jpeg in jpegs:
+        reference = detector_input(cv2.imdecode(jpeg, cv2.IMREAD_COLOR), det_size)
+        candidate = cv2.resize(detector_input(decode_for_detection(jpeg, det_size).image, det_size),
+                               (reference.shape[1], reference.shape[0]), interpolation=cv2.INTER_LINEAR)
+        errors.append(float(np.mean(cv2.absdiff(reference, candidate))))
+    print(f"\ndetector 입력 평균 절대 오차: {np.mean(errors):.2f} (0~255)")
+
+    if args.check_occlusion and not check_occlusion(jpegs, det_size, args.ctx_id, args.occlusion_tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+모델 구성 프로파일별 단계 실행 시간 리포트
+images/enroll 이미지로 프로파일마다 FaceAnalysis.get()을 실행하고
+단계별(detection / recognition / landmark / genderage) 평균 시간과 프레임당 전체 시간을 비교
+
+사용 예시:
+    python backend/benchmarks/bench_model_profiles.py
+    python backend/benchmarks/bench_model_profiles.py --profiles recognition-only full --repeat 5
+"""
+import sys
+import argparse
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2
+
+from backend.utils.model_profile import MODEL_PROFILES, StageTimings, create_face_analysis
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+def load_images(image_dir: Path, limit: int):
+    """등록 이미지 로드 (BGR)"""
+    images = []
+    for path in sorted(image_dir.rglob("*")):
+        if path.suffix.lower() in IMAGE_EXTS:
+            img = cv2.imread(str(path))
+            if img is not None:
+                images.append(img)
+        if len(images) >= limit:
+            break
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모델 프로파일별 단계 실행 시간 리포트")
+    parser.add_argument("--images-dir", type=str, default="images/enroll")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--profiles", type=str, nargs="+", default=list(MODEL_PROFILES))
+    args = parser.parse_args()
+
+    images = load_images(PROJECT_ROOT / args.images_dir, args.limit)
+    if not images:
+        print(f"⚠️ 이미지가 없습니다: {args.images_dir}")
+        return
+    print(f"📊 이미지 {len(images)}장 x {args.repeat}회")
+
+    reference = None
+    for profile in args.profiles:
+        timings = StageTimings()
+        app, device_id = create_face_analysis(profile, timings=timings)
+        for img in images[:3]:
+            app.get(img)  # 워밍업
+        timings.reset()
+
+        embeddings = []
+        for _ in range(args.repeat):
+            for img in images:
+                embeddings.extend(face.embedding for face in app.get(img))
+
+        summary = timings.summary()
+        print(f"\n[{profile}] {'GPU' if device_id >= 0 else 'CPU'}, 얼굴 {len(embeddings) // args.repeat}개")
+        print(f"{'stage':>16} | {'calls':>6} | {'avg ms':>8} | {'ms/frame':>8}")
+        frames = summary.get("total", {}).get("calls", 1)
+        for stage, stat in summary.items():
+            print(f"{stage:>16} | {stat['calls']:>6} | {stat['avg_ms']:>8.3f} | {stat['total_ms'] / frames:>8.3f}")
+
+        # 프로파일이 바뀌어도 인식 임베딩은 같아야 함
+        if embeddings:
+            stacked = np.stack(embeddings)
+            if reference is None:
+                reference = stacked
+            elif reference.shape == stacked.shape:
+                print(f"   임베딩 최대 차이 (첫 프로파일 대비): {np.abs(reference - stacked).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
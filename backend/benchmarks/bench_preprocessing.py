@@ -0,0 +1,113 @@
+"""
+프레임 전처리 리포트: 기존 preprocess_image_for_detection vs 스트림별 조건부 전처리(FramePreprocessor)
+images/enroll 이미지를 저해상도 CCTV처럼 축소(--scale) / 어둡게(--darken) 만든 뒤
+- 프레임당 전처리 시간, detection 시간
+- 기존 전처리 대비 검출 재현율 (원본 좌표로 옮긴 박스 IoU >= 0.5)
+을 비교합니다.
+
+사용 예시:
+    python backend/benchmarks/bench_preprocessing.py
+    python backend/benchmarks/bench_preprocessing.py --scale 0.25 --darken 0.4 --repeat 5
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2
+import numpy as np
+
+from backend.services.frame_preprocessing import FramePreprocessor
+from backend.utils.bbox_utils import calculate_bbox_iou
+from backend.utils.image_utils import preprocess_image_for_detection
+from backend.utils.model_profile import create_face_analysis
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+def load_frames(image_dir: Path, limit: int, scale: float, darken: float):
+    """등록 이미지 → 축소 / 어둡게 만든 저화질 프레임 (BGR)"""
+    frames = []
+    for path in sorted(image_dir.rglob("*")):
+        if path.suffix.lower() not in IMAGE_EXTS:
+            continue
+        img = cv2.imread(str(path))
+        if img is None:
+            continue
+        if scale != 1.0:
+            img = cv2.resize(img, (max(1, int(img.shape[1] * scale)), max(1, int(img.shape[0] * scale))),
+                             interpolation=cv2.INTER_AREA)
+        if darken != 1.0:
+            img = cv2.convertScaleAbs(img, alpha=darken)
+        frames.append(img)
+        if len(frames) >= limit:
+            break
+    return frames
+
+
+def run(detector, frames, preprocess, repeat: int):
+    """전처리 + detection → (프레임별 원본 좌표 박스, 전처리 ms/frame, detection ms/frame)"""
+    boxes, pre_ms, det_ms = [], 0.0, 0.0
+    for r in range(repeat):
+        for frame in frames:
+            t0 = time.perf_counter()
+            processed = preprocess(frame)
+            t1 = time.perf_counter()
+            bboxes, _ = detector.detect(processed, max_num=0, metric="default")
+            t2 = time.perf_counter()
+            pre_ms += (t1 - t0) * 1000
+            det_ms += (t2 - t1) * 1000
+            if r == 0:
+                scale = np.array([frame.shape[1] / processed.shape[1], frame.shape[0] / processed.shape[0]] * 2)
+                boxes.append([bbox[:4] * scale for bbox in bboxes])
+    count = len(frames) * repeat
+    return boxes, pre_ms / count, det_ms / count
+
+
+def recall(reference, boxes) -> float:
+    total, found = 0, 0
+    for ref_boxes, frame_boxes in zip(reference, boxes):
+        total += len(ref_boxes)
+        found += sum(1 for ref in ref_boxes if any(calculate_bbox_iou(ref, box) >= 0.5 for box in frame_boxes))
+    return found / max(total, 1) * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기존 전처리 vs 조건부 전처리 리포트")
+    parser.add_argument("--images-dir", type=str, default="images/enroll")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=0.35, help="저해상도 CCTV 흉내 (원본 대비 축소 비율)")
+    parser.add_argument("--darken", type=float, default=1.0, help="밝기 배율 (1.0 = 그대로)")
+    parser.add_argument("--ctx-id", type=int, default=None, help="None이면 INSIGHTFACE_CTX_ID / 자동 감지")
+    args = parser.parse_args()
+
+    frames = load_frames(PROJECT_ROOT / args.images_dir, args.limit, args.scale, args.darken)
+    if not frames:
+        print(f"⚠️ 이미지가 없습니다: {args.images_dir}")
+        return
+    app, _ = create_face_analysis(device_id=args.ctx_id, timings=None)
+    detector = app.det_model
+    preprocessor = FramePreprocessor(det_size=tuple(app.det_size))
+    print(f"📊 프레임 {len(frames)}장 x {args.repeat}회 (scale={args.scale}, darken={args.darken}, "
+          f"det_size={app.det_size[0]}x{app.det_size[1]})")
+    for frame in frames[:3]:
+        detector.detect(preprocess_image_for_detection(frame), max_num=0, metric="default")  # 워밍업
+
+    reference, legacy_pre, legacy_det = run(detector, frames, preprocess_image_for_detection, args.repeat)
+    gated, gated_pre, gated_det = run(detector, frames, preprocessor.process, args.repeat)
+
+    print(f"\n{'mode':>8} | {'pre ms/f':>8} | {'det ms/f':>8} | {'total ms/f':>10} | {'faces':>6} | {'recall':>7}")
+    for name, boxes, pre_ms, det_ms in (("legacy", reference, legacy_pre, legacy_det),
+                                        ("gated", gated, gated_pre, gated_det)):
+        print(f"{name:>8} | {pre_ms:>8.2f} | {det_ms:>8.2f} | {pre_ms + det_ms:>10.2f} | "
+              f"{sum(len(b) for b in boxes):>6} | {recall(reference, boxes):>6.1f}%")
+    print(f"\n조건부 전처리 상태: {preprocessor.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+2단계 매칭(centroid 후보 선별) recall / latency 리포트
+전체 비교(match_batch)와 match_pruned의 bank별 best 인물 일치율, early exit 비율, 지연시간을 비교
+
+사용 예시:
+    # 합성 갤러리 (5000명, base 3 / dynamic 6 / masked 2 임베딩)
+    python backend/benchmarks/bench_pruning_recall.py --persons 5000 --top-m 8 16 32 64
+
+    # 실제 outputs/embeddings 사용 (centroid_base.npy / centroid_dynamic.npy 포함)
+    python backend/benchmarks/bench_pruning_recall.py --embeddings-dir outputs/embeddings
+"""
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.services.gallery_index import GalleryIndex, normalize_rows, person_centroids
+from backend.services.candidate_pruning import match_pruned, pruning_stats
+from backend.benchmarks.bench_ann_recall import load_real_gallery, make_queries
+
+
+def make_synthetic_banks(num_persons: int, dim: int = 512, seed: int = 0):
+    """인물별 중심 주변에 base / dynamic(각도 변화 큼) / masked(일부 인물) bank 생성"""
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((num_persons, dim)).astype(np.float32))
+    banks = {"base": {}, "masked": {}, "dynamic": {}}
+    for i in range(num_persons):
+        pid = f"p{i:06d}"
+        banks["base"][pid] = normalize_rows(centers[i] + rng.standard_normal((3, dim)).astype(np.float32) * 0.04)
+        banks["dynamic"][pid] = normalize_rows(centers[i] + rng.standard_normal((6, dim)).astype(np.float32) * 0.06)
+        if i % 3 == 0:
+            banks["masked"][pid] = normalize_rows(centers[i] + rng.standard_normal((2, dim)).astype(np.float32) * 0.07)
+    return banks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="centroid 2단계 매칭 recall/latency 리포트")
+    parser.add_argument("--persons", type=int, default=5000)
+    parser.add_argument("--embeddings-dir", type=str, default=None)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=15, help="프레임당 얼굴 수")
+    parser.add_argument("--top-m", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--decisive", type=float, default=0.9, help="base early exit 기준")
+    args = parser.parse_args()
+
+    if args.embeddings_dir:
+        emb_dir = PROJECT_ROOT / args.embeddings_dir
+        banks = {bank: load_real_gallery(emb_dir, f"bank_{bank}.npy") for bank in ("base", "masked", "dynamic")}
+    else:
+        banks = make_synthetic_banks(args.persons)
+    centroids = {
+        pid: person_centroids(base, banks["masked"].get(pid), banks["dynamic"].get(pid))
+        for pid, base in banks["base"].items()
+    }
+    queries, _ = make_queries(banks["dynamic"] or banks["base"], args.queries)
+
+    indexes = {bank: GalleryIndex.from_gallery(banks[bank]) for bank in ("base", "masked", "dynamic")}
+    centroid_index = GalleryIndex.from_gallery(centroids)
+    print(f"📊 갤러리: {len(indexes['base'])}명, base {indexes['base'].num_rows} / masked {indexes['masked'].num_rows} / "
+          f"dynamic {indexes['dynamic'].num_rows}개 임베딩, 쿼리 {queries.shape[0]}개 (배치 {args.batch_size})")
+
+    def run(match_fn):
+        tables, elapsed = ([], [], []), 0.0
+        for start in range(0, queries.shape[0], args.batch_size):
+            batch = queries[start:start + args.batch_size]
+            t0 = time.perf_counter()
+            result = match_fn(batch)
+            elapsed += time.perf_counter() - t0
+            for table, part in zip(tables, result):
+                table.extend(part)
+        return tables, elapsed * 1000 / queries.shape[0]
+
+    exact_tables, exact_ms = run(lambda q: tuple(indexes[b].match_batch(q) for b in ("base", "masked", "dynamic")))
+    print(f"\n[exhaustive] {exact_ms:.3f} ms/face")
+
+    print(f"\n{'top-M':>6} | {'ms/face':>8} | {'speedup':>7} | {'base recall':>11} | {'dynamic recall':>14} | {'early exit':>10}")
+    for top_m in args.top_m:
+        pruning_stats.update(faces=0, persons=0, candidates=0, early_exits=0)
+        tables, ms = run(lambda q: match_pruned(q, indexes["base"], indexes["masked"], indexes["dynamic"],
+                                                centroid_index, top_m=top_m, decisive_sim=args.decisive))
+        base_recall = np.mean([a[0] == b[0] for a, b in zip(tables[0], exact_tables[0])])
+        # early exit한 얼굴은 dynamic을 base 승자 한 명만 비교하므로 나머지 얼굴만으로 recall 계산
+        compared = [(a, b) for a, b, base in zip(tables[2], exact_tables[2], tables[0]) if base[1] < args.decisive]
+        dynamic_recall = np.mean([a[0] == b[0] for a, b in compared]) if compared else float("nan")
+        early_exit = pruning_stats["early_exits"] / max(pruning_stats["faces"], 1)
+        print(f"{top_m:>6} | {ms:>8.3f} | {exact_ms / ms:>6.1f}x | {base_recall:>11.4f} | {dynamic_recall:>14.4f} | {early_exit:>10.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+갤러리 압축(float16 / int8) 정확도 / 메모리 / 지연시간 리포트
+base bank로 갤러리를 만들고, 각도별 평가 bank(bank_{angle_type}.npy)를 쿼리로 사용해
+float32 정확 검색과 압축 검색(1차 스캔 + float32 재채점)을 비교
+(MB = 상주 메모리 GalleryIndex.nbytes, disk MB = 재채점용 float32 memmap 크기)
+
+사용 예시:
+    # 실제 outputs/embeddings 사용 (bank_base.npy = 갤러리, bank_left.npy 등 = 쿼리)
+    python backend/benchmarks/bench_quantization.py --embeddings-dir outputs/embeddings
+
+    # 합성 갤러리 (5만 명 x 3 임베딩)
+    python backend/benchmarks/bench_quantization.py --persons 50000 --rerank 4 8 16
+"""
+import sys
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.services.gallery_index import GalleryIndex, normalize_rows
+from backend.benchmarks.bench_ann_recall import make_synthetic_gallery, make_queries, load_real_gallery, time_batches
+
+EVAL_ANGLES = ["front", "left", "right", "top", "left_profile", "right_profile"]
+
+
+def load_angle_queries(emb_dir: Path):
+    """각도별 평가 bank를 쿼리로 로드 → {angle_type: (queries, truth)}"""
+    per_angle = {}
+    for person_dir in sorted(d for d in emb_dir.iterdir() if d.is_dir()):
+        for angle in EVAL_ANGLES:
+            bank_path = person_dir / f"bank_{angle}.npy"
+            if not bank_path.exists():
+                continue
+            rows = normalize_rows(np.load(bank_path).reshape(-1, 512))
+            queries, truth = per_angle.setdefault(angle, ([], []))
+            queries.append(rows)
+            truth.extend([person_dir.name] * rows.shape[0])
+    return {angle: (np.vstack(q), t) for angle, (q, t) in per_angle.items()}
+
+
+def evaluate(index: GalleryIndex, queries: np.ndarray, truth, batch_size: int):
+    """(결과, 얼굴당 지연시간 ms, top-1 정답률)"""
+    results, latencies = time_batches(index.match_batch, queries, batch_size)
+    accuracy = float(np.mean([r[0] == t for r, t in zip(results, truth)]))
+    return results, latencies, accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="갤러리 압축 정확도/메모리/지연시간 리포트")
+    parser.add_argument("--persons", type=int, default=50000)
+    parser.add_argument("--rows-per-person", type=int, default=3)
+    parser.add_argument("--embeddings-dir", type=str, default=None)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=15, help="프레임당 얼굴 수")
+    parser.add_argument("--rerank", type=int, nargs="+", default=[8], help="재채점 후보 인물 수")
+    args = parser.parse_args()
+
+    if args.embeddings_dir:
+        emb_dir = PROJECT_ROOT / args.embeddings_dir
+        gallery = load_real_gallery(emb_dir)
+        query_sets = load_angle_queries(emb_dir)
+    else:
+        gallery, _ = make_synthetic_gallery(args.persons, args.rows_per_person)
+        query_sets = {"synthetic": make_queries(gallery, args.queries)}
+    if not query_sets:
+        print("⚠️ 각도별 평가 bank(bank_{angle_type}.npy)가 없습니다.")
+        return
+
+    exact = GalleryIndex.from_gallery(gallery)
+    print(f"📊 갤러리: {len(exact)}명, {exact.num_rows}개 임베딩, float32 행렬 {exact.nbytes / 1e6:.1f} MB")
+
+    configs = [("none", 0)] + [(mode, r) for mode in ("float16", "int8") for r in args.rerank]
+    print(f"\n{'angle':>14} | {'mode':>8} | {'rerank':>6} | {'MB':>7} | {'disk MB':>7} | {'ms/face':>8} | {'top-1':>7} | {'Δtop-1':>7} | {'same id':>7} | {'max |Δbest|':>11}")
+    for angle, (queries, truth) in query_sets.items():
+        exact_results, exact_lat, exact_acc = evaluate(exact, queries, truth, args.batch_size)
+        for mode, rerank in configs:
+            if mode == "none":
+                index, results, lat, acc = exact, exact_results, exact_lat, exact_acc
+            else:
+                index = GalleryIndex.from_gallery(gallery, quantization=mode, rerank_persons=rerank)
+                results, lat, acc = evaluate(index, queries, truth, args.batch_size)
+            same = np.mean([a[0] == b[0] for a, b in zip(results, exact_results)])
+            delta = max(abs(a[1] - b[1]) for a, b in zip(results, exact_results))
+            print(f"{angle:>14} | {mode:>8} | {rerank:>6} | {index.nbytes / 1e6:>7.1f} | "
+                  f"{index.rerank_nbytes / 1e6:>7.1f} | {lat.mean():>8.3f} | "
+                  f"{acc:>7.4f} | {acc - exact_acc:>+7.4f} | {same:>7.4f} | {delta:>11.4f}")
+
+
+if __name__ == "__main__":
+    main()
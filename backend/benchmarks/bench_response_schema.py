@@ -0,0 +1,111 @@
+"""
+감지 응답 리포트: 기존 응답(result 그대로) vs 간결한 스키마(compact_result)
+얼굴 --faces개, 학습 이벤트 --events개(512차원 임베딩)인 /ws/detect 응답을 만들어
+- 직렬화된 메시지 크기 (바이트)
+- 프레임당 변환 + JSON 직렬화 시간 (starlette send_json과 같은 json.dumps 옵션)
+을 비교합니다.
+
+사용 예시:
+    python backend/benchmarks/bench_response_schema.py
+    python backend/benchmarks/bench_response_schema.py --faces 8 --events 2 --repeat 2000
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np
+
+from backend.utils.response_schema import compact_result
+
+STATUSES = ("criminal", "normal", "unknown")
+
+
+def make_result(faces: int, events: int, seed: int = 0):
+    """process_detection + temporal filter 결과와 같은 형태의 합성 결과"""
+    rng = np.random.default_rng(seed)
+    detections = []
+    for i in range(faces):
+        x1, y1 = (int(v) for v in rng.integers(0, 1600, size=2))
+        size = int(rng.integers(40, 240))
+        status = STATUSES[i % len(STATUSES)]
+        detections.append({
+            "bbox": [x1, y1, x1 + size, y1 + size],
+            "status": status,
+            "person_type": "criminal" if status == "criminal" else "unknown",
+            "name": f"person_{i}" if status != "unknown" else "Unknown",
+            "person_id": f"person_{i}" if status != "unknown" else None,
+            "confidence": round(float(rng.uniform(30, 99)), 2),
+            "color": {"criminal": "red", "normal": "green", "unknown": "yellow"}[status],
+            "angle_type": "front",
+            "yaw_angle": float(rng.uniform(-40, 40)),
+            "bank_type": "base",
+        })
+    learning_events = []
+    for i in range(events):
+        embedding = rng.standard_normal(512).astype(np.float32)
+        learning_events.append({
+            "person_id": f"person_{i}",
+            "person_name": f"person_{i}",
+            "angle_type": "left",
+            "yaw_angle": 22.5,
+            "embedding": (embedding / np.linalg.norm(embedding)).tolist(),
+            "bank_type": "dynamic",
+        })
+    return {
+        "detections": detections,
+        "alert": True,
+        "metadata": {"name": "person_0", "confidence": 91.23, "status": "criminal", "person_type": "criminal",
+                     "person_id": "person_0"},
+        "learning_events": learning_events,
+    }
+
+
+def serialize(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def measure(result, build, repeat: int):
+    """응답 생성 함수 → (바이트, 생성 + 직렬화 ms/frame)"""
+    message = serialize(build(result))
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        serialize(build(result))
+    return len(message.encode("utf-8")), (time.perf_counter() - t0) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기존 응답 vs 간결한 응답 스키마 리포트")
+    parser.add_argument("--faces", type=int, default=5)
+    parser.add_argument("--events", type=int, default=1, help="학습 이벤트 수 (각 512차원 임베딩)")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    result = make_result(args.faces, args.events)
+
+    def legacy(data):
+        return {"type": "detection", "data": {"frame_id": 1, "video_timestamp": 0.1, **data}}
+
+    def compact(data):
+        return {"type": "detection", "data": {"frame_id": 1, "video_timestamp": 0.1, **compact_result(data)}}
+
+    def compact_debug(data):
+        return {"type": "detection", "data": {"frame_id": 1, "video_timestamp": 0.1,
+                                              **compact_result(data, debug=True)}}
+
+    print(f"📊 얼굴 {args.faces}개, 학습 이벤트 {args.events}개, {args.repeat}회")
+    rows = [(name, *measure(result, build, args.repeat))
+            for name, build in (("legacy", legacy), ("compact", compact), ("compact+debug", compact_debug))]
+    legacy_bytes = rows[0][1]
+    print(f"\n{'schema':>14} | {'bytes':>7} | {'size':>6} | {'ms/frame':>8}")
+    for name, size, ms in rows:
+        print(f"{name:>14} | {size:>7} | {size / legacy_bytes * 100:>5.1f}% | {ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
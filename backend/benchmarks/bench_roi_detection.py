@@ -0,0 +1,105 @@
+"""
+트랙 주변 ROI detection vs 매 프레임 전체 탐지 리포트
+같은 영상 구간을
+- 매 프레임 전체 프레임 탐지 (기존 동작)
+- RoiDetectionPlanner (키프레임 간격별)
+로 처리해서 프레임당 detection 시간, 키프레임 / ROI 프레임 수, 전체 탐지 대비 얼굴 재현율(IoU >= 0.5)을 비교
+
+사용 예시:
+    python backend/benchmarks/bench_roi_detection.py --video data/cctv.mp4
+    python backend/benchmarks/bench_roi_detection.py --video data/cctv.mp4 --frames 600 --intervals 5 10 30
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2
+
+from backend.config import ROI_DET_SIZE
+from backend.services import face_detection
+from backend.services.face_detection import detect_faces_in_frames
+from backend.services.roi_detection import RoiDetectionPlanner
+from backend.utils.bbox_utils import calculate_bbox_iou
+from backend.utils.model_profile import stage_timings, create_face_analysis, prepare_detector_sizes
+
+
+def load_frames(video_path: Path, limit: int, stride: int):
+    """영상에서 stride 간격으로 프레임 로드 (BGR)"""
+    cap = cv2.VideoCapture(str(video_path))
+    frames, index = [], 0
+    while len(frames) < limit:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        if index % stride == 0:
+            frames.append(frame)
+        index += 1
+    cap.release()
+    return frames
+
+
+def run(frames, planner=None):
+    """프레임 순서대로 처리 → (프레임별 얼굴 박스, 프레임당 detection ms, 프레임당 전체 ms)"""
+    stage_timings.reset()
+    boxes = []
+    t0 = time.perf_counter()
+    for frame in frames:
+        rois = planner.plan(frame) if planner is not None else None
+        faces, processed_shape = detect_faces_in_frames([frame], rois=[rois])[0]
+        if planner is not None:
+            planner.observe(faces, processed_shape)
+        boxes.append([face.bbox[:4] for face in faces])
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    det_ms = stage_timings.summary().get("detection", {}).get("total_ms", 0.0)
+    return boxes, det_ms / len(frames), elapsed_ms / len(frames)
+
+
+def recall(reference, boxes) -> float:
+    """전체 탐지에서 찾은 얼굴 중 IoU >= 0.5로 다시 찾은 비율"""
+    total, found = 0, 0
+    for ref_boxes, frame_boxes in zip(reference, boxes):
+        total += len(ref_boxes)
+        found += sum(1 for ref in ref_boxes if any(calculate_bbox_iou(ref, box) >= 0.5 for box in frame_boxes))
+    return found / max(total, 1) * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROI detection vs 전체 프레임 탐지 리포트")
+    parser.add_argument("--video", type=str, required=True)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--stride", type=int, default=3, help="영상 프레임 간격 (30fps 영상 → 3이면 10fps)")
+    parser.add_argument("--intervals", type=int, nargs="+", default=[5, 10, 20], help="키프레임 간격")
+    parser.add_argument("--ctx-id", type=int, default=None, help="None이면 INSIGHTFACE_CTX_ID / 자동 감지")
+    args = parser.parse_args()
+
+    frames = load_frames(PROJECT_ROOT / args.video, args.frames, args.stride)
+    if not frames:
+        print(f"⚠️ 프레임을 읽을 수 없습니다: {args.video}")
+        return
+    print(f"📊 프레임 {len(frames)}장 ({frames[0].shape[1]}x{frames[0].shape[0]}), ROI detector {ROI_DET_SIZE[0]}x{ROI_DET_SIZE[1]}")
+
+    app, _ = create_face_analysis(device_id=args.ctx_id)
+    prepare_detector_sizes(app, [ROI_DET_SIZE])
+    face_detection.set_model(app)
+    run(frames[:3])  # 워밍업
+
+    reference, full_det_ms, full_ms = run(frames)
+    print(f"\n{'mode':>12} | {'det ms/f':>8} | {'total ms/f':>10} | {'keyframes':>9} | {'roi frames':>10} | "
+          f"{'roi area':>8} | {'recall':>7}")
+    print(f"{'full':>12} | {full_det_ms:>8.2f} | {full_ms:>10.2f} | {len(frames):>9} | {0:>10} | "
+          f"{1.0:>8.3f} | {100.0:>6.1f}%")
+    for interval in args.intervals:
+        planner = RoiDetectionPlanner(keyframe_interval=interval)
+        boxes, det_ms, total_ms = run(frames, planner)
+        summary = planner.summary()
+        print(f"{f'roi (N={interval})':>12} | {det_ms:>8.2f} | {total_ms:>10.2f} | {summary['keyframes']:>9} | "
+              f"{summary['roi_frames']:>10} | {summary['avg_roi_area_ratio']:>8.3f} | {recall(reference, boxes):>6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -34,9 +34,125 @@ WEBSOCKET_URL = f"ws://localhost:{PORT}/ws/detect"
 # ==========================================
 # InsightFace 모델 설정
 # ==========================================
-INSIGHTFACE_MODEL = os.getenv("INSIGHTFACE_MODEL", "buffalo_l")
+# 배포 프로파일 (모델 팩 + detection 입력 크기)
+# custom: INSIGHTFACE_MODEL / INSIGHTFACE_DET_SIZE 환경 변수 사용 (기본값 buffalo_l, 640)
+DEPLOYMENT_PROFILES = {
+    "server-accurate": {"model": "buffalo_l", "det_size": (640, 640)},  # ResNet50 recognition, 서버 / GPU
+    "edge": {"model": "buffalo_s", "det_size": (480, 480)},  # MobileFaceNet recognition, CPU 엣지 장비
+    "edge-lite": {"model": "buffalo_sc", "det_size": (320, 320)},  # detection + recognition만, 저사양 장비
+}
+DEPLOYMENT_PROFILE = os.getenv("DEPLOYMENT_PROFILE", "custom")
+
+
+def _parse_det_size(value: str) -> tuple:
+    """"640" → (640, 640), "640x480" → (640, 480) (width x height, 32의 배수로 맞춤)"""
+    parts = [int(v) for v in value.lower().replace(",", "x").split("x") if v.strip()]
+    width, height = (parts[0], parts[0]) if len(parts) == 1 else parts[:2]
+    return (max(32, round(width / 32) * 32), max(32, round(height / 32) * 32))
+
+
+if DEPLOYMENT_PROFILE in DEPLOYMENT_PROFILES:
+    INSIGHTFACE_MODEL = DEPLOYMENT_PROFILES[DEPLOYMENT_PROFILE]["model"]
+    INSIGHTFACE_DET_SIZE = DEPLOYMENT_PROFILES[DEPLOYMENT_PROFILE]["det_size"]
+else:
+    if DEPLOYMENT_PROFILE != "custom":
+        print(f"⚠️ 알 수 없는 배포 프로파일: {DEPLOYMENT_PROFILE} → custom 사용 (가능: {', '.join(DEPLOYMENT_PROFILES)}, custom)")
+        DEPLOYMENT_PROFILE = "custom"
+    INSIGHTFACE_MODEL = os.getenv("INSIGHTFACE_MODEL", "buffalo_l")
+    INSIGHTFACE_DET_SIZE = _parse_det_size(os.getenv("INSIGHTFACE_DET_SIZE", "640"))
 INSIGHTFACE_CTX_ID = int(os.getenv("INSIGHTFACE_CTX_ID", 0))  # GPU: 0, CPU: -1
-INSIGHTFACE_DET_SIZE = (640, 640)
+# 모델 구성 프로파일 (backend/utils/model_profile.py)
+# recognition-only: detection + recognition / with-landmarks: + 2D/3D 랜드마크 / full: 모든 모델 (genderage 포함)
+INSIGHTFACE_PROFILE = os.getenv("INSIGHTFACE_PROFILE", "recognition-only")
+INSIGHTFACE_ROOT = os.getenv("INSIGHTFACE_ROOT", "~/.insightface")  # 모델 팩 루트 (<root>/models/<name>)
+# INT8 양자화 모델 팩 사용 (backend/quantize_models.py로 생성한 <INSIGHTFACE_MODEL>_int8, 없으면 FP32 사용)
+INSIGHTFACE_QUANTIZED = os.getenv("INSIGHTFACE_QUANTIZED", "0").lower() in ("1", "true", "yes")
+QUANTIZED_PACK_SUFFIX = "_int8"
+# 프레임의 모든 얼굴을 한 번의 recognition session.run으로 처리 (모델이 고정 batch면 그 크기로 나눠 실행)
+RECOGNITION_BATCH_ENABLED = os.getenv("RECOGNITION_BATCH_ENABLED", "1").lower() in ("1", "true", "yes")
+RECOGNITION_MAX_BATCH = int(os.getenv("RECOGNITION_MAX_BATCH", 32))  # 한 번에 넣을 최대 얼굴 수
+# 스트림 간 동적 배치 (backend/services/inference_server.py) - /ws/detect 프레임을 모아 한 번에 inference
+INFERENCE_BATCHING_ENABLED = os.getenv("INFERENCE_BATCHING_ENABLED", "0").lower() in ("1", "true", "yes")
+INFERENCE_MAX_BATCH = int(os.getenv("INFERENCE_MAX_BATCH", 8))  # 배치당 최대 프레임 수
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", 10))  # 첫 프레임 이후 다른 스트림 프레임을 기다리는 최대 시간
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", 1))  # 동시에 실행할 배치 수 (inference 스레드 수)
+# 스트림별 적응형 detection 입력 크기 (backend/services/adaptive_resolution.py)
+# 스트림에서 관찰한 얼굴 크기 분포로 detector 입력 크기(긴 변)를 고르고, N프레임마다 전체 크기로 한 번 탐지
+ADAPTIVE_DET_ENABLED = os.getenv("ADAPTIVE_DET_ENABLED", "0").lower() in ("1", "true", "yes")
+ADAPTIVE_DET_SIZES = [int(s) for s in os.getenv("ADAPTIVE_DET_SIZES", "320,480,640").split(",") if s.strip()]  # 긴 변 기준 (INSIGHTFACE_DET_SIZE 이하)
+ADAPTIVE_DET_MIN_FACE_PX = float(os.getenv("ADAPTIVE_DET_MIN_FACE_PX", 24))  # detector 입력에서 작은 얼굴(분위수)이 가져야 할 최소 높이
+ADAPTIVE_DET_QUANTILE = float(os.getenv("ADAPTIVE_DET_QUANTILE", 0.1))  # 기준 얼굴 크기 분위수 (작은 얼굴 쪽)
+ADAPTIVE_DET_HYSTERESIS = float(os.getenv("ADAPTIVE_DET_HYSTERESIS", 0.25))  # 낮출 때 필요한 여유 (MIN_FACE_PX x (1 + 값))
+ADAPTIVE_DET_DOWN_FRAMES = int(os.getenv("ADAPTIVE_DET_DOWN_FRAMES", 30))  # 낮출 조건이 연속으로 유지되어야 하는 프레임 수
+ADAPTIVE_DET_SWEEP_FRAMES = int(os.getenv("ADAPTIVE_DET_SWEEP_FRAMES", 30))  # N프레임마다 전체 크기로 탐지 (0 = 안 함)
+ADAPTIVE_DET_WINDOW = int(os.getenv("ADAPTIVE_DET_WINDOW", 200))  # 얼굴 크기 분포에 쓰는 최근 얼굴 수
+# 트랙 주변 ROI detection (backend/services/roi_detection.py)
+# 키프레임(N프레임마다 / 장면 전환)에만 전체 프레임을 탐지하고, 그 사이에는 직전 얼굴 주변 영역만 탐지
+ROI_DETECTION_ENABLED = os.getenv("ROI_DETECTION_ENABLED", "0").lower() in ("1", "true", "yes")
+ROI_KEYFRAME_INTERVAL = int(os.getenv("ROI_KEYFRAME_INTERVAL", 10))  # 전체 프레임 탐지 주기 (프레임)
+ROI_EXPAND = float(os.getenv("ROI_EXPAND", 1.0))  # 얼굴 박스를 각 방향으로 (박스 크기 x 값)만큼 넓혀서 탐지
+ROI_DET_SIZE = _parse_det_size(os.getenv("ROI_DET_SIZE", "256"))  # ROI 탐지용 detector 입력 크기
+ROI_MAX_AREA_RATIO = float(os.getenv("ROI_MAX_AREA_RATIO", 0.5))  # ROI 합이 프레임의 이 비율을 넘으면 전체 프레임 탐지
+ROI_SCENE_CHANGE_THRESHOLD = float(os.getenv("ROI_SCENE_CHANGE_THRESHOLD", 0.12))  # 직전 프레임 대비 평균 밝기 차이 (0~1), 넘으면 키프레임
+ROI_TRACK_TTL = int(os.getenv("ROI_TRACK_TTL", 2))  # ROI에서 얼굴을 못 찾아도 트랙을 유지하는 프레임 수
+# 트랙별 임베딩 / 매칭 결과 재사용 (backend/services/recognition_cache.py)
+# 얼굴이 거의 움직이지 않고 자세 / 화질 / 가림 상태가 같으면 직전 임베딩과 매칭 결과를 다시 사용
+REC_CACHE_ENABLED = os.getenv("REC_CACHE_ENABLED", "0").lower() in ("1", "true", "yes")
+REC_CACHE_MAX_MOVE = float(os.getenv("REC_CACHE_MAX_MOVE", 0.15))  # 임베딩 계산 때 대비 중심 이동 / 크기 변화 (얼굴 크기 대비)
+REC_CACHE_MAX_YAW_DELTA = float(os.getenv("REC_CACHE_MAX_YAW_DELTA", 10.0))  # yaw 변화 허용치 (도), angle_type도 같아야 함
+REC_CACHE_TTL_MS = float(os.getenv("REC_CACHE_TTL_MS", 1000))  # 이보다 오래된 임베딩은 다시 계산 (주기적 갱신)
+# 스트림별 조건부 전처리 (backend/services/frame_preprocessing.py)
+# 업스케일 대신 detector 입력 크기에 맞춰 처리하고, 밝기 / 대비 / 선명도 통계로 필요한 보정만 적용
+PREPROC_GATED_ENABLED = os.getenv("PREPROC_GATED_ENABLED", "0").lower() in ("1", "true", "yes")
+PREPROC_STATS_INTERVAL = int(os.getenv("PREPROC_STATS_INTERVAL", 30))  # N프레임마다 통계 갱신 (그 사이는 캐시 사용)
+PREPROC_DARK_THRESHOLD = float(os.getenv("PREPROC_DARK_THRESHOLD", 70))  # 평균 밝기(0~255)가 이보다 낮으면 CLAHE
+PREPROC_CONTRAST_THRESHOLD = float(os.getenv("PREPROC_CONTRAST_THRESHOLD", 35))  # 밝기 표준편차가 이보다 낮으면 CLAHE
+PREPROC_BLUR_THRESHOLD = float(os.getenv("PREPROC_BLUR_THRESHOLD", 80))  # Laplacian 분산이 이보다 낮으면 샤프닝
+
+# 축소 디코딩 (backend/utils/jpeg_decode.py)
+# 1080p / 4K JPEG를 detector 입력(INSIGHTFACE_DET_SIZE)에 필요한 해상도로만 디코딩 (IMREAD_REDUCED_COLOR_2/4/8)
+# 원본 해상도는 작은 얼굴의 recognition 정렬에 필요할 때만 디코딩하고, 스냅샷은 받은 JPEG를 그대로 사용
+DECODE_SCALE_ENABLED = os.getenv("DECODE_SCALE_ENABLED", "0").lower() in ("1", "true", "yes")
+DECODE_SCALE_MAX_FACTOR = int(os.getenv("DECODE_SCALE_MAX_FACTOR", 8))  # 최대 축소 배율 (1, 2, 4, 8)
+DECODE_FULL_RES_FACE_SIZE = float(os.getenv("DECODE_FULL_RES_FACE_SIZE", 112))  # 축소 프레임에서 얼굴이 이보다 작으면 원본에서 정렬
+
+# 스냅샷 서비스 (backend/services/snapshot_service.py)
+# alert 얼굴 주변 crop을 스레드 풀에서 JPEG로 인코딩해 메모리에 보관하고, 응답에는 snapshot_url만 포함 (GET /api/snapshots/{id})
+SNAPSHOT_SERVICE_ENABLED = os.getenv("SNAPSHOT_SERVICE_ENABLED", "0").lower() in ("1", "true", "yes")
+SNAPSHOT_INTERVAL_S = float(os.getenv("SNAPSHOT_INTERVAL_S", 5.0))  # 인물(트랙)별 최소 스냅샷 간격 (그 사이 프레임 중 가장 좋은 얼굴 사용)
+SNAPSHOT_CROP_MARGIN = float(os.getenv("SNAPSHOT_CROP_MARGIN", 1.0))  # 얼굴 박스 주변 여백 (얼굴 크기 대비, 각 방향)
+SNAPSHOT_JPEG_QUALITY = int(os.getenv("SNAPSHOT_JPEG_QUALITY", 85))
+SNAPSHOT_MAX_ITEMS = int(os.getenv("SNAPSHOT_MAX_ITEMS", 500))  # 보관 개수 (넘으면 오래된 것부터 삭제)
+SNAPSHOT_MAX_MB = float(os.getenv("SNAPSHOT_MAX_MB", 64))  # 보관 용량
+SNAPSHOT_WORKERS = int(os.getenv("SNAPSHOT_WORKERS", 2))  # 인코딩 스레드 수
+
+# 간결한 감지 응답 (backend/utils/response_schema.py)
+# 정수 bbox, 짧은 상태 코드, 임베딩 없는 학습 이벤트 (web/modules/detection.js의 expandDetectionResult로 복원)
+COMPACT_RESPONSE_ENABLED = os.getenv("COMPACT_RESPONSE_ENABLED", "0").lower() in ("1", "true", "yes")
+RESPONSE_DEBUG_FIELDS = os.getenv("RESPONSE_DEBUG_FIELDS", "0").lower() in ("1", "true", "yes")  # color / yaw_angle / bank_type 포함
+
+# ==========================================
+# ONNX Runtime 세션 / 스레드 설정 (backend/utils/device_config.py)
+# ==========================================
+# CPU 전용 서버에서는 ORT intra-op 스레드, OpenCV 스레드, BLAS 스레드가 같은 코어를 두고 경쟁하므로
+# 예) 8코어: ORT_INTRA_OP_THREADS=6, OPENCV_THREADS=1, BLAS_THREADS=1, CPU_AFFINITY=0-7
+ORT_INTRA_OP_THREADS = int(os.getenv("ORT_INTRA_OP_THREADS", 0))  # 0 = ORT 기본값 (물리 코어 수)
+ORT_INTER_OP_THREADS = int(os.getenv("ORT_INTER_OP_THREADS", 0))  # 0 = ORT 기본값 (parallel 모드에서만 사용)
+ORT_GRAPH_OPT_LEVEL = os.getenv("ORT_GRAPH_OPT_LEVEL", "all")  # disable / basic / extended / all
+ORT_EXECUTION_MODE = os.getenv("ORT_EXECUTION_MODE", "sequential")  # sequential / parallel
+ORT_PROVIDERS = [p.strip() for p in os.getenv("ORT_PROVIDERS", "").split(",") if p.strip()]  # 비우면 자동 (GPU면 CUDA → CPU)
+CPU_AFFINITY = os.getenv("CPU_AFFINITY", "")  # 프로세스를 고정할 CPU 목록 (예: "0-3,6"), 비우면 변경 안 함
+OPENCV_THREADS = int(os.getenv("OPENCV_THREADS", -1))  # cv2.setNumThreads 값 (-1 = 변경 안 함, 0/1 = 단일 스레드)
+BLAS_THREADS = int(os.getenv("BLAS_THREADS", 0))  # NumPy BLAS 스레드 수 (0 = 변경 안 함)
+
+# 시작 시 호스트 자동 튜닝 (backend/utils/auto_tuner.py) - ORT 스레드 / inference 배치 크기 / 워커 수
+AUTOTUNE_ENABLED = os.getenv("AUTOTUNE_ENABLED", "0").lower() in ("1", "true", "yes")  # 프로파일 파일이 없으면 측정
+AUTOTUNE_FORCE = os.getenv("AUTOTUNE_FORCE", "0").lower() in ("1", "true", "yes")  # 파일이 있어도 다시 측정
+AUTOTUNE_LATENCY_MS = float(os.getenv("AUTOTUNE_LATENCY_MS", 250))  # 배치 지연시간 p95 목표
+AUTOTUNE_BUDGET_SEC = float(os.getenv("AUTOTUNE_BUDGET_SEC", 120))  # 전체 측정 시간 예산
+AUTOTUNE_ITERATIONS = int(os.getenv("AUTOTUNE_ITERATIONS", 4))  # 조합당 워커별 측정 배치 수
+AUTOTUNE_FACES_PER_FRAME = int(os.getenv("AUTOTUNE_FACES_PER_FRAME", 4))  # 합성 프레임당 얼굴 수 (recognition 부하)
+HOST_PROFILE_PATH = Path(os.getenv("HOST_PROFILE_PATH", str(PROJECT_ROOT / "outputs" / "host_profile.json")))
 
 # ==========================================
 # 얼굴 인식 임계값
@@ -55,6 +171,30 @@ MASKED_TRACKING_IOU_THRESHOLD = 0.5  # bbox tracking을 위한 IoU 임계값
 DYNAMIC_BANK_SIMILARITY_THRESHOLD = 0.9  # 중복 체크 임계값
 BANK_DUPLICATE_THRESHOLD = 0.95  # 등록 시 중복 체크 임계값
 
+# ==========================================
+# 갤러리 검색 (ANN) 설정
+# ==========================================
+ANN_ENABLED = os.getenv("ANN_ENABLED", "0").lower() in ("1", "true", "yes")  # 근사 검색 사용 여부
+ANN_BACKEND = os.getenv("ANN_BACKEND", "auto")  # auto | numpy | faiss
+ANN_MIN_ROWS = int(os.getenv("ANN_MIN_ROWS", 20000))  # bank 임베딩 수가 이 이상일 때만 ANN 사용
+ANN_NLIST = int(os.getenv("ANN_NLIST", 0))  # IVF 리스트 수 (0이면 sqrt(N) 자동)
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", 16))  # 쿼리당 스캔할 리스트 수
+
+# 갤러리 압축 저장 (none | float16 | int8) - 1차 스캔은 압축 코드, 상위 후보만 float32 재채점
+GALLERY_QUANTIZATION = os.getenv("GALLERY_QUANTIZATION", "none").lower()
+GALLERY_RERANK_PERSONS = int(os.getenv("GALLERY_RERANK_PERSONS", 8))  # float32로 재채점할 후보 인물 수
+GALLERY_RERANK_DIR = os.getenv("GALLERY_RERANK_DIR", "")  # 재채점용 float32 행 memmap 파일 위치 (비우면 시스템 임시 디렉터리, tmpfs는 피할 것)
+
+# 2단계 매칭 (centroid로 후보 선별 → 후보만 bank 전체 비교) - 근사 검색이므로 opt-in
+# (centroid 상위 M명 밖의 실제 인물은 놓치고, second_sim도 후보 M명 안에서만 계산됨)
+PRUNE_ENABLED = os.getenv("PRUNE_ENABLED", "0").lower() in ("1", "true", "yes")
+PRUNE_TOP_M = int(os.getenv("PRUNE_TOP_M", 32))  # centroid 점수 상위 M명만 정밀 비교 (용의자가 M명 이하면 전체 비교)
+PRUNE_DECISIVE_BASE_SIM = float(os.getenv("PRUNE_DECISIVE_BASE_SIM", 0.9))  # base 유사도가 이 이상이면 masked/dynamic 비교 생략
+
+# 각도 분할 매칭 (기본 꺼짐 - 켜면 비교 대상이 줄지만 각도 추정이 틀린 얼굴은 재현율이 낮아질 수 있음)
+ANGLE_PARTITION_ENABLED = os.getenv("ANGLE_PARTITION_ENABLED", "0").lower() in ("1", "true", "yes")  # dynamic bank는 같은/이웃 각도 임베딩만 비교
+MASKED_ONLY_WHEN_OCCLUDED = os.getenv("MASKED_ONLY_WHEN_OCCLUDED", "0").lower() in ("1", "true", "yes")  # 가려진 얼굴만 masked bank 비교
+
 # ==========================================
 # Temporal Filter 설정
 # ==========================================
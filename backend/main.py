@@ -20,12 +20,13 @@ from backend.utils.device_config import _ensure_cuda_in_path
 _ensure_cuda_in_path()
 
 # InsightFace 및 유틸리티
-from insightface.app import FaceAnalysis
-from backend.utils.device_config import get_device_id, safe_prepare_insightface
+from backend.utils.device_config import get_device_id, configure_cpu_runtime
+from backend.utils.model_profile import create_face_analysis
 
 # 데이터 로딩
 from backend.services import data_loader
 from backend.services.data_loader import load_persons_from_db, load_persons_from_embeddings
+from backend.services.person_directory import person_directory
 from backend.database import get_db, init_db as db_init
 
 # ==========================================
@@ -56,16 +57,42 @@ print("=" * 70)
 print("🔧 InsightFace 모델 초기화 중...")
 print("=" * 70)
 
+# CPU affinity / OpenCV / BLAS 스레드 설정 (ORT 세션과 코어를 나눠 쓰도록 모델 로드 전에 적용)
+configure_cpu_runtime()
+
 device_id = get_device_id()
 device_type = "GPU" if device_id >= 0 else "CPU"
 print(f"디바이스: {device_type} (ctx_id={device_id})")
 
-model = FaceAnalysis(name="buffalo_l")
-actual_device_id = safe_prepare_insightface(model, device_id, det_size=(640, 640))
+# 프로파일(INSIGHTFACE_PROFILE)에 필요한 모델만 로드 (기본: detection + recognition)
+model, actual_device_id = create_face_analysis(device_id=device_id)
 if actual_device_id != device_id:
     print(f"   (실제 사용: {'GPU' if actual_device_id >= 0 else 'CPU'})")
 print()
 
+# 호스트 프로파일 (저장된 튜닝 결과 재사용, AUTOTUNE_ENABLED면 없을 때 측정)
+from backend.utils.auto_tuner import load_or_tune_host_profile
+from backend.services.inference_server import inference_server
+from backend.config import INFERENCE_BATCHING_ENABLED
+host_settings = load_or_tune_host_profile(model, actual_device_id)
+if host_settings is not None and INFERENCE_BATCHING_ENABLED:
+    inference_server.configure(max_batch=host_settings["inference_max_batch"],
+                               workers=host_settings["inference_workers"])
+print()
+
+# 스트림별 적응형 detection 입력 크기 / ROI detection용 detector 세션 (크기별로 미리 생성)
+from backend.config import ADAPTIVE_DET_ENABLED, ROI_DETECTION_ENABLED, ROI_DET_SIZE
+extra_det_sizes = []
+if ADAPTIVE_DET_ENABLED:
+    from backend.services.adaptive_resolution import detection_sizes
+    extra_det_sizes.extend(detection_sizes(tuple(model.det_size)))
+if ROI_DETECTION_ENABLED:
+    extra_det_sizes.append(ROI_DET_SIZE)
+if extra_det_sizes:
+    from backend.utils.model_profile import prepare_detector_sizes
+    prepare_detector_sizes(model, extra_det_sizes)
+    print()
+
 # 모듈에 모델 주입
 from backend.services import face_detection
 from backend.api import persons as persons_api
@@ -119,6 +146,11 @@ async def startup_event():
 @app.get("/api/images/enroll/{person_id}/{filename}")
 async def get_person_image(person_id: str, filename: str):
     """등록된 인물의 이미지 제공"""
+    # 등록된 인물의 캐시된 대표 이미지면 파일 시스템 조회 없이 stat 재사용
+    cached_image = person_directory.image(person_id) if person_directory.get(person_id) else None
+    if cached_image is not None and cached_image.path.name == filename:
+        return FileResponse(cached_image.path, stat_result=cached_image.stat)
+    
     image_path = PROJECT_ROOT / "images" / "enroll" / person_id / filename
     
     if not image_path.exists():
@@ -4,4 +4,5 @@ from pydantic import BaseModel
 class DetectionRequest(BaseModel):
     image: str       # Base64 이미지
     suspect_id: Optional[str] = None  # (선택적) 특정 타겟 ID (호환성 유지)
-    suspect_ids: Optional[List[str]] = None  # (선택적) 여러 타겟 ID
\ No newline at end of file
+    suspect_ids: Optional[List[str]] = None  # (선택적) 여러 타겟 ID
+    stream_id: Optional[str] = None  # (선택적) 카메라/스트림 ID - 스냅샷 간격을 스트림별로 관리 (없으면 클라이언트 주소별)
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+INT8 양자화 모델 팩 생성 스크립트 (CPU 배포용)
+
+FP32 모델 팩(~/.insightface/models/<model>)의 detection / recognition ONNX 모델을 INT8로 양자화해서
+<model>_int8 팩으로 저장합니다. 나머지 모델(랜드마크, genderage)은 그대로 복사합니다.
+생성한 팩은 INSIGHTFACE_QUANTIZED=1로 로드합니다 (backend/utils/model_profile.py).
+
+- static (기본값): 캘리브레이션 이미지(images/enroll)를 FP32 팩으로 처리하면서 각 모델이 실제로 받는
+  입력 텐서를 기록하고, 그 분포로 activation 범위를 정한 QDQ 모델 생성
+- dynamic: weight만 INT8로 저장하고 activation 범위는 실행 중 계산 (캘리브레이션 불필요)
+
+정확도 / 속도 비교: python backend/benchmarks/bench_int8_models.py
+
+사용 예시:
+    python backend/quantize_models.py
+    python backend/quantize_models.py --model buffalo_s --tasks recognition --calibrate-method percentile
+    python backend/quantize_models.py --mode dynamic
+"""
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2
+
+from backend.config import INSIGHTFACE_MODEL, QUANTIZED_PACK_SUFFIX
+from backend.utils.model_profile import create_face_analysis, model_pack_dir, QUANTIZATION_MANIFEST
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png")
+QUANTIZABLE_TASKS = ("detection", "recognition")
+
+
+class RecordingSession:
+    """session.run 입력을 기록하는 래퍼 (캘리브레이션 데이터 수집)"""
+
+    def __init__(self, session, limit: int):
+        self.session = session
+        self.limit = limit
+        self.inputs = []
+
+    def run(self, output_names, input_feed, *args, **kwargs):
+        if len(self.inputs) < self.limit:
+            # recognition 배치 입력은 한 장씩 나눠 저장 (batch 차원이 고정된 모델도 캘리브레이션 가능)
+            for name, blob in input_feed.items():
+                self.inputs.extend({name: blob[i:i + 1].copy()} for i in range(blob.shape[0]))
+        return self.session.run(output_names, input_feed, *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.session, name)
+
+
+def collect_calibration_inputs(app, image_dir: Path, limit: int):
+    """캘리브레이션 이미지를 FP32 팩으로 처리하면서 detection / recognition 입력 텐서 기록"""
+    recorders = {}
+    for task in QUANTIZABLE_TASKS:
+        if task in app.models:
+            recorders[task] = RecordingSession(app.models[task].session, limit)
+            app.models[task].session = recorders[task]
+
+    paths = sorted(p for p in image_dir.rglob("*") if p.suffix.lower() in IMAGE_EXTS)
+    used = 0
+    for path in paths:
+        if all(len(rec.inputs) >= limit for rec in recorders.values()):
+            break
+        img = cv2.imread(str(path))
+        if img is None:
+            continue
+        app.get(img)
+        used += 1
+
+    for task, recorder in recorders.items():
+        app.models[task].session = recorder.session
+    return {task: rec.inputs[:limit] for task, rec in recorders.items()}, used
+
+
+class ListCalibrationReader:
+    """기록한 입력 텐서 리스트 → onnxruntime CalibrationDataReader"""
+
+    def __init__(self, inputs):
+        self._iter = iter(inputs)
+
+    def get_next(self):
+        return next(self._iter, None)
+
+    def rewind(self):
+        pass
+
+
+def read_preprocessing(src: Path):
+    """FP32 모델의 task / 입력 정규화 값 (INT8 팩 로드 시 복원, backend/utils/model_profile.py)"""
+    from insightface.model_zoo import model_zoo
+
+    model = model_zoo.get_model(str(src), providers=["CPUExecutionProvider"])
+    if model is None:
+        return {"taskname": None, "input_mean": None, "input_std": None}
+    return {
+        "taskname": model.taskname,
+        "input_mean": getattr(model, "input_mean", None),
+        "input_std": getattr(model, "input_std", None),
+    }
+
+
+def preprocess_for_quantization(src: Path, dst: Path) -> Path:
+    """양자화 전처리 (shape inference + 그래프 최적화), 실패하면 원본 경로 반환"""
+    try:
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+        quant_pre_process(str(src), str(dst))
+        return dst
+    except Exception as e:
+        print(f"   ⚠️ 전처리 생략 ({src.name}): {e}")
+        return src
+
+
+def quantize_model(src: Path, dst: Path, mode: str, calibration_inputs, calibrate_method: str, per_channel: bool):
+    """ONNX 모델 하나를 INT8로 양자화"""
+    from onnxruntime.quantization import (
+        quantize_static, quantize_dynamic, QuantFormat, QuantType, CalibrationMethod,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepared = preprocess_for_quantization(src, Path(tmp) / src.name)
+        if mode == "dynamic":
+            # ConvInteger는 uint8 weight만 지원
+            quantize_dynamic(str(prepared), str(dst), weight_type=QuantType.QUInt8, per_channel=per_channel)
+            return
+        methods = {
+            "minmax": CalibrationMethod.MinMax,
+            "entropy": CalibrationMethod.Entropy,
+            "percentile": CalibrationMethod.Percentile,
+        }
+        quantize_static(
+            str(prepared), str(dst), ListCalibrationReader(calibration_inputs),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method=methods[calibrate_method],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 양자화 모델 팩 생성")
+    parser.add_argument("--model", type=str, default=INSIGHTFACE_MODEL, help="FP32 모델 팩 이름")
+    parser.add_argument("--calib-dir", type=str, default="images/enroll")
+    parser.add_argument("--limit", type=int, default=200, help="모델별 최대 캘리브레이션 샘플 수")
+    parser.add_argument("--mode", type=str, choices=["static", "dynamic"], default="static")
+    parser.add_argument("--calibrate-method", type=str, choices=["minmax", "entropy", "percentile"], default="minmax")
+    parser.add_argument("--no-per-channel", action="store_true", help="weight를 텐서 단위로 양자화")
+    parser.add_argument("--tasks", type=str, nargs="+", choices=list(QUANTIZABLE_TASKS), default=list(QUANTIZABLE_TASKS))
+    args = parser.parse_args()
+
+    src_dir = model_pack_dir(args.model)
+    dst_name = args.model + QUANTIZED_PACK_SUFFIX
+    dst_dir = model_pack_dir(dst_name)
+
+    # FP32 팩 로드 (없으면 InsightFace가 다운로드) - 캘리브레이션은 CPU에서 실행
+    app, _ = create_face_analysis("recognition-only", name=args.model, device_id=-1, timings=None, quantized=False)
+    task_files = {task: Path(app.models[task].model_file).name for task in args.tasks if task in app.models}
+
+    calibration, used_images = {}, 0
+    if args.mode == "static":
+        calibration, used_images = collect_calibration_inputs(app, PROJECT_ROOT / args.calib_dir, args.limit)
+        missing = [task for task in task_files if not calibration.get(task)]
+        if missing:
+            print(f"⚠️ 캘리브레이션 샘플이 없습니다 ({', '.join(missing)}): {args.calib_dir}에 얼굴 이미지가 필요합니다")
+            return
+        for task in task_files:
+            print(f"📂 {task}: 캘리브레이션 샘플 {len(calibration[task])}개 (이미지 {used_images}장)")
+
+    dst_dir.mkdir(parents=True, exist_ok=True)
+    models = {}
+    for src in sorted(src_dir.glob("*.onnx")):
+        entry = {**read_preprocessing(src), "quantized": False}
+        task = next((t for t, filename in task_files.items() if filename == src.name), None)
+        if task is None:
+            shutil.copy2(src, dst_dir / src.name)
+        else:
+            print(f"🔧 {task} 양자화 중 ({args.mode}): {src.name}")
+            quantize_model(src, dst_dir / src.name, args.mode, calibration.get(task),
+                           args.calibrate_method, not args.no_per_channel)
+            entry["quantized"] = True
+            size_mb = (src.stat().st_size / 1e6, (dst_dir / src.name).stat().st_size / 1e6)
+            print(f"   ✅ {size_mb[0]:.1f}MB → {size_mb[1]:.1f}MB")
+        models[src.name] = entry
+
+    manifest = {
+        "source_pack": args.model,
+        "mode": args.mode,
+        "calibrate_method": args.calibrate_method if args.mode == "static" else None,
+        "per_channel": not args.no_per_channel,
+        "calibration_dir": args.calib_dir if args.mode == "static" else None,
+        "calibration_images": used_images,
+        "created_at": datetime.now().isoformat(),
+        "models": models,
+    }
+    with open(dst_dir / QUANTIZATION_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    print(f"\n💾 INT8 모델 팩 저장: {dst_dir}")
+    print(f"   사용: INSIGHTFACE_QUANTIZED=1 (INSIGHTFACE_MODEL={args.model})")
+    print(f"   비교: python backend/benchmarks/bench_int8_models.py --model {args.model}")
+
+
+if __name__ == "__main__":
+    main()
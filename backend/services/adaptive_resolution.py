@@ -0,0 +1,127 @@
+# backend/services/adaptive_resolution.py
+"""
+스트림별 적응형 detection 입력 크기
+
+얼굴이 크게 찍히는 카메라는 320 입력으로도 충분하고, 넓은 화각은 640 이상이 필요합니다.
+스트림마다 최근 얼굴 크기 분포(프레임 긴 변 대비 얼굴 높이)를 모아서,
+작은 얼굴(ADAPTIVE_DET_QUANTILE 분위수)이 detector 입력에서 ADAPTIVE_DET_MIN_FACE_PX 이상이 되는
+가장 작은 입력 크기를 고릅니다.
+
+- 올릴 때: 현재 크기에서 작은 얼굴이 기준보다 작아지면 바로 올림
+- 내릴 때: 한 단계 아래에서도 여유(ADAPTIVE_DET_HYSTERESIS) 있게 기준을 넘는 상태가
+  ADAPTIVE_DET_DOWN_FRAMES 프레임 연속 유지되어야 한 단계씩 내림 (크기가 오락가락하지 않도록)
+- ADAPTIVE_DET_SWEEP_FRAMES 프레임마다 전체 크기로 탐지: 현재 크기에서 기준보다 작을 얼굴이 보이면
+  (작은 입력에서 놓치고 있던 먼 얼굴) 분포와 관계없이 바로 그 얼굴에 맞는 크기로 올림
+
+입력 크기별 detector 세션은 시작 시 prepare_detector_sizes()로 미리 만들어 둡니다.
+"""
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import (
+    INSIGHTFACE_DET_SIZE, ADAPTIVE_DET_SIZES, ADAPTIVE_DET_MIN_FACE_PX, ADAPTIVE_DET_QUANTILE,
+    ADAPTIVE_DET_HYSTERESIS, ADAPTIVE_DET_DOWN_FRAMES, ADAPTIVE_DET_SWEEP_FRAMES, ADAPTIVE_DET_WINDOW,
+)
+
+
+def detection_sizes(full_size: Tuple[int, int] = INSIGHTFACE_DET_SIZE,
+                    levels: List[int] = ADAPTIVE_DET_SIZES) -> List[Tuple[int, int]]:
+    """
+    긴 변 기준 크기 목록 → detector 입력 크기 (width, height) 목록 (작은 것부터, 마지막이 전체 크기)
+
+    전체 크기의 가로세로 비율을 유지하고 32의 배수로 맞춥니다.
+    """
+    full_long = max(full_size)
+    sizes = set()
+    for level in levels:
+        if 0 < level < full_long:
+            scale = level / full_long
+            sizes.add((max(32, round(full_size[0] * scale / 32) * 32), max(32, round(full_size[1] * scale / 32) * 32)))
+    sizes.discard(tuple(full_size))
+    return sorted(sizes, key=max) + [tuple(full_size)]
+
+
+class DetResolutionController:
+    """스트림 하나의 detection 입력 크기 선택 (히스테리시스 + 주기적 전체 크기 탐지)"""
+
+    def __init__(self, sizes: Optional[List[Tuple[int, int]]] = None,
+                 min_face_px: float = ADAPTIVE_DET_MIN_FACE_PX,
+                 quantile: float = ADAPTIVE_DET_QUANTILE,
+                 hysteresis: float = ADAPTIVE_DET_HYSTERESIS,
+                 down_frames: int = ADAPTIVE_DET_DOWN_FRAMES,
+                 sweep_frames: int = ADAPTIVE_DET_SWEEP_FRAMES,
+                 window: int = ADAPTIVE_DET_WINDOW):
+        self.sizes = sizes or detection_sizes()
+        self.min_face_px = min_face_px
+        self.quantile = quantile
+        self.hysteresis = hysteresis
+        self.down_frames = down_frames
+        self.sweep_frames = sweep_frames
+        self.face_fractions = deque(maxlen=window)  # 얼굴 높이 / 프레임 긴 변
+        self.level = len(self.sizes) - 1  # 분포가 모이기 전에는 전체 크기
+        self.frame_count = 0
+        self._down_streak = 0
+        self._sweep = False
+        self.frames_per_size: Dict[str, int] = {}
+
+    def next_size(self) -> Tuple[int, int]:
+        """이번 프레임의 detection 입력 크기 (sweep 프레임이면 전체 크기)"""
+        self.frame_count += 1
+        self._sweep = (self.sweep_frames > 0 and self.frame_count % self.sweep_frames == 0
+                       and self.level < len(self.sizes) - 1)
+        if self._sweep:
+            size = self.sizes[-1]
+        else:
+            size = self.sizes[self.level]
+        key = f"{size[0]}x{size[1]}"
+        self.frames_per_size[key] = self.frames_per_size.get(key, 0) + 1
+        return size
+
+    def _face_px(self, level: int, fraction: float) -> float:
+        return fraction * max(self.sizes[level])
+
+    def _required_level(self, fraction: float) -> int:
+        """이 크기의 얼굴이 기준을 만족하는 가장 작은 입력 크기 단계"""
+        return next((lv for lv in range(len(self.sizes)) if self._face_px(lv, fraction) >= self.min_face_px),
+                    len(self.sizes) - 1)
+
+    def observe(self, faces: List, frame_shape: Tuple[int, int]):
+        """
+        detection 결과로 얼굴 크기 분포 갱신 후 다음 프레임의 입력 크기 결정
+
+        Args:
+            faces: 이번 프레임의 Face 리스트 (bbox는 frame_shape 좌표)
+            frame_shape: detection에 넣은 프레임 (height, width)
+        """
+        long_side = float(max(frame_shape[:2]))
+        fractions = [float(face.bbox[3] - face.bbox[1]) / long_side for face in faces]
+        self.face_fractions.extend(fractions)
+        if not self.face_fractions:
+            return  # 얼굴을 본 적이 없으면 현재 크기 유지 (sweep 프레임에서 계속 확인)
+
+        small = float(np.quantile(np.asarray(self.face_fractions), self.quantile))
+        required = self._required_level(small)
+        if self._sweep and fractions:
+            # 전체 크기에서만 보이는 작은 얼굴 → 그 얼굴이 보이는 크기까지 바로 올림
+            required = max(required, self._required_level(min(fractions)))
+        if required > self.level:
+            self.level = required
+            self._down_streak = 0
+            return
+        if self.level > 0 and self._face_px(self.level - 1, small) >= self.min_face_px * (1 + self.hysteresis):
+            self._down_streak += 1
+            if self._down_streak >= self.down_frames:
+                self.level -= 1
+                self._down_streak = 0
+        else:
+            self._down_streak = 0
+
+    def summary(self) -> Dict:
+        size = self.sizes[self.level]
+        return {
+            "current": f"{size[0]}x{size[1]}",
+            "frames_per_size": dict(self.frames_per_size),
+            "observed_faces": len(self.face_fractions),
+        }
@@ -0,0 +1,123 @@
+# backend/services/angle_partition.py
+"""
+각도 분할 Dynamic Bank 인덱스
+
+dynamic bank의 각 임베딩은 angles_dynamic.json의 angle_types로 각도 라벨이 붙어 있습니다.
+얼굴의 각도(estimate_face_angle)와 같은 각도 + 이웃 각도 버킷의 임베딩만 비교해서
+큰 dynamic bank에서 얼굴당 비교 대상을 줄입니다.
+
+각도 이웃 (yaw 축: left_profile - left - front - right - right_profile, top은 front와 이웃):
+- front → front, left, right, top
+- left → left, left_profile, front
+- left_profile → left_profile, left
+- 라벨이 없는 임베딩(unknown)은 모든 각도에서 비교합니다.
+"""
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from backend.services.gallery_index import GalleryIndex
+
+ANGLE_BUCKETS = ("front", "left", "right", "top", "left_profile", "right_profile")
+ANGLE_CODES = {name: code for code, name in enumerate(ANGLE_BUCKETS)}
+UNKNOWN_ANGLE_CODE = -1
+
+NEIGHBOUR_ANGLES = {
+    "front": ("front", "left", "right", "top"),
+    "left": ("left", "left_profile", "front"),
+    "right": ("right", "right_profile", "front"),
+    "top": ("top", "front"),
+    "left_profile": ("left_profile", "left"),
+    "right_profile": ("right_profile", "right"),
+}
+
+
+def encode_angles(angle_types: Optional[Sequence[str]], num_rows: int) -> np.ndarray:
+    """
+    angle_types 라벨 리스트를 (num_rows,) int8 코드로 변환
+
+    라벨 수가 bank 행 수와 다르면(파일 불일치) 모든 행을 unknown으로 처리합니다.
+    """
+    if not angle_types or len(angle_types) != num_rows:
+        return np.full(num_rows, UNKNOWN_ANGLE_CODE, dtype=np.int8)
+    return np.array([ANGLE_CODES.get(a, UNKNOWN_ANGLE_CODE) for a in angle_types], dtype=np.int8)
+
+
+class AnglePartitionedIndex:
+    """
+    dynamic bank 인덱스 + 각도별 Sub-Index (처음 요청될 때 생성)
+
+    match_batch / match_candidates는 각도를 지정하지 않으면 전체 인덱스를 사용합니다.
+    """
+
+    def __init__(self, full: GalleryIndex, row_codes: np.ndarray):
+        self.full = full
+        self.row_codes = row_codes  # (R,) full 인덱스의 행별 각도 코드
+        self._by_angle: Dict[str, GalleryIndex] = {}
+
+    @classmethod
+    def from_gallery(cls, gallery: Dict[str, np.ndarray], angle_codes: Dict[str, np.ndarray],
+                     person_ids: Optional[List[str]] = None, **index_kwargs) -> "AnglePartitionedIndex":
+        """
+        Args:
+            gallery: {person_id: dynamic bank}
+            angle_codes: {person_id: (N,) 각도 코드} (없으면 unknown)
+        """
+        full = GalleryIndex.from_gallery(gallery, person_ids, **index_kwargs)
+        parts = []
+        for pos, pid in enumerate(full.person_ids):
+            count = int(full.offsets[pos + 1] - full.offsets[pos])
+            codes = angle_codes.get(pid)
+            if codes is None or codes.shape[0] != count:
+                codes = np.full(count, UNKNOWN_ANGLE_CODE, dtype=np.int8)
+            parts.append(codes)
+        row_codes = np.concatenate(parts) if parts else np.empty(0, dtype=np.int8)
+        return cls(full, row_codes)
+
+    def __len__(self) -> int:
+        return len(self.full)
+
+    def for_angle(self, angle_type: Optional[str]) -> GalleryIndex:
+        """얼굴 각도의 같은/이웃 버킷 임베딩만 담은 인덱스 (각도를 모르면 전체)"""
+        neighbours = NEIGHBOUR_ANGLES.get(angle_type)
+        if neighbours is None:
+            return self.full
+        index = self._by_angle.get(angle_type)
+        if index is None:
+            allowed = [ANGLE_CODES[a] for a in neighbours] + [UNKNOWN_ANGLE_CODE]
+            keep = np.isin(self.row_codes, allowed)
+            banks = {}
+            for pos, pid in enumerate(self.full.person_ids):
+                start, end = self.full.offsets[pos], self.full.offsets[pos + 1]
+                rows = keep[start:end]
+                if rows.any():
+                    banks[pid] = self.full.bank(pid)[rows]
+            index = GalleryIndex.from_gallery(banks, quantization=self.full.quantization,
+                                              rerank_persons=self.full.rerank_persons,
+                                              rerank_dir=self.full.rerank_dir)
+            self._by_angle[angle_type] = index
+        return index
+
+    def match_batch(self, queries: np.ndarray, angle_types: Optional[Sequence[str]] = None):
+        """
+        얼굴별 각도 버킷 인덱스로 매칭 (같은 각도의 얼굴끼리 한 번에 계산)
+
+        얼굴 수가 적은 행렬곱은 읽는 행 수에 비례하므로, 프레임의 각도 버킷 행 수 합이
+        전체 행 수 이상이면(각도가 제각각인 많은 얼굴) 전체 인덱스 한 번으로 계산합니다.
+
+        Returns:
+            [(best_person_id, best_sim, second_sim), ...] 길이 F
+        """
+        if angle_types is None:
+            return self.full.match_batch(queries)
+        angles = set(angle_types)
+        if sum(self.for_angle(a).num_rows for a in angles) >= self.full.num_rows:
+            return self.full.match_batch(queries)
+        results = [None] * queries.shape[0]
+        for angle_type in angles:
+            face_ids = [i for i, a in enumerate(angle_types) if a == angle_type]
+            for i, result in zip(face_ids, self.for_angle(angle_type).match_batch(queries[face_ids])):
+                results[i] = result
+        return results
+
+    def match_candidates(self, query: np.ndarray, person_ids: List[str], angle_type: Optional[str] = None):
+        return self.for_angle(angle_type).match_candidates(query, person_ids)
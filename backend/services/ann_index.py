@@ -0,0 +1,424 @@
+# backend/services/ann_index.py
+"""
+근사 최근접 이웃(ANN) 검색 인덱스
+
+수십만 명 규모 갤러리에서 전체 bank를 매번 스캔하지 않도록
+IVF(Inverted File) 구조로 후보를 좁힌 뒤, 후보 임베딩만 float32로 정확히 재채점합니다.
+
+- 학습: 구면 k-means로 nlist개의 coarse centroid 생성
+- 검색: 쿼리와 가까운 nprobe개의 리스트만 스캔 → 후보 행의 정확한 코사인 유사도 계산
+- 갱신: set_person / remove_person으로 특정 인물의 행만 교체 (전체 재생성 없음)
+  검색 중인 인덱스를 바꾸지 않도록 with_persons()는 바뀐 인물만 반영한 새 인덱스를 돌려줌 (copy-on-write)
+  - numpy: 바뀌는 리스트만 복사
+  - faiss: 기존 faiss 인덱스는 공유하고, 바뀐 인물은 작은 정확 검색 delta로 보관 (기존 행은 숨김)
+    delta가 FAISS_DELTA_MAX_ROWS를 넘을 때만 faiss 인덱스를 복제해 합침 (발행 여러 번에 한 번)
+
+백엔드:
+- "numpy": 순수 NumPy IVF (기본)
+- "faiss": faiss-cpu가 설치된 경우 faiss.IndexIVFFlat 사용
+- "auto": faiss가 있으면 faiss, 없으면 numpy
+"""
+import copy
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from backend.services.gallery_index import UNKNOWN_ID, normalize_rows
+
+try:
+    import faiss  # type: ignore
+except ImportError:  # faiss-cpu는 선택 의존성
+    faiss = None
+
+# faiss 행 ID = (인물 인덱스 << ROW_ID_SHIFT) | 인물 내 순번
+ROW_ID_SHIFT = 20
+# faiss 백엔드: with_persons로 바뀐 인물의 delta 행 수가 이보다 많아지면 faiss 인덱스에 합침
+FAISS_DELTA_MAX_ROWS = 4096
+
+
+def _spherical_kmeans(vectors: np.ndarray, nlist: int, iters: int = 10, seed: int = 0) -> np.ndarray:
+    """L2 정규화된 벡터에 대한 구면 k-means (내적 기준)"""
+    rng = np.random.default_rng(seed)
+    nlist = min(nlist, vectors.shape[0])
+    centroids = vectors[rng.choice(vectors.shape[0], nlist, replace=False)].copy()
+    for _ in range(iters):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        counts = np.bincount(assign, minlength=nlist)
+        order = np.argsort(assign, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.zeros_like(centroids)
+        nonempty = counts > 0
+        sums[nonempty] = np.add.reduceat(vectors[order], starts[nonempty], axis=0)
+        empty = counts == 0
+        if np.any(empty):
+            # 빈 클러스터는 임의의 벡터로 재초기화
+            sums[empty] = vectors[rng.choice(vectors.shape[0], int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """
+    인물 단위로 갱신 가능한 IVF ANN 인덱스
+
+    GalleryIndex와 동일하게 match_batch()가 [(best_person_id, best_sim, second_sim), ...]를 반환합니다.
+    """
+
+    def __init__(self, dim: int = 512, nlist: int = 0, nprobe: int = 16,
+                 backend: str = "auto", train_size: int = 50000):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size
+        if backend == "auto":
+            backend = "faiss" if faiss is not None else "numpy"
+        if backend == "faiss" and faiss is None:
+            print("⚠️ faiss가 설치되어 있지 않아 numpy ANN 백엔드를 사용합니다.")
+            backend = "numpy"
+        self.backend = backend
+
+        self.person_ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._row_counts: Dict[int, int] = {}  # {인물 인덱스: 행 수} (현재 등록된 인물만)
+        self.centroids = np.empty((0, dim), dtype=np.float32)
+
+        # numpy 백엔드: 리스트별 (벡터, 소유자) 버퍼 + 사용 길이
+        self._list_vecs: List[np.ndarray] = []
+        self._list_owners: List[np.ndarray] = []
+        self._list_sizes: List[int] = []
+        self._person_lists: Dict[int, set] = {}  # {인물 인덱스: 행이 들어있는 리스트 번호}
+        self._shared_lists: set = set()  # 다른 인덱스(with_persons 원본)와 버퍼를 공유 중인 리스트 - 수정 전에 복사
+
+        # faiss 백엔드
+        self._faiss_index = None
+        self._faiss_counts: Dict[int, int] = {}  # {인물 인덱스: faiss 인덱스에 들어있는 행 수}
+        self._stale: set = set()  # faiss 인덱스의 행을 숨길 인물 인덱스 (delta로 교체 / 제거됨)
+        self._delta: Dict[int, np.ndarray] = {}  # {인물 인덱스: 정규화된 bank} (with_persons로 바뀐 인물)
+
+    # ------------------------------------------------------------------
+    # 생성 / 갱신
+    # ------------------------------------------------------------------
+
+    def build(self, gallery: Dict[str, np.ndarray]):
+        """{person_id: bank} 전체로 인덱스 학습 및 생성"""
+        banks = {pid: normalize_rows(np.asarray(b, dtype=np.float32).reshape(-1, self.dim))
+                 for pid, b in gallery.items() if b is not None and np.asarray(b).size > 0}
+        if not banks:
+            return
+
+        all_vectors = np.vstack(list(banks.values()))
+        nlist = self.nlist or int(np.clip(np.sqrt(all_vectors.shape[0]), 1, 4096))
+        rng = np.random.default_rng(0)
+        if all_vectors.shape[0] > self.train_size:
+            train = all_vectors[rng.choice(all_vectors.shape[0], self.train_size, replace=False)]
+        else:
+            train = all_vectors
+        self.centroids = _spherical_kmeans(train, nlist)
+        self.nlist = self.centroids.shape[0]
+
+        if self.backend == "faiss":
+            quantizer = faiss.IndexFlatIP(self.dim)
+            self._faiss_index = faiss.IndexIVFFlat(quantizer, self.dim, self.nlist, faiss.METRIC_INNER_PRODUCT)
+            self._faiss_index.train(train)
+            self._faiss_index.nprobe = self.nprobe
+            for pid, bank in banks.items():
+                self.set_person(pid, bank)
+            return
+
+        # numpy 백엔드: 전체 행을 한 번에 리스트로 배정 (인물별 반복 없음)
+        counts = np.array([b.shape[0] for b in banks.values()], dtype=np.int64)
+        for pos, pid in enumerate(banks.keys()):
+            self.person_ids.append(pid)
+            self._positions[pid] = pos
+            self._row_counts[pos] = int(counts[pos])
+        owners = np.repeat(np.arange(len(banks), dtype=np.int32), counts)
+        assign = np.concatenate([
+            np.argmax(all_vectors[i:i + 65536] @ self.centroids.T, axis=1)
+            for i in range(0, all_vectors.shape[0], 65536)
+        ])
+
+        self._list_vecs, self._list_owners, self._list_sizes = [], [], []
+        self._shared_lists = set()
+        order = np.argsort(assign, kind="stable")
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=self.nlist))])
+        for list_no in range(self.nlist):
+            rows = order[bounds[list_no]:bounds[list_no + 1]]
+            self._list_vecs.append(all_vectors[rows].copy())
+            self._list_owners.append(owners[rows].copy())
+            self._list_sizes.append(int(rows.shape[0]))
+
+        for owner, list_no in set(zip(owners.tolist(), assign.tolist())):
+            self._person_lists.setdefault(owner, set()).add(list_no)
+
+    def set_person(self, person_id: str, bank: Optional[np.ndarray]):
+        """
+        한 인물의 행을 교체 (없던 인물이면 추가, bank가 None/빈 배열이면 제거)
+
+        Dynamic / Masked Bank에 임베딩이 추가될 때 해당 인물만 갱신하는 용도입니다.
+        """
+        self.remove_person(person_id)
+        if bank is None:
+            return
+        bank = normalize_rows(np.asarray(bank, dtype=np.float32).reshape(-1, self.dim))
+        if bank.shape[0] == 0 or self.centroids.shape[0] == 0:
+            return
+
+        pos = self._positions.get(person_id)
+        if pos is None:
+            pos = len(self.person_ids)
+            self.person_ids.append(person_id)
+            self._positions[person_id] = pos
+
+        self._row_counts[pos] = bank.shape[0]
+        if self.backend == "faiss":
+            ids = (np.int64(pos) << ROW_ID_SHIFT) + np.arange(bank.shape[0], dtype=np.int64)
+            self._faiss_index.add_with_ids(bank, ids)
+            self._faiss_counts[pos] = bank.shape[0]
+            return
+
+        assign = np.argmax(bank @ self.centroids.T, axis=1)
+        lists = set()
+        for list_no in np.unique(assign):
+            rows = bank[assign == list_no]
+            self._append_to_list(int(list_no), rows, pos)
+            lists.add(int(list_no))
+        self._person_lists[pos] = lists
+
+    def with_persons(self, banks: Dict[str, Optional[np.ndarray]]) -> "IVFIndex":
+        """
+        지정한 인물의 행만 교체한 새 인덱스 (copy-on-write, 이 인덱스는 바꾸지 않음)
+
+        numpy 백엔드는 바뀌는 인물의 행이 들어있거나 새로 들어갈 리스트만 복사하고 나머지 버퍼는 공유하므로,
+        이전 스냅샷으로 검색 중인 스레드는 계속 일관된 인덱스를 봅니다.
+        faiss 백엔드는 faiss 인덱스를 공유하고 바뀐 인물만 delta에 넣습니다 (_with_faiss_delta).
+
+        Args:
+            banks: {person_id: bank} (bank가 None/빈 배열이면 제거)
+        """
+        clone = copy.copy(self)
+        clone.person_ids = list(self.person_ids)
+        clone._positions = dict(self._positions)
+        clone._row_counts = dict(self._row_counts)
+        if self.backend == "faiss":
+            return clone._with_faiss_delta(banks)
+        clone._person_lists = dict(self._person_lists)
+        clone._list_vecs = list(self._list_vecs)
+        clone._list_owners = list(self._list_owners)
+        clone._list_sizes = list(self._list_sizes)
+        clone._shared_lists = set(range(len(self._list_vecs)))
+        for person_id, bank in banks.items():
+            clone.set_person(person_id, bank)
+        return clone
+
+    def _with_faiss_delta(self, banks: Dict[str, Optional[np.ndarray]]) -> "IVFIndex":
+        """
+        (with_persons로 만든 복사본에서) 바뀐 인물을 delta로 교체
+
+        faiss 인덱스는 원본과 공유하므로 발행 비용은 바뀐 인물의 행 수에 비례합니다.
+        delta가 FAISS_DELTA_MAX_ROWS를 넘으면 faiss 인덱스를 복제해서 합칩니다 (원본 인덱스는 그대로).
+        """
+        self._faiss_counts = dict(self._faiss_counts)
+        self._stale = set(self._stale)
+        self._delta = dict(self._delta)
+        for person_id, bank in banks.items():
+            bank = (normalize_rows(np.asarray(bank, dtype=np.float32).reshape(-1, self.dim))
+                    if bank is not None else np.empty((0, self.dim), dtype=np.float32))
+            pos = self._positions.get(person_id)
+            if pos is None:
+                if bank.shape[0] == 0:
+                    continue
+                pos = len(self.person_ids)
+                self.person_ids.append(person_id)
+                self._positions[person_id] = pos
+            if pos in self._faiss_counts:
+                self._stale.add(pos)
+            if bank.shape[0] == 0:
+                self._delta.pop(pos, None)
+                self._row_counts.pop(pos, None)
+            else:
+                self._delta[pos] = bank
+                self._row_counts[pos] = bank.shape[0]
+        if sum(bank.shape[0] for bank in self._delta.values()) > FAISS_DELTA_MAX_ROWS:
+            self._merge_faiss_delta()
+        return self
+
+    def _merge_faiss_delta(self):
+        """delta와 숨긴 행을 복제한 faiss 인덱스에 반영 (공유 중인 원본 faiss 인덱스는 바꾸지 않음)"""
+        index = faiss.clone_index(self._faiss_index)
+        for pos in self._stale:
+            count = self._faiss_counts.pop(pos)
+            index.remove_ids((np.int64(pos) << ROW_ID_SHIFT) + np.arange(count, dtype=np.int64))
+        for pos, bank in self._delta.items():
+            index.add_with_ids(bank, (np.int64(pos) << ROW_ID_SHIFT) + np.arange(bank.shape[0], dtype=np.int64))
+            self._faiss_counts[pos] = bank.shape[0]
+        self._faiss_index = index
+        self._stale, self._delta = set(), {}
+
+    def _own_list(self, list_no: int):
+        """공유 중인 리스트 버퍼를 이 인덱스 전용으로 복사"""
+        if list_no in self._shared_lists:
+            self._list_vecs[list_no] = self._list_vecs[list_no].copy()
+            self._list_owners[list_no] = self._list_owners[list_no].copy()
+            self._shared_lists.discard(list_no)
+
+    def remove_person(self, person_id: str):
+        """인물의 모든 행 제거"""
+        pos = self._positions.get(person_id)
+        if pos is None or pos not in self._row_counts:
+            return
+        count = self._row_counts.pop(pos)
+
+        if self.backend == "faiss":
+            self._delta.pop(pos, None)
+            self._stale.discard(pos)
+            count = self._faiss_counts.pop(pos, 0)
+            if count:
+                ids = (np.int64(pos) << ROW_ID_SHIFT) + np.arange(count, dtype=np.int64)
+                self._faiss_index.remove_ids(ids)
+            return
+
+        for list_no in self._person_lists.pop(pos, set()):
+            size = self._list_sizes[list_no]
+            self._own_list(list_no)
+            keep = self._list_owners[list_no][:size] != pos
+            kept = int(keep.sum())
+            self._list_vecs[list_no][:kept] = self._list_vecs[list_no][:size][keep]
+            self._list_owners[list_no][:kept] = self._list_owners[list_no][:size][keep]
+            self._list_sizes[list_no] = kept
+
+    def _append_to_list(self, list_no: int, rows: np.ndarray, owner: int):
+        """리스트 버퍼에 행 추가 (용량 부족 시 2배로 확장)"""
+        size = self._list_sizes[list_no]
+        needed = size + rows.shape[0]
+        capacity = self._list_vecs[list_no].shape[0]
+        if needed > capacity:
+            new_capacity = max(needed, capacity * 2, 16)
+            vecs = np.empty((new_capacity, self.dim), dtype=np.float32)
+            owners = np.empty(new_capacity, dtype=np.int32)
+            vecs[:size] = self._list_vecs[list_no][:size]
+            owners[:size] = self._list_owners[list_no][:size]
+            self._list_vecs[list_no] = vecs
+            self._list_owners[list_no] = owners
+            self._shared_lists.discard(list_no)
+        else:
+            self._own_list(list_no)
+        self._list_vecs[list_no][size:needed] = rows
+        self._list_owners[list_no][size:needed] = owner
+        self._list_sizes[list_no] = needed
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        """등록된 인물 수"""
+        return len(self._row_counts)
+
+    @property
+    def num_rows(self) -> int:
+        """전체 임베딩 수"""
+        return int(sum(self._row_counts.values()))
+
+    def person_mask(self, person_ids) -> np.ndarray:
+        """person_id 집합 → 인물 인덱스 boolean mask"""
+        mask = np.zeros(len(self.person_ids), dtype=bool)
+        for pid in person_ids:
+            pos = self._positions.get(pid)
+            if pos is not None:
+                mask[pos] = True
+        return mask
+
+    def _candidates(self, query: np.ndarray, probe: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """probe 리스트들의 후보 (유사도, 소유자) - float32 정확 계산"""
+        sizes = [self._list_sizes[l] for l in probe]
+        if sum(sizes) == 0:
+            return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int32)
+        vecs = np.concatenate([self._list_vecs[l][:n] for l, n in zip(probe, sizes)])
+        owners = np.concatenate([self._list_owners[l][:n] for l, n in zip(probe, sizes)])
+        return vecs @ query, owners
+
+    def match_batch(self, queries: np.ndarray, allowed: Optional[np.ndarray] = None,
+                    rerank_k: int = 256) -> List[Tuple[str, float, float]]:
+        """
+        여러 얼굴 ANN 매칭
+
+        Args:
+            queries: (F, 512) L2 정규화된 임베딩
+            allowed: 인물 인덱스 boolean mask (용의자 집합 필터, None이면 전체)
+            rerank_k: faiss 백엔드에서 가져올 후보 행 수
+
+        Returns:
+            [(best_person_id, best_sim, second_sim), ...] 길이 F
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        results = [(UNKNOWN_ID, 0.0, 0.0)] * queries.shape[0]
+        if len(self) == 0 or queries.shape[0] == 0:
+            return results
+
+        if self.backend == "faiss":
+            k = rerank_k if allowed is None else rerank_k * 4
+            if self._stale:
+                # 숨길 행이 결과를 차지할 수 있으므로 그만큼 더 가져옴
+                k += min(sum(self._faiss_counts[pos] for pos in self._stale), rerank_k)
+            sims_all, ids_all = self._faiss_index.search(queries, k)
+            hidden = np.zeros(len(self.person_ids), dtype=bool)
+            hidden[list(self._stale)] = True
+            if self._delta:
+                delta_owners = np.concatenate([np.full(bank.shape[0], pos, dtype=np.int32)
+                                               for pos, bank in self._delta.items()])
+                delta_sims = queries @ np.vstack(list(self._delta.values())).T  # (F, delta 행 수)
+        else:
+            nprobe = min(self.nprobe, self.nlist)
+            coarse = queries @ self.centroids.T
+            probes = np.argpartition(-coarse, nprobe - 1, axis=1)[:, :nprobe]
+
+        for f in range(queries.shape[0]):
+            if self.backend == "faiss":
+                valid = ids_all[f] >= 0
+                sims = sims_all[f][valid]
+                owners = (ids_all[f][valid] >> ROW_ID_SHIFT).astype(np.int32)
+                if self._stale:
+                    visible = ~hidden[owners]
+                    sims, owners = sims[visible], owners[visible]
+                if self._delta:
+                    sims = np.concatenate([sims, delta_sims[f]])
+                    owners = np.concatenate([owners, delta_owners])
+            else:
+                sims, owners = self._candidates(queries[f], probes[f])
+            if allowed is not None and sims.shape[0] > 0:
+                keep = allowed[owners]
+                sims, owners = sims[keep], owners[keep]
+            results[f] = self._best_two_persons(sims, owners)
+        return results
+
+    def _best_two_persons(self, sims: np.ndarray, owners: np.ndarray) -> Tuple[str, float, float]:
+        """후보 행 → 인물 단위 best / second (인물별 최대값 기준)"""
+        if sims.shape[0] == 0:
+            return UNKNOWN_ID, 0.0, 0.0
+        best_row = int(np.argmax(sims))
+        best_owner = owners[best_row]
+        others = owners != best_owner
+        second = float(sims[others].max()) if np.any(others) else 0.0
+        return self.person_ids[best_owner], float(sims[best_row]), second
+
+
+class AnnView:
+    """
+    용의자 집합으로 제한된 IVFIndex 뷰 (GalleryIndex와 같은 인터페이스)
+
+    Sub-Index를 따로 묶지 않고 ANN 후보를 용의자 mask로 필터링합니다.
+    """
+
+    def __init__(self, ann: IVFIndex, person_ids: List[str]):
+        self.ann = ann
+        self.person_ids = list(person_ids)
+        self._mask = ann.person_mask(self.person_ids)
+        self._count = int(self._mask.sum())
+
+    def __len__(self) -> int:
+        return self._count
+
+    def match_batch(self, queries: np.ndarray) -> List[Tuple[str, float, float]]:
+        # 인덱스를 직접 set_person으로 갱신해 새 인물이 추가된 경우 mask 길이 맞추기
+        if self._mask.shape[0] != len(self.ann.person_ids):
+            self._mask = self.ann.person_mask(self.person_ids)
+        return self.ann.match_batch(queries, allowed=self._mask)
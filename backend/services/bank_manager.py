@@ -10,11 +10,9 @@ from datetime import datetime
 
 from backend.utils.image_utils import l2_normalize, is_diverse_angle, is_all_angles_collected
 
-from backend.services.data_loader import (
-    gallery_base_cache,
-    gallery_masked_cache,
-    gallery_dynamic_cache
-)
+from backend.services.gallery_store import gallery_store
+from backend.services.gallery_index import GalleryIndex, person_centroids
+from backend.services.angle_partition import encode_angles
 
 
 #constants
@@ -234,10 +232,14 @@ async def add_embedding_to_dynamic_bank_async(person_id: str, embedding: np.ndar
     # 각도별 파일로 분리하여 저장 (정답 데이터와 동일한 구조 - 평가용)
     save_angle_separated_banks(updated_dynamic_bank, angles_info, person_dir)
     
-    # 메모리 캐시 즉시 갱신 (실시간 인식에 반영)
-    global gallery_dynamic_cache
+    # 메모리 캐시 즉시 갱신 (다음 스냅샷에 반영 → 실시간 인식에 반영)
     updated_dynamic_bank_normalized = updated_dynamic_bank / (np.linalg.norm(updated_dynamic_bank, axis=1, keepdims=True) + 1e-6)
-    gallery_dynamic_cache[person_id] = updated_dynamic_bank_normalized
+    with gallery_store.batch() as batch:
+        batch.set_bank("dynamic", person_id, updated_dynamic_bank_normalized)
+        batch.set_bank("dynamic_angles", person_id,
+                       encode_angles(angles_info["angle_types"], updated_dynamic_bank.shape[0]))
+        batch.set_bank("centroid", person_id, person_centroids(
+            batch.bank("base", person_id), batch.bank("masked", person_id), updated_dynamic_centroid))
     
     if verbose:
         completion_msg = " [수집 완료!]" if is_completed else ""
@@ -383,15 +385,21 @@ def update_gallery_cache_in_memory(person_id: str, embedding: np.ndarray, bank_t
     Returns:
         추가 성공 여부 (True: 추가됨, False: 중복으로 스킵)
     """
-    global gallery_base_cache, gallery_masked_cache
-    
     embedding = l2_normalize(embedding.astype("float32"))
     
     BANK_DUPLICATE_THRESHOLD = 0.95
     
+    # 중복 체크와 추가를 하나의 batch 안에서 수행 (동시 갱신 시 덮어쓰기 방지)
+    with gallery_store.batch() as batch:
+        return _update_gallery_bank(batch, person_id, embedding, bank_type, BANK_DUPLICATE_THRESHOLD)
+
+
+def _update_gallery_bank(batch, person_id: str, embedding: np.ndarray, bank_type: str,
+                         duplicate_threshold: float) -> bool:
+    """update_gallery_cache_in_memory의 batch 내부 처리"""
     # Base Bank와 Masked Bank 모두 확인 (중복 체크용)
-    base_bank = gallery_base_cache.get(person_id)
-    masked_bank = gallery_masked_cache.get(person_id)
+    base_bank = batch.bank("base", person_id)
+    masked_bank = batch.bank("masked", person_id)
     
     # 중복 체크: base + masked 전체를 대상으로
     all_bank_list = []
@@ -403,7 +411,7 @@ def update_gallery_cache_in_memory(person_id: str, embedding: np.ndarray, bank_t
     if all_bank_list:
         all_bank = np.vstack(all_bank_list)
         max_sim = float(np.max(all_bank @ embedding))
-        if max_sim >= BANK_DUPLICATE_THRESHOLD:
+        if max_sim >= duplicate_threshold:
             return False  # 중복으로 스킵
     
     # bank_type에 따라 적절한 캐시에 추가
@@ -414,7 +422,9 @@ def update_gallery_cache_in_memory(person_id: str, embedding: np.ndarray, bank_t
         
         new_emb = embedding.reshape(1, -1)
         updated_masked_bank = np.vstack([masked_bank, new_emb])
-        gallery_masked_cache[person_id] = updated_masked_bank
+        batch.set_bank("masked", person_id, updated_masked_bank)
+        batch.set_bank("centroid", person_id, person_centroids(
+            base_bank, updated_masked_bank, batch.bank("dynamic", person_id)))
     else:
         # Base Bank는 자동 학습으로 추가하지 않음 (read-only)
         # 하지만 호환성을 위해 함수는 동작하도록 함
@@ -424,27 +434,26 @@ def update_gallery_cache_in_memory(person_id: str, embedding: np.ndarray, bank_t
         
         new_emb = embedding.reshape(1, -1)
         updated_base_bank = np.vstack([base_bank, new_emb])
-        gallery_base_cache[person_id] = updated_base_bank
+        batch.set_bank("base", person_id, updated_base_bank)
+        batch.set_bank("centroid", person_id, person_centroids(
+            updated_base_bank, masked_bank, batch.bank("dynamic", person_id)))
     
     return True
 
 
 def match_with_bank_detailed(face_emb, gallery):
-    """Match face embedding with gallery"""
+    """
+    Match face embedding with gallery
+    
+    Args:
+        face_emb: 얼굴 임베딩 (512,)
+        gallery: GalleryIndex 또는 {person_id: bank} 딕셔너리
+    
+    Returns:
+        (best_person_id, best_sim, second_sim)
+    """
     if not gallery:
         return "unknown", 0.0, 0.0
-    face_emb = l2_normalize(face_emb.astype("float32"))
-    sims = []
-    for pid, edata in gallery.items():
-        if edata.ndim == 2:
-            s = float((edata @ face_emb).max())
-        else:
-            s = float(edata @ face_emb)
-        sims.append((pid, s))
-    sims.sort(key=lambda x: x[1], reverse=True)
-    if not sims:
-        return "unknown", 0.0, 0.0
-    elif len(sims) == 1:
-        return sims[0][0], sims[0][1], 0.0
-    else:
-        return sims[0][0], sims[0][1], sims[1][1]
\ No newline at end of file
+    if not isinstance(gallery, GalleryIndex):
+        gallery = GalleryIndex.from_gallery(gallery)
+    return gallery.search(face_emb)
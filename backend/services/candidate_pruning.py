@@ -0,0 +1,143 @@
+# backend/services/candidate_pruning.py
+"""
+Coarse-to-Fine 2단계 매칭 (centroid 기반 후보 선별)
+
+1단계: 얼굴 임베딩을 인물별 centroid(base/masked/dynamic 평균)와만 비교해서 상위 M명 선택
+2단계: 후보 M명에 대해서만 base bank 비교
+       base 유사도가 결정적이면(PRUNE_DECISIVE_BASE_SIM 이상) masked/dynamic은 base 승자 한 명만 비교 (early exit)
+       아니면 후보 M명의 masked/dynamic bank도 비교
+
+결정적 기준 0.9 이상에서는 가중 투표(W_DYNAMIC=0.9, W_MASKED=0.7)로
+base를 이길 수 없으므로 early exit가 최종 매칭 결과를 바꾸지 않습니다.
+early exit한 얼굴도 masked/dynamic 유사도는 승자 본인의 실제 값이므로
+face_results 로그와 bank 업데이트 판단(masked_sim / dynamic_sim)이 그대로 동작합니다 (second_sim은 0).
+후보 선별의 recall은 backend/benchmarks/bench_pruning_recall.py로 측정합니다.
+
+각도 분할(ANGLE_PARTITION_ENABLED) / 가려진 얼굴만 masked 비교(MASKED_ONLY_WHEN_OCCLUDED)는
+두 경로 모두에서 적용됩니다 (backend/services/angle_partition.py).
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from backend.config import PRUNE_ENABLED, PRUNE_TOP_M, PRUNE_DECISIVE_BASE_SIM, MASKED_ONLY_WHEN_OCCLUDED
+from backend.services.gallery_index import GalleryIndex, UNKNOWN_ID
+from backend.services.angle_partition import AnglePartitionedIndex
+
+MatchTable = List[Tuple[str, float, float]]
+
+# 누적 통계 (디버깅/모니터링용)
+pruning_stats: Dict[str, int] = {
+    "faces": 0,  # 2단계 매칭을 거친 얼굴 수
+    "persons": 0,  # 1단계에서 비교한 인물 수 (누적)
+    "candidates": 0,  # 2단계로 넘어간 후보 수 (누적)
+    "early_exits": 0,  # base가 결정적이어서 masked/dynamic을 승자 한 명만 비교한 얼굴 수
+}
+
+
+def _select_dynamic(dynamic_index, angle_type: Optional[str]):
+    """각도 분할 인덱스면 얼굴 각도의 버킷 인덱스, 아니면 그대로"""
+    if isinstance(dynamic_index, AnglePartitionedIndex):
+        return dynamic_index.for_angle(angle_type)
+    return dynamic_index
+
+
+def match_pruned(queries: np.ndarray, base_index: GalleryIndex, masked_index: GalleryIndex,
+                 dynamic_index, centroid_index: GalleryIndex,
+                 top_m: int = PRUNE_TOP_M,
+                 decisive_sim: float = PRUNE_DECISIVE_BASE_SIM,
+                 angle_types: Optional[Sequence[str]] = None,
+                 occluded: Optional[Sequence[bool]] = None) -> Tuple[MatchTable, MatchTable, MatchTable]:
+    """
+    centroid 후보 선별 후 후보만 정밀 비교
+
+    Args:
+        queries: (F, 512) L2 정규화된 얼굴 임베딩
+        dynamic_index: GalleryIndex 또는 AnglePartitionedIndex
+        top_m: 2단계로 넘길 후보 인물 수
+        decisive_sim: base 유사도 early exit 기준
+        angle_types: 얼굴별 각도 (dynamic이 각도 분할 인덱스일 때 버킷 선택)
+        occluded: 얼굴별 가림 여부 (주어지면 가려진 얼굴만 masked 비교)
+
+    Returns:
+        (base_table, masked_table, dynamic_table) - 각 길이 F의 (best_person_id, best_sim, second_sim)
+    """
+    coarse = centroid_index.person_scores(queries)  # (F, P) - 인물당 centroid 최대 3개
+    num_candidates = min(top_m, coarse.shape[1])
+    unknown = (UNKNOWN_ID, 0.0, 0.0)
+
+    base_table, masked_table, dynamic_table = [], [], []
+    for f in range(queries.shape[0]):
+        if num_candidates == 0:
+            base_table.append(unknown)
+            masked_table.append(unknown)
+            dynamic_table.append(unknown)
+            continue
+        top = np.argpartition(-coarse[f], num_candidates - 1)[:num_candidates]
+        candidates = [centroid_index.person_ids[i] for i in top]
+
+        base_result = base_index.match_candidates(queries[f], candidates)
+        base_table.append(base_result)
+        if base_result[1] >= decisive_sim:
+            # 결정적인 base 승자 한 명의 masked/dynamic 유사도만 계산 (후보 M명 비교 생략)
+            candidates = [base_result[0]]
+            pruning_stats["early_exits"] += 1
+        if occluded is None or occluded[f]:
+            masked_table.append(masked_index.match_candidates(queries[f], candidates))
+        else:
+            masked_table.append(unknown)
+        face_dynamic = _select_dynamic(dynamic_index, angle_types[f] if angle_types is not None else None)
+        dynamic_table.append(face_dynamic.match_candidates(queries[f], candidates))
+
+    pruning_stats["faces"] += queries.shape[0]
+    pruning_stats["persons"] += queries.shape[0] * coarse.shape[1]
+    pruning_stats["candidates"] += queries.shape[0] * num_candidates
+    return base_table, masked_table, dynamic_table
+
+
+def _match_masked(queries: np.ndarray, masked_index, occluded: Optional[Sequence[bool]]) -> MatchTable:
+    """가려진 얼굴만 masked bank와 비교 (occluded가 None이면 전부 비교)"""
+    if occluded is None:
+        return masked_index.match_batch(queries)
+    table: MatchTable = [(UNKNOWN_ID, 0.0, 0.0)] * queries.shape[0]
+    face_ids = [i for i, is_occluded in enumerate(occluded) if is_occluded]
+    if face_ids:
+        for i, result in zip(face_ids, masked_index.match_batch(queries[face_ids])):
+            table[i] = result
+    return table
+
+
+def match_tables(queries: np.ndarray, indexes: tuple,
+                 angle_types: Optional[Sequence[str]] = None,
+                 occluded: Optional[Sequence[bool]] = None) -> Tuple[MatchTable, MatchTable, MatchTable]:
+    """
+    프레임의 얼굴들을 base/masked/dynamic 인덱스와 매칭
+
+    용의자 수가 PRUNE_TOP_M보다 많고 모든 인덱스가 정확 인덱스(GalleryIndex)일 때만
+    2단계 매칭을 사용하고, 그 외에는 전체 비교(match_batch)를 사용합니다.
+
+    Args:
+        queries: (F, 512) L2 정규화된 얼굴 임베딩
+        indexes: data_loader.get_suspect_indexes()의 (base, masked, dynamic, centroid)
+        angle_types: 얼굴별 estimate_face_angle 결과 (dynamic이 AnglePartitionedIndex일 때 사용)
+        occluded: 얼굴별 가림 여부 (MASKED_ONLY_WHEN_OCCLUDED일 때만 사용, 안 가려진 얼굴은 masked 비교 생략)
+    """
+    base_index, masked_index, dynamic_index, centroid_index = indexes
+    if not MASKED_ONLY_WHEN_OCCLUDED:
+        occluded = None
+    use_pruning = (
+        PRUNE_ENABLED
+        and len(centroid_index) > PRUNE_TOP_M
+        and all(isinstance(index, (GalleryIndex, AnglePartitionedIndex)) for index in indexes)
+    )
+    if use_pruning:
+        return match_pruned(queries, base_index, masked_index, dynamic_index, centroid_index,
+                            angle_types=angle_types, occluded=occluded)
+    if isinstance(dynamic_index, AnglePartitionedIndex):
+        dynamic_table = dynamic_index.match_batch(queries, angle_types)
+    else:
+        dynamic_table = dynamic_index.match_batch(queries)
+    return (
+        base_index.match_batch(queries),
+        _match_masked(queries, masked_index, occluded),
+        dynamic_table,
+    )
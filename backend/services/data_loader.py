@@ -3,151 +3,417 @@
 데이터 로딩 및 캐싱 서비스
 """
 
+import json
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple, FrozenSet, Set
 import numpy as np
 from sqlalchemy.orm import Session
 
-from backend.database import get_all_persons
+from backend.database import get_all_persons, get_person_by_id
 from backend.utils.image_utils import l2_normalize
+from backend.config import ANN_ENABLED, ANN_BACKEND, ANN_MIN_ROWS, ANN_NLIST, ANN_NPROBE
+from backend.config import GALLERY_QUANTIZATION, GALLERY_RERANK_PERSONS, GALLERY_RERANK_DIR, ANGLE_PARTITION_ENABLED
+from backend.services.gallery_index import GalleryIndex, person_centroids
+from backend.services.ann_index import IVFIndex, AnnView
+from backend.services.angle_partition import AnglePartitionedIndex, encode_angles
+from backend.services.gallery_store import gallery_store, GallerySnapshot, BANK_TYPES
+from backend.services.person_directory import person_directory
+from backend.utils.embedding_tag import tag_mismatch
 
 
 # 프로젝트 루트를 Python 경로에 추가
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 EMBEDDINGS_DIR = PROJECT_ROOT / "outputs" / "embeddings"
 
-# 메모리 캐시 (성능 향상을 위해)
-persons_cache: List[Dict] = []
-gallery_base_cache: Dict[str, np.ndarray] = {}  # base bank (정면, 측면, 마스크 없는 얼굴)
-gallery_masked_cache: Dict[str, np.ndarray] = {}  # masked bank (마스크 쓴 얼굴)
-gallery_dynamic_cache: Dict[str, np.ndarray] = {}  # dynamic bank (CCTV에서 수집한 다양한 각도 임베딩 - 인식용)
+# 갤러리 저장소 (인물 정보 + base/masked/dynamic bank 스냅샷)
+# 주의: 예전 전역 dict(gallery_*_cache, persons_cache)는 아래 __getattr__로 현재 스냅샷을 돌려줍니다.
+#       from ... import gallery_base_cache 처럼 이름으로 가져오지 말고 gallery_store.snapshot()을 사용하세요.
+_SNAPSHOT_ALIASES = {
+    "gallery_base_cache": lambda snap: snap.banks["base"],  # base bank (정면, 측면, 마스크 없는 얼굴)
+    "gallery_masked_cache": lambda snap: snap.banks["masked"],  # masked bank (마스크 쓴 얼굴)
+    "gallery_dynamic_cache": lambda snap: snap.banks["dynamic"],  # dynamic bank (CCTV에서 수집한 다양한 각도 임베딩 - 인식용)
+    "persons_cache": lambda snap: snap.persons,
+    "gallery_version": lambda snap: snap.version,
+    "person_versions": lambda snap: snap.person_versions,
+    "gallery_epoch": lambda snap: snap.epoch,
+}
 
-def load_persons_from_db(db: Session):
-    """PostgreSQL에서 인물 정보 로드 및 캐시 (Bank 데이터 포함 - base/masked/dynamic 분리)"""
-    global persons_cache, gallery_base_cache, gallery_masked_cache, gallery_dynamic_cache
+
+def __getattr__(name: str):
+    """data_loader.gallery_base_cache 등 기존 이름으로 현재 스냅샷 조회 (읽기 전용)"""
+    alias = _SNAPSHOT_ALIASES.get(name)
+    if alias is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return alias(gallery_store.snapshot())
+
+
+# 스냅샷 버전별 ANN 인덱스 {(bank_type, version): (epoch, ann)}
+# 발행마다 바뀐 인물만 교체한 새 인덱스(IVFIndex.with_persons)를 추가하고, 이전 버전 인덱스는 바꾸지 않음
+ANN_VERSION_HISTORY = 4  # bank 종류별로 유지할 최근 버전 수 (버전끼리 바뀌지 않은 리스트 / faiss 인덱스를 공유)
+_ann_cache: "OrderedDict[Tuple[str, int], Tuple[int, Optional[IVFIndex]]]" = OrderedDict()
+
+# 용의자 집합별 Sub-Index 캐시 (WebSocket 연결 간 공유)
+# {frozenset(suspect_ids): (person 버전 서명, (base, masked, dynamic) 인덱스)}
+SUSPECT_INDEX_CACHE_SIZE = 64
+_suspect_index_cache: "OrderedDict[FrozenSet[str], Tuple[tuple, tuple]]" = OrderedDict()
+
+
+def _on_gallery_published(snapshot: GallerySnapshot, changed_ids: Optional[Set[str]]):
+    """
+    새 스냅샷 발행 시 파생 인덱스 정리
     
-    persons = get_all_persons(db)
+    Args:
+        snapshot: 새 스냅샷
+        changed_ids: 변경된 인물 ID (None이면 전체 재로딩)
+    """
+    if changed_ids is None:
+        # 전체 재로딩: 용의자 Sub-Index 전부 무효화 (ANN은 새 버전 첫 조회 시 재학습)
+        _suspect_index_cache.clear()
+        _ann_cache.clear()
+        return
     
-    persons_cache = []
-    gallery_base_cache = {}
-    gallery_masked_cache = {}
-    gallery_dynamic_cache = {}
+    # ANN 인덱스는 같은 epoch의 최신 버전에서 해당 인물의 행만 교체한 새 인덱스로 추가 (증분 갱신)
+    # 이전 버전 인덱스는 그대로 두므로 검색 중인 스레드에 영향 없음
+    latest: Dict[str, Tuple[int, Tuple[int, Optional[IVFIndex]]]] = {}
+    for (bank_type, version), entry in list(_ann_cache.items()):
+        if entry[0] == snapshot.epoch and version < snapshot.version and version > latest.get(bank_type, (-1,))[0]:
+            latest[bank_type] = (version, entry)
+    for bank_type, (_, (epoch, ann)) in latest.items():
+        if ann is not None:
+            ann = ann.with_persons({pid: snapshot.bank(bank_type, pid) for pid in changed_ids})
+        _store_ann(bank_type, snapshot.version, epoch, ann)
+
+
+def _store_ann(bank_type: str, version: int, epoch: int, ann: Optional[IVFIndex]):
+    """버전별 ANN 인덱스 저장 (bank 종류별로 최근 ANN_VERSION_HISTORY개만 유지)"""
+    _ann_cache[(bank_type, version)] = (epoch, ann)
+    versions = sorted(v for bt, v in list(_ann_cache) if bt == bank_type)
+    for old in versions[:-ANN_VERSION_HISTORY]:
+        _ann_cache.pop((bank_type, old), None)
+
+
+gallery_store.subscribe(_on_gallery_published)
+
+
+def get_ann_index(bank_type: str, snapshot: Optional[GallerySnapshot] = None) -> Optional[IVFIndex]:
+    """
+    bank 종류별 ANN 인덱스 반환 (ANN_ENABLED이고 bank가 충분히 클 때만)
     
-    for person in persons:
-        person_id = person.person_id
-        
-        # outputs/embeddings 폴더에서 Bank 데이터 확인
-        person_dir = EMBEDDINGS_DIR / person_id
-        base_bank_path = person_dir / "bank_base.npy"
-        masked_bank_path = person_dir / "bank_masked.npy"
-        dynamic_bank_path = person_dir / "bank_dynamic.npy"  # 동적 bank (인식용)
-        centroid_path = person_dir / "centroid.npy"
-        
-        # 레거시 파일 경로 (참고용, 사용하지 않음)
-        # legacy_bank_path = person_dir / "bank.npy"
-        # legacy_centroid_path = person_dir / "centroid.npy"
-        
-        base_bank = None
-        masked_bank = None
-        dynamic_bank = None
-        
-        # ===== Base Bank 로딩 (새 구조만 사용, 레거시 파일 사용 안 함) =====
-        # 1. bank_base.npy (새 구조) - 필수
-        if base_bank_path.exists():
-            try:
-                base_bank = np.load(base_bank_path)
-                if base_bank.ndim == 1:
-                    base_bank = base_bank.reshape(1, -1)
-                # L2 정규화
-                base_bank = base_bank / (np.linalg.norm(base_bank, axis=1, keepdims=True) + 1e-6)
-            except Exception as e:
-                print(f"  ⚠️ Base Bank 로드 실패 ({person_id}): {e}")
-                base_bank = None
-        
-        # 2. DB 임베딩 사용 (fallback)
-        if base_bank is None:
-            try:
-                db_embedding = person.get_embedding()
-                db_embedding = l2_normalize(db_embedding)
-                base_bank = db_embedding.reshape(1, -1)
-                print(f"  ℹ️ DB 임베딩을 Base Bank로 사용: {person_id}")
-            except Exception as e:
-                print(f"  ⚠️ DB 임베딩 로드 실패 ({person_id}): {e}")
-                base_bank = None
-        
-        # Base가 없으면 스킵
-        if base_bank is None:
-            print(f"  ❌ Base Bank를 찾을 수 없음: {person.name} (ID: {person_id}), 스킵")
-            continue
-        
-        # ===== Masked Bank 로딩 =====
-        if masked_bank_path.exists():
+    전체 재로딩 시에만 새로 학습하며, 인물 단위 변경은 스냅샷 발행 시 새 버전 인덱스로 증분 반영됩니다.
+    인덱스는 조회한 스냅샷 버전의 bank와 일치합니다.
+    
+    Returns:
+        IVFIndex 또는 None (정확 검색 사용)
+    """
+    if not ANN_ENABLED:
+        return None
+    
+    snapshot = snapshot or gallery_store.snapshot()
+    cached = _ann_cache.get((bank_type, snapshot.version))
+    if cached is not None:
+        return cached[1]
+    
+    cache = snapshot.banks[bank_type]
+    ann = None
+    total_rows = sum(np.asarray(bank).reshape(-1, 512).shape[0] for bank in cache.values())
+    if total_rows >= ANN_MIN_ROWS:
+        ann = IVFIndex(nlist=ANN_NLIST, nprobe=ANN_NPROBE, backend=ANN_BACKEND)
+        ann.build(cache)
+        print(f"🔎 ANN 인덱스 생성: {bank_type} ({total_rows}개 임베딩, nlist={ann.nlist}, backend={ann.backend})")
+    _store_ann(bank_type, snapshot.version, snapshot.epoch, ann)
+    return ann
+
+
+def _build_suspect_index(snapshot: GallerySnapshot, bank_type: str, ordered_ids: List[str]):
+    """용의자 집합 인덱스 생성 (대규모 집합이면 ANN 뷰, 아니면 정확 Sub-Index)"""
+    cache = snapshot.banks[bank_type]
+    ann = get_ann_index(bank_type, snapshot)
+    if ann is not None:
+        subset_rows = sum(np.asarray(cache[pid]).reshape(-1, 512).shape[0] for pid in ordered_ids if pid in cache)
+        if subset_rows >= ANN_MIN_ROWS:
+            return AnnView(ann, ordered_ids)
+    if bank_type == "dynamic" and ANGLE_PARTITION_ENABLED:
+        # 얼굴 각도의 같은/이웃 버킷만 비교하는 각도 분할 인덱스
+        return AnglePartitionedIndex.from_gallery(cache, snapshot.banks["dynamic_angles"], ordered_ids,
+                                                  quantization=GALLERY_QUANTIZATION,
+                                                  rerank_persons=GALLERY_RERANK_PERSONS,
+                                                  rerank_dir=GALLERY_RERANK_DIR)
+    return GalleryIndex.from_gallery(cache, ordered_ids, quantization=GALLERY_QUANTIZATION,
+                                     rerank_persons=GALLERY_RERANK_PERSONS, rerank_dir=GALLERY_RERANK_DIR)
+
+
+def get_suspect_indexes(suspect_ids: List[str]) -> tuple:
+    """
+    용의자 집합 전용 (base, masked, dynamic, centroid) Sub-Index 반환
+    
+    (frozenset(suspect_ids), 해당 인물들의 bank 버전)으로 메모이즈되어
+    같은 용의자를 보는 모든 연결이 공유합니다.
+    선택된 인물 중 누군가의 bank가 바뀐 경우에만 다시 생성합니다.
+    
+    Args:
+        suspect_ids: 용의자 ID 배열
+    
+    Returns:
+        (base_index, masked_index, dynamic_index, centroid_index)
+        centroid_index는 2단계 매칭의 후보 선별용 (항상 정확 인덱스)
+        ANGLE_PARTITION_ENABLED면 dynamic_index는 AnglePartitionedIndex
+    """
+    snapshot = gallery_store.snapshot()
+    key = frozenset(suspect_ids)
+    ordered_ids = sorted(key)
+    signature = (snapshot.epoch,) + tuple(snapshot.person_versions.get(pid, 0) for pid in ordered_ids)
+    
+    cached = _suspect_index_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        _suspect_index_cache.move_to_end(key)
+        return cached[1]
+    
+    indexes = (
+        _build_suspect_index(snapshot, "base", ordered_ids),
+        _build_suspect_index(snapshot, "masked", ordered_ids),
+        _build_suspect_index(snapshot, "dynamic", ordered_ids),
+        GalleryIndex.from_gallery(snapshot.banks["centroid"], ordered_ids),
+    )
+    _suspect_index_cache[key] = (signature, indexes)
+    _suspect_index_cache.move_to_end(key)
+    while len(_suspect_index_cache) > SUSPECT_INDEX_CACHE_SIZE:
+        _suspect_index_cache.popitem(last=False)
+    return indexes
+
+
+def _load_centroid_bank(person_dir: Path, base_bank: np.ndarray, masked_bank: Optional[np.ndarray],
+                        dynamic_bank: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """
+    인물별 centroid bank 생성 (centroid_base.npy / centroid_dynamic.npy가 있으면 사용, 없으면 bank 평균)
+    
+    Returns:
+        (K, 512) - base / masked / dynamic centroid (있는 것만)
+    """
+    centroids = {}
+    for name in ("base", "dynamic"):
+        centroid_path = person_dir / f"centroid_{name}.npy"
+        if centroid_path.exists():
             try:
-                masked_bank = np.load(masked_bank_path)
-                if masked_bank.ndim == 1:
-                    masked_bank = masked_bank.reshape(1, -1)
-                if masked_bank.shape[0] > 0:
-                    # L2 정규화
-                    masked_bank = masked_bank / (np.linalg.norm(masked_bank, axis=1, keepdims=True) + 1e-6)
-                else:
-                    masked_bank = None
+                centroids[name] = np.load(centroid_path).reshape(-1, 512).mean(axis=0)
             except Exception as e:
-                print(f"  ⚠️ Masked Bank 로드 실패 ({person_id}): {e}")
+                print(f"  ⚠️ Centroid 로드 실패 ({person_dir.name}, {name}): {e}")
+    base_source = centroids.get("base", base_bank)
+    dynamic_source = centroids.get("dynamic", dynamic_bank) if dynamic_bank is not None else None
+    return person_centroids(base_source, masked_bank, dynamic_source)
+
+
+def _load_dynamic_angles(person_dir: Path, dynamic_bank: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """
+    dynamic bank 행별 각도 코드 로드 (angles_dynamic.json의 angle_types)
+    
+    Returns:
+        (N,) int8 각도 코드 (라벨이 없거나 행 수가 다르면 전부 unknown) 또는 None (dynamic bank 없음)
+    """
+    if dynamic_bank is None:
+        return None
+    angle_types = None
+    angles_path = person_dir / "angles_dynamic.json"
+    if angles_path.exists():
+        try:
+            with open(angles_path, 'r', encoding='utf-8') as f:
+                angle_types = json.load(f).get("angle_types")
+        except Exception as e:
+            print(f"  ⚠️ 각도 정보 로드 실패 ({person_dir.name}): {e}")
+    return encode_angles(angle_types, dynamic_bank.shape[0])
+
+
+def _load_person_entry(person) -> Optional[Tuple[Dict, Dict[str, Optional[np.ndarray]]]]:
+    """
+    DB 인물 한 명의 표시 정보와 base/masked/dynamic bank 로드 (L2 정규화)
+    
+    Returns:
+        (person_data, {"base", "masked", "dynamic", "centroid", "dynamic_angles": bank}) 또는 None (Base Bank 없음)
+    """
+    person_id = person.person_id
+    
+    # outputs/embeddings 폴더에서 Bank 데이터 확인
+    person_dir = EMBEDDINGS_DIR / person_id
+    
+    # 다른 recognition 모델로 만든 임베딩은 거부 (DB 임베딩도 같은 모델로 만든 것이므로 함께 제외)
+    mismatch = tag_mismatch(person_dir)
+    if mismatch:
+        print(f"  ❌ 모델 불일치로 로드 거부: {person.name} (ID: {person_id}, {mismatch}) → 현재 모델로 다시 등록 필요")
+        return None
+    base_bank_path = person_dir / "bank_base.npy"
+    masked_bank_path = person_dir / "bank_masked.npy"
+    dynamic_bank_path = person_dir / "bank_dynamic.npy"  # 동적 bank (인식용)
+    centroid_path = person_dir / "centroid.npy"
+    
+    # 레거시 파일 경로 (참고용, 사용하지 않음)
+    # legacy_bank_path = person_dir / "bank.npy"
+    # legacy_centroid_path = person_dir / "centroid.npy"
+    
+    base_bank = None
+    masked_bank = None
+    dynamic_bank = None
+    
+    # ===== Base Bank 로딩 (새 구조만 사용, 레거시 파일 사용 안 함) =====
+    # 1. bank_base.npy (새 구조) - 필수
+    if base_bank_path.exists():
+        try:
+            base_bank = np.load(base_bank_path)
+            if base_bank.ndim == 1:
+                base_bank = base_bank.reshape(1, -1)
+            # L2 정규화
+            base_bank = base_bank / (np.linalg.norm(base_bank, axis=1, keepdims=True) + 1e-6)
+        except Exception as e:
+            print(f"  ⚠️ Base Bank 로드 실패 ({person_id}): {e}")
+            base_bank = None
+    
+    # 2. DB 임베딩 사용 (fallback)
+    if base_bank is None:
+        try:
+            db_embedding = person.get_embedding()
+            db_embedding = l2_normalize(db_embedding)
+            base_bank = db_embedding.reshape(1, -1)
+            print(f"  ℹ️ DB 임베딩을 Base Bank로 사용: {person_id}")
+        except Exception as e:
+            print(f"  ⚠️ DB 임베딩 로드 실패 ({person_id}): {e}")
+            base_bank = None
+    
+    # Base가 없으면 스킵
+    if base_bank is None:
+        print(f"  ❌ Base Bank를 찾을 수 없음: {person.name} (ID: {person_id}), 스킵")
+        return None
+    
+    # ===== Masked Bank 로딩 =====
+    if masked_bank_path.exists():
+        try:
+            masked_bank = np.load(masked_bank_path)
+            if masked_bank.ndim == 1:
+                masked_bank = masked_bank.reshape(1, -1)
+            if masked_bank.shape[0] > 0:
+                # L2 정규화
+                masked_bank = masked_bank / (np.linalg.norm(masked_bank, axis=1, keepdims=True) + 1e-6)
+            else:
                 masked_bank = None
-        else:
-            # Masked Bank가 없으면 None (빈 상태)
+        except Exception as e:
+            print(f"  ⚠️ Masked Bank 로드 실패 ({person_id}): {e}")
             masked_bank = None
-        
-        # ===== Dynamic Bank 로딩 (인식용) =====
-        if dynamic_bank_path.exists():
-            try:
-                dynamic_bank = np.load(dynamic_bank_path)
-                if dynamic_bank.ndim == 1:
-                    dynamic_bank = dynamic_bank.reshape(1, -1)
-                if dynamic_bank.shape[0] > 0:
-                    # L2 정규화
-                    dynamic_bank = dynamic_bank / (np.linalg.norm(dynamic_bank, axis=1, keepdims=True) + 1e-6)
-                else:
-                    dynamic_bank = None
-            except Exception as e:
-                print(f"  ⚠️ Dynamic Bank 로드 실패 ({person_id}): {e}")
+    else:
+        # Masked Bank가 없으면 None (빈 상태)
+        masked_bank = None
+    
+    # ===== Dynamic Bank 로딩 (인식용) =====
+    if dynamic_bank_path.exists():
+        try:
+            dynamic_bank = np.load(dynamic_bank_path)
+            if dynamic_bank.ndim == 1:
+                dynamic_bank = dynamic_bank.reshape(1, -1)
+            if dynamic_bank.shape[0] > 0:
+                # L2 정규화
+                dynamic_bank = dynamic_bank / (np.linalg.norm(dynamic_bank, axis=1, keepdims=True) + 1e-6)
+            else:
                 dynamic_bank = None
-        else:
-            # Dynamic Bank가 없으면 None (빈 상태)
+        except Exception as e:
+            print(f"  ⚠️ Dynamic Bank 로드 실패 ({person_id}): {e}")
             dynamic_bank = None
+    else:
+        # Dynamic Bank가 없으면 None (빈 상태)
+        dynamic_bank = None
+    
+    # persons_cache에는 base의 첫 번째 임베딩 사용 (표시용)
+    first_embedding = base_bank[0] if base_bank.ndim == 2 else base_bank.flatten()
+    
+    person_data = {
+        "id": person_id,
+        "name": person.name,
+        "is_criminal": person.is_criminal,
+        "info": person.info or {},
+        "embedding": first_embedding
+    }
+    
+    # 로드 결과 출력
+    masked_count = masked_bank.shape[0] if masked_bank is not None else 0
+    dynamic_count = dynamic_bank.shape[0] if dynamic_bank is not None else 0
+    masked_file_path = str(masked_bank_path.relative_to(PROJECT_ROOT)) if masked_bank_path.exists() else "없음"
+    dynamic_file_path = str(dynamic_bank_path.relative_to(PROJECT_ROOT)) if dynamic_bank_path.exists() else "없음"
+    print(f"  ✅ Bank 로드: {person.name} (ID: {person_id}, base: {base_bank.shape[0]}개, masked: {masked_count}개, dynamic: {dynamic_count}개)")
+    
+    banks = {
+        "base": base_bank,
+        "masked": masked_bank,
+        "dynamic": dynamic_bank,
+        "centroid": _load_centroid_bank(person_dir, base_bank, masked_bank, dynamic_bank),
+        "dynamic_angles": _load_dynamic_angles(person_dir, dynamic_bank),
+    }
+    return person_data, banks
+
+
+def load_persons_from_db(db: Session):
+    """PostgreSQL에서 인물 정보 로드 및 캐시 (Bank 데이터 포함 - base/masked/dynamic 분리)
+    
+    모든 인물의 bank를 디스크에서 다시 읽는 전체 재로딩입니다.
+    서버 시작과 관리자 재로딩에만 사용하고, 인물 단위 변경은 upsert_person / remove_person을 사용하세요.
+    """
+    persons = get_all_persons(db)
+    
+    persons_cache = []
+    gallery_caches = {bank_type: {} for bank_type in BANK_TYPES}  # gallery_base_cache, gallery_masked_cache, ...
+    
+    for person in persons:
+        entry = _load_person_entry(person)
+        if entry is None:
+            continue
+        person_data, banks = entry
         
-        # gallery_base_cache, gallery_masked_cache, gallery_dynamic_cache에 저장
-        gallery_base_cache[person_id] = base_bank
-        if masked_bank is not None:
-            gallery_masked_cache[person_id] = masked_bank
-        if dynamic_bank is not None:
-            gallery_dynamic_cache[person_id] = dynamic_bank
-        
-        # persons_cache에는 base의 첫 번째 임베딩 사용 (표시용)
-        first_embedding = base_bank[0] if base_bank.ndim == 2 else base_bank.flatten()
-        
-        person_data = {
-            "id": person_id,
-            "name": person.name,
-            "is_criminal": person.is_criminal,
-            "info": person.info or {},
-            "embedding": first_embedding
-        }
+        for bank_type, bank in banks.items():
+            if bank is not None:
+                gallery_caches[bank_type][person_data["id"]] = bank
         persons_cache.append(person_data)
-        
-        # 로드 결과 출력
-        masked_count = masked_bank.shape[0] if masked_bank is not None else 0
-        dynamic_count = dynamic_bank.shape[0] if dynamic_bank is not None else 0
-        masked_file_path = str(masked_bank_path.relative_to(PROJECT_ROOT)) if masked_bank_path.exists() else "없음"
-        dynamic_file_path = str(dynamic_bank_path.relative_to(PROJECT_ROOT)) if dynamic_bank_path.exists() else "없음"
-        print(f"  ✅ Bank 로드: {person.name} (ID: {person_id}, base: {base_bank.shape[0]}개, masked: {masked_count}개, dynamic: {dynamic_count}개)")
     
+    # 새 스냅샷으로 한 번에 교체 (로딩 도중에도 매칭은 이전 스냅샷을 사용)
+    with gallery_store.batch() as batch:
+        batch.replace_all(persons_cache, gallery_caches)
     print(f"📂 데이터베이스 로딩 완료 ({len(persons_cache)}명, Base/Masked/Dynamic Bank 분리 구조)\n")
 
+
+def upsert_person(db: Session, person_id: str) -> bool:
+    """
+    인물 한 명만 DB/디스크에서 다시 읽어 갤러리에 반영 (등록/수정 후 호출)
+    
+    해당 인물의 bank 파일만 읽고, 인덱스도 해당 인물의 행만 갱신됩니다.
+    
+    Returns:
+        반영 여부 (DB에 없거나 Base Bank가 없으면 갤러리에서 제거하고 False)
+    """
+    person = get_person_by_id(db, person_id)
+    entry = _load_person_entry(person) if person is not None else None
+    if entry is None:
+        remove_person(person_id)
+        return False
+    
+    person_data, banks = entry
+    with gallery_store.batch() as batch:
+        batch.set_person(person_data)
+        for bank_type, bank in banks.items():
+            batch.set_bank(bank_type, person_id, bank)
+    return True
+
+
+def remove_person(person_id: str) -> bool:
+    """
+    인물 한 명을 갤러리에서 제거 (삭제 후 호출)
+    
+    Returns:
+        제거 여부 (갤러리에 없었으면 False)
+    """
+    with gallery_store.batch() as batch:
+        batch.remove_person(person_id)
+        removed = person_id in batch.changed_ids
+    if removed:
+        print(f"  🗑️ 갤러리에서 제거: {person_id}")
+    return removed
+
+
 def load_persons_from_embeddings():
     """outputs/embeddings에서 gallery 로드 (fallback - base/masked/dynamic 분리 구조)"""
-    global gallery_base_cache, gallery_masked_cache, gallery_dynamic_cache, persons_cache
-    
     if not EMBEDDINGS_DIR.exists():
         print(f"⚠️ embeddings 폴더를 찾을 수 없습니다: {EMBEDDINGS_DIR}")
         return
@@ -156,6 +422,8 @@ def load_persons_from_embeddings():
         gallery_base_cache = {}
         gallery_masked_cache = {}
         gallery_dynamic_cache = {}
+        gallery_centroid_cache = {}
+        gallery_dynamic_angles_cache = {}
         persons_cache = []
         
         # 사람별 폴더 구조 확인
@@ -164,6 +432,11 @@ def load_persons_from_embeddings():
         for person_dir in person_dirs:
             person_id = person_dir.name
             
+            mismatch = tag_mismatch(person_dir)
+            if mismatch:
+                print(f"  ❌ 모델 불일치로 로드 거부: {person_id} ({mismatch})")
+                continue
+            
             base_bank_path = person_dir / "bank_base.npy"
             masked_bank_path = person_dir / "bank_masked.npy"
             dynamic_bank_path = person_dir / "bank_dynamic.npy"  # 동적 bank (인식용)
@@ -223,6 +496,8 @@ def load_persons_from_embeddings():
                 gallery_masked_cache[person_id] = masked_bank
             if dynamic_bank is not None:
                 gallery_dynamic_cache[person_id] = dynamic_bank
+                gallery_dynamic_angles_cache[person_id] = _load_dynamic_angles(person_dir, dynamic_bank)
+            gallery_centroid_cache[person_id] = _load_centroid_bank(person_dir, base_bank, masked_bank, dynamic_bank)
             
             # persons_cache에 추가
             first_embedding = base_bank[0] if base_bank.ndim == 2 else base_bank.flatten()
@@ -237,6 +512,10 @@ def load_persons_from_embeddings():
             dynamic_count = dynamic_bank.shape[0] if dynamic_bank is not None else 0
             print(f"  - {person_id} (base: {base_bank.shape[0]}개, masked: {masked_count}개, dynamic: {dynamic_count}개)")
         
+        with gallery_store.batch() as batch:
+            batch.replace_all(persons_cache, {"base": gallery_base_cache, "masked": gallery_masked_cache,
+                                              "dynamic": gallery_dynamic_cache, "centroid": gallery_centroid_cache,
+                                              "dynamic_angles": gallery_dynamic_angles_cache})
         print(f"📂 Gallery 로딩 완료 ({len(gallery_base_cache)}명, Base/Masked/Dynamic Bank 분리 구조)\n")
     except Exception as e:
         print(f"⚠️ Gallery 로딩 실패: {e}\n")
@@ -256,8 +535,6 @@ def load_persons_from_legacy_files():
         # 레거시 모드로 전환하려면 이 함수를 호출
         load_persons_from_legacy_files()
     """
-    global gallery_base_cache, gallery_masked_cache, persons_cache
-    
     if not EMBEDDINGS_DIR.exists():
         print(f"⚠️ embeddings 폴더를 찾을 수 없습니다: {EMBEDDINGS_DIR}")
         return
@@ -272,6 +549,11 @@ def load_persons_from_legacy_files():
         for person_dir in person_dirs:
             person_id = person_dir.name
             
+            mismatch = tag_mismatch(person_dir)
+            if mismatch:
+                print(f"  ❌ 모델 불일치로 로드 거부: {person_id} ({mismatch})")
+                continue
+            
             legacy_bank_path = person_dir / "bank.npy"
             legacy_centroid_path = person_dir / "centroid.npy"
             
@@ -317,6 +599,12 @@ def load_persons_from_legacy_files():
             }
             persons_cache.append(person_data)
         
+        # dynamic bank는 레거시 모드에서 다루지 않으므로 기존 것을 유지
+        with gallery_store.batch() as batch:
+            batch.replace_all(persons_cache, {"base": gallery_base_cache, "masked": gallery_masked_cache,
+                                              "dynamic": dict(gallery_store.snapshot().banks["dynamic"]),
+                                              "dynamic_angles": dict(gallery_store.snapshot().banks["dynamic_angles"]),
+                                              "centroid": {pid: person_centroids(bank) for pid, bank in gallery_base_cache.items()}})
         print(f"📂 레거시 파일 로딩 완료 ({len(persons_cache)}명, Legacy 모드)\n")
         
     except Exception as e:
@@ -326,8 +614,5 @@ def load_persons_from_legacy_files():
 
     
 def find_person_info(person_id: str) -> Optional[Dict]:
-    """person_id로 인물 정보 찾기"""
-    for person in persons_cache:
-        if person["id"] == person_id:
-            return person
-    return None
\ No newline at end of file
+    """person_id로 인물 정보 찾기 (O(1))"""
+    return person_directory.get(person_id)
\ No newline at end of file
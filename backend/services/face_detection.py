@@ -2,7 +2,7 @@
 """
 얼굴 감지 및 인식 핵심 서비스
 """
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import numpy as np
 from sqlalchemy.orm import Session
 
@@ -12,7 +12,6 @@ from backend.services.data_loader import find_person_info
 
 # Image and bbox utilities  
 from backend.utils.image_utils import (
-    l2_normalize,
     preprocess_image_for_detection,
     compute_cosine_similarity,
     estimate_face_angle,
@@ -25,10 +24,10 @@ from backend.utils.bbox_utils import (
 )
 
 # Bank manager functions
-from backend.services.bank_manager import (
-    match_with_bank_detailed,
-    update_gallery_cache_in_memory
-)
+from backend.services.bank_manager import update_gallery_cache_in_memory
+from backend.services.gallery_index import normalize_rows
+from backend.services.candidate_pruning import match_tables
+from backend.utils.model_profile import get_faces_multi
 
 # Database functions
 from backend.database import log_detection
@@ -50,7 +49,76 @@ def set_model(face_model):
 
 
 
-def process_detection(frame: np.ndarray, suspect_id: Optional[str] = None, suspect_ids: Optional[List[str]] = None, db: Optional[Session] = None, tracking_state: Optional[Dict] = None) -> Dict:
+def detect_faces_in_frames(frames: List[np.ndarray],
+                           det_sizes: Optional[List[Optional[Tuple[int, int]]]] = None,
+                           rois: Optional[List[Optional[List[Tuple[int, int, int, int]]]]] = None,
+                           rec_caches: Optional[List] = None,
+                           preprocessors: Optional[List] = None,
+                           sources: Optional[List] = None) -> List[Tuple[List, Tuple[int, int]]]:
+    """
+    여러 프레임의 전처리 + 얼굴 탐지/특징 추출 (inference 단계만)
+    
+    프레임별로 detection을 실행하고, 모든 프레임의 얼굴은 recognition 한 배치로 처리합니다.
+    결과는 process_detection(..., detected=...)에 그대로 넘길 수 있습니다.
+    
+    Args:
+        frames: BGR 프레임 리스트
+        det_sizes: 프레임별 detection 입력 크기 (스트림별 적응형 크기, None이면 기본 크기)
+        rois: 프레임별 탐지 영역 (전처리된 프레임 좌표, None이면 전체 프레임 - RoiDetectionPlanner)
+        rec_caches: 프레임별 RecognitionCache (스트림별 임베딩 재사용, None이면 모든 얼굴 recognition)
+        preprocessors: 프레임별 FramePreprocessor (스트림별 조건부 전처리, None이면 preprocess_image_for_detection)
+        sources: 프레임별 ScaledFrame (축소 디코딩한 프레임, None이면 frame이 원본)
+                 축소 디코딩은 원본이 전처리 대상이 아닌 큰 프레임에만 하므로 전처리 없이 그대로 detection에 넣고,
+                 작은 얼굴은 원본 해상도에서 recognition 정렬
+    
+    Returns:
+        프레임별 (faces, (processed_height, processed_width)) - frames와 같은 순서
+    """
+    if preprocessors is None:
+        preprocessors = [None] * len(frames)
+    if sources is None:
+        sources = [None] * len(frames)
+    processed_frames = [
+        frame if source is not None and source.reduced
+        else preprocessor.process(frame) if preprocessor is not None
+        else preprocess_image_for_detection(frame, min_size=640)
+        for frame, preprocessor, source in zip(frames, preprocessors, sources)
+    ]
+    faces_per_frame = get_faces_multi(model, processed_frames, det_sizes=det_sizes, rois=rois, rec_caches=rec_caches,
+                                      sources=sources)
+    return [(faces, processed.shape[:2]) for faces, processed in zip(faces_per_frame, processed_frames)]
+
+
+def describe_faces(faces: List, scale_x: float, scale_y: float) -> Tuple[List[np.ndarray], List, List[bool]]:
+    """
+    얼굴별 박스(원본 좌표) / 각도 / 가림 여부
+    
+    가림 여부는 랜드마크(face.kps)와 같은 좌표계인 전처리된(축소 디코딩된) 프레임의 박스로 판단하므로
+    scale_x / scale_y(원본 / 전처리 크기)와 무관합니다.
+    
+    Returns:
+        (face_boxes, face_angles, face_clear) - faces와 같은 순서
+    """
+    face_boxes = []
+    face_angles = []
+    face_clear = []
+    for face in faces:
+        # 전처리된 이미지의 좌표를 원본 이미지 좌표로 변환
+        box = face.bbox.astype(float)
+        box[0] *= scale_x  # x1
+        box[1] *= scale_y  # y1
+        box[2] *= scale_x  # x2
+        box[3] *= scale_y  # y2
+        box = box.astype(int)
+        face_boxes.append(box)
+        face_angles.append(estimate_face_angle(face))
+        face_clear.append(check_face_occlusion(face, face.bbox))
+    return face_boxes, face_angles, face_clear
+
+
+def process_detection(frame: np.ndarray, suspect_id: Optional[str] = None, suspect_ids: Optional[List[str]] = None, db: Optional[Session] = None, tracking_state: Optional[Dict] = None,
+                      detected: Optional[Tuple[List, Tuple[int, int]]] = None,
+                      recognition_cache=None, frame_shape: Optional[Tuple[int, int]] = None) -> Dict:
     """
     공통 얼굴 감지 및 인식 로직
     
@@ -60,6 +128,9 @@ def process_detection(frame: np.ndarray, suspect_id: Optional[str] = None, suspe
         suspect_ids: 선택적 타겟 ID 배열 (여러 명 선택 시)
         db: 데이터베이스 세션 (로그 저장용, None이면 로그 저장 안함)
         tracking_state: bbox tracking 상태 (None이면 자동 생성)
+        detected: detect_faces_in_frames()의 이 프레임 결과 (inference 서버에서 미리 계산한 경우)
+        recognition_cache: detected를 만들 때 쓴 스트림의 RecognitionCache (재사용 얼굴의 매칭 결과 재사용)
+        frame_shape: frame이 축소 디코딩된 경우 원본 (height, width) - 박스 좌표를 원본 기준으로 반환
     
     Returns:
         {
@@ -79,16 +150,16 @@ def process_detection(frame: np.ndarray, suspect_id: Optional[str] = None, suspe
         }
     
     # 1. 저화질 영상 전처리 (업스케일링 및 샤프닝)
-    original_height, original_width = frame.shape[:2]
-    processed_frame = preprocess_image_for_detection(frame, min_size=640)
-    processed_height, processed_width = processed_frame.shape[:2]
+    # 2. InsightFace로 얼굴 탐지 및 특징 추출 (전처리된 이미지 사용)
+    # (recognition은 프레임의 모든 얼굴을 한 번의 session.run으로 배치 실행)
+    if detected is None:
+        detected = detect_faces_in_frames([frame])[0]
+    faces, (processed_height, processed_width) = detected
+    original_height, original_width = frame_shape if frame_shape is not None else frame.shape[:2]
     
     # 스케일 비율 계산 (박스 좌표 변환용)
     scale_x = original_width / processed_width
     scale_y = original_height / processed_height
-
-    # 2. InsightFace로 얼굴 탐지 및 특징 추출 (전처리된 이미지 사용)
-    faces = model.get(processed_frame)
     
     # 얼굴 감지 개수 로그 출력 (디버깅용)
     print(f"🔍 [얼굴 감지] 감지된 얼굴 개수: {len(faces)}")
@@ -102,24 +173,56 @@ def process_detection(frame: np.ndarray, suspect_id: Optional[str] = None, suspe
     detections = []  # 박스 좌표 및 메타데이터 배열
     learning_events = []  # 학습 이벤트 (UI 피드백용)
 
+    # 선택된 용의자들만 포함한 base/masked/dynamic(+centroid) 인덱스 (용의자 집합별 캐시 공유)
+    if suspect_ids:
+        suspect_indexes = data_loader.get_suspect_indexes(suspect_ids)
+        target_base_index, target_masked_index, target_dynamic_index, _ = suspect_indexes
+    
+    # 프레임의 모든 얼굴 임베딩을 (F, 512) 행렬로 쌓아서 한 번만 정규화
+    if len(faces) > 0:
+        face_embeddings = normalize_rows(np.stack([face.embedding for face in faces]))
+    else:
+        face_embeddings = np.empty((0, 512), dtype=np.float32)
+    
+    # 얼굴별 박스(원본 좌표) / 각도 / 가림 여부를 매칭 전에 한 번만 계산
+    # (각도 분할 dynamic 매칭, 가려진 얼굴만 masked 매칭에 사용)
+    face_boxes, face_angles, face_clear = describe_faces(faces, scale_x, scale_y)
+    
+    # bank별 한 번의 행렬곱으로 얼굴별 (best, second) 결과 테이블 생성
+    # (용의자가 많으면 centroid로 후보를 먼저 추린 뒤 후보만 비교)
+    # (임베딩을 재사용한 얼굴은 같은 인덱스에 대한 직전 매칭 결과를 그대로 사용)
+    if suspect_ids and len(faces) > 0:
+        if recognition_cache is not None:
+            match_rows = recognition_cache.cached_matches(suspect_indexes)
+        else:
+            match_rows = [None] * len(faces)
+        pending = [i for i, row in enumerate(match_rows) if row is None]
+        if pending:
+            tables = match_tables(
+                face_embeddings[pending], suspect_indexes,
+                angle_types=[face_angles[i][0] for i in pending],
+                occluded=[not face_clear[i] for i in pending],
+            )
+            for j, i in enumerate(pending):
+                match_rows[i] = (tables[0][j], tables[1][j], tables[2][j])
+        if recognition_cache is not None:
+            recognition_cache.store_matches(suspect_indexes, match_rows)
+        base_match_table = [row[0] for row in match_rows]
+        masked_match_table = [row[1] for row in match_rows]
+        dynamic_match_table = [row[2] for row in match_rows]
+    
     # 3. 먼저 모든 얼굴에 대해 매칭 결과 수집 (오인식 방지 필터링을 위해)
     face_results = []
     face_objects = []  # face 객체를 인덱스로 매핑하여 저장 (Dynamic Bank 검증용)
-    for face in faces:
-        # 바운딩 박스 좌표 (정수형 변환)
-        # 전처리된 이미지의 좌표를 원본 이미지 좌표로 변환
-        box = face.bbox.astype(float)
-        box[0] *= scale_x  # x1
-        box[1] *= scale_y  # y1
-        box[2] *= scale_x  # x2
-        box[3] *= scale_y  # y2
-        box = box.astype(int)
+    for face_idx, face in enumerate(faces):
+        # 바운딩 박스 좌표 (원본 이미지 좌표, 정수형)
+        box = face_boxes[face_idx]
         
         embedding = face.embedding.astype("float32")
-        embedding_normalized = l2_normalize(embedding)
+        embedding_normalized = face_embeddings[face_idx]
         
-        # 얼굴 각도 추정
-        angle_type, yaw_angle = estimate_face_angle(face)
+        # 얼굴 각도 추정 (매칭 전에 계산한 결과)
+        angle_type, yaw_angle = face_angles[face_idx]
         
         # 화질 추정
         face_quality = estimate_face_quality(box, (original_height, original_width))
@@ -141,32 +244,13 @@ def process_detection(frame: np.ndarray, suspect_id: Optional[str] = None, suspe
         
         # suspect_ids가 지정된 경우: 선택된 용의자들만 검색 (전체 DB 검색 안 함)
         if suspect_ids and len(suspect_ids) > 0:
-            # 선택된 용의자들만 포함한 base/masked/dynamic 갤러리 생성
-            target_base_gallery = {}
-            target_masked_gallery = {}
-            target_dynamic_gallery = {}
-            for sid in suspect_ids:
-                if sid in data_loader.gallery_base_cache:
-                    target_base_gallery[sid] = data_loader.gallery_base_cache[sid]
-                if sid in data_loader.gallery_masked_cache:
-                    target_masked_gallery[sid] = data_loader.gallery_masked_cache[sid]
-                if sid in data_loader.gallery_dynamic_cache:
-                    target_dynamic_gallery[sid] = data_loader.gallery_dynamic_cache[sid]
-            
-            # Base Bank 매칭
-            if target_base_gallery:
-                best_base_person_id, base_sim, second_base_sim = match_with_bank_detailed(embedding, target_base_gallery)
-            
-            # Masked Bank 매칭
-            if target_masked_gallery:
-                best_mask_person_id, masked_sim, second_mask_sim = match_with_bank_detailed(embedding, target_masked_gallery)
-            
-            # Dynamic Bank 매칭 (인식용)
-            if target_dynamic_gallery:
-                best_dynamic_person_id, dynamic_sim, second_dynamic_sim = match_with_bank_detailed(embedding, target_dynamic_gallery)
+            # Base / Masked / Dynamic Bank 매칭 결과 (프레임 배치 테이블에서 조회)
+            best_base_person_id, base_sim, second_base_sim = base_match_table[face_idx]
+            best_mask_person_id, masked_sim, second_mask_sim = masked_match_table[face_idx]
+            best_dynamic_person_id, dynamic_sim, second_dynamic_sim = dynamic_match_table[face_idx]
             
             # 디버깅: 갤러리 상태 확인
-            print(f"   📊 [GALLERY] base={len(target_base_gallery)}, masked={len(target_masked_gallery)}, dynamic={len(target_dynamic_gallery)}")
+            print(f"   📊 [GALLERY] base={len(target_base_index)}, masked={len(target_masked_index)}, dynamic={len(target_dynamic_index)}")
         
         # suspect_ids가 없거나 비어있는 경우: 매칭 시도하지 않음 (모든 얼굴을 unknown으로 처리)
         else:
@@ -196,7 +280,7 @@ def process_detection(frame: np.ndarray, suspect_id: Optional[str] = None, suspe
         # 주의: check_face_occlusion 반환값
         #   True = occlusion 없음 (얼굴 전체 보임, 마스크 없음)
         #   False = occlusion 있음 (얼굴 가려짐, 마스크 있음)
-        is_face_clear = check_face_occlusion(face, box)
+        is_face_clear = face_clear[face_idx]
         is_masked = not is_face_clear  # 가려지지 않으면 마스크 없음
         
         # mask_prob는 이제 실제 occlusion 결과에 기반
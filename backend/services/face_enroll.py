@@ -8,6 +8,8 @@ import numpy as np
 from pathlib import Path
 from typing import Optional, List
 
+from backend.utils.embedding_tag import write_tag
+
 IMG_EXTS = {".jpg", ".jpeg", ".png", ".bmp"}
 
 
@@ -103,6 +105,7 @@ def save_embeddings(person_id: str, emb_list: List[np.ndarray], out_dir: Path,
         # bank_base.npy 저장
         bank_base_path = person_dir / "bank_base.npy"
         np.save(bank_base_path, embs)
+        write_tag(person_dir)  # 임베딩을 만든 모델 기록
         print(f"     Base Bank 저장: {bank_base_path} ({embs.shape[0]}개 임베딩)")
         
         # Backward compatibility
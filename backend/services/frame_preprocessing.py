@@ -0,0 +1,110 @@
+# backend/services/frame_preprocessing.py
+"""
+스트림별 조건부 프레임 전처리
+
+기존 preprocess_image_for_detection은 짧은 변이 640 미만인 모든 프레임을 LANCZOS4로 업스케일하고
+샤프닝 + LAB 변환 + CLAHE를 적용한 뒤, detector가 곧바로 다시 640으로 줄입니다.
+여기서는:
+- 프레임이 detector 입력(INSIGHTFACE_DET_SIZE)보다 작을 때만 detector 입력 크기에 맞춰 INTER_LINEAR로 키움
+  (그 이상으로 키운 사본은 만들지 않고, 큰 프레임은 원본 그대로 detector에 넘김)
+- PREPROC_STATS_INTERVAL 프레임마다 밝기 평균 / 표준편차와 Laplacian 분산(선명도)을 계산해 캐시하고,
+  어두운 / 대비가 낮은 스트림만 CLAHE, 흐린 스트림만 샤프닝 적용 (밝고 선명한 스트림은 보정 없음)
+- 보정은 기존 전처리가 적용되던 프레임(짧은 변 ENHANCE_MAX_SHORT_SIDE 미만)에만 적용
+  (큰 프레임은 원본 해상도 보정 비용이 커서 기존처럼 그대로 사용)
+- 샤프닝 커널과 CLAHE 객체는 재사용 (backend/utils/image_utils.py)
+
+크기 결정은 통계와 관계없이 프레임 크기로만 하므로 같은 스트림의 전처리된 프레임 크기는 일정합니다
+(ROI detection / 임베딩 재사용 캐시의 좌표 기준이 바뀌지 않음).
+"""
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from backend.config import (
+    INSIGHTFACE_DET_SIZE, PREPROC_STATS_INTERVAL, PREPROC_DARK_THRESHOLD, PREPROC_CONTRAST_THRESHOLD,
+    PREPROC_BLUR_THRESHOLD,
+)
+from backend.utils.image_utils import sharpen_image, enhance_contrast
+
+ENHANCE_MAX_SHORT_SIDE = 640  # preprocess_image_for_detection의 min_size와 같은 기준
+
+
+def fit_to_detector(shape: Tuple[int, int], det_size: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """프레임이 detector 입력보다 작으면 비율을 유지해 맞춘 (width, height), 아니면 None"""
+    height, width = shape[:2]
+    scale = min(det_size[0] / width, det_size[1] / height)
+    if scale <= 1.0:
+        return None
+    return int(round(width * scale)), int(round(height * scale))
+
+
+def frame_statistics(image: np.ndarray, det_size: Tuple[int, int]) -> Dict[str, float]:
+    """밝기 평균 / 표준편차, Laplacian 분산 (detector 입력 크기 기준으로 계산해서 프레임 크기와 무관하게 비교)"""
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    scale = min(det_size[0] / gray.shape[1], det_size[1] / gray.shape[0])
+    if scale < 1.0:
+        gray = cv2.resize(gray, (int(gray.shape[1] * scale), int(gray.shape[0] * scale)), interpolation=cv2.INTER_AREA)
+    mean, std = cv2.meanStdDev(gray)
+    return {
+        "brightness": float(mean[0][0]),
+        "contrast": float(std[0][0]),
+        "blur": float(cv2.Laplacian(gray, cv2.CV_64F).var()),
+    }
+
+
+class FramePreprocessor:
+    """스트림 하나의 전처리 (통계 캐시 + 필요한 보정만 적용)"""
+
+    def __init__(self, det_size: Tuple[int, int] = INSIGHTFACE_DET_SIZE,
+                 stats_interval: int = PREPROC_STATS_INTERVAL,
+                 dark_threshold: float = PREPROC_DARK_THRESHOLD,
+                 contrast_threshold: float = PREPROC_CONTRAST_THRESHOLD,
+                 blur_threshold: float = PREPROC_BLUR_THRESHOLD):
+        self.det_size = tuple(det_size)
+        self.stats_interval = max(1, stats_interval)
+        self.dark_threshold = dark_threshold
+        self.contrast_threshold = contrast_threshold
+        self.blur_threshold = blur_threshold
+        self.stats: Optional[Dict[str, float]] = None  # 마지막으로 계산한 통계
+        self.apply_contrast = False
+        self.apply_sharpen = False
+        self._since_stats = 0
+        self.counts = {"frames": 0, "resized": 0, "contrast": 0, "sharpen": 0, "stats_updates": 0, "large_frames": 0}
+
+    def _update_stats(self, image: np.ndarray):
+        self.stats = frame_statistics(image, self.det_size)
+        self.apply_contrast = (self.stats["brightness"] < self.dark_threshold
+                               or self.stats["contrast"] < self.contrast_threshold)
+        self.apply_sharpen = self.stats["blur"] < self.blur_threshold
+        self.counts["stats_updates"] += 1
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """BGR 프레임 → detection / recognition에 넣을 이미지 (보정이 필요 없으면 원본 그대로)"""
+        size = fit_to_detector(frame.shape, self.det_size)
+        image = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR) if size is not None else frame
+        self.counts["frames"] += 1
+        if size is not None:
+            self.counts["resized"] += 1
+        if min(frame.shape[:2]) >= ENHANCE_MAX_SHORT_SIDE:
+            self.counts["large_frames"] += 1
+            return image
+        if self.stats is None or self._since_stats >= self.stats_interval:
+            self._update_stats(image)
+            self._since_stats = 0
+        self._since_stats += 1
+        if self.apply_sharpen:
+            image = sharpen_image(image)
+            self.counts["sharpen"] += 1
+        if self.apply_contrast:
+            image = enhance_contrast(image)
+            self.counts["contrast"] += 1
+        return image
+
+    def summary(self) -> Dict:
+        return {
+            **self.counts,
+            "stats": {key: round(value, 2) for key, value in self.stats.items()} if self.stats else None,
+            "apply_contrast": self.apply_contrast,
+            "apply_sharpen": self.apply_sharpen,
+        }
@@ -0,0 +1,401 @@
+# backend/services/gallery_index.py
+"""
+Packed Gallery Index (연속 메모리 기반 갤러리 매칭)
+
+{person_id: (N, 512) bank} 딕셔너리를 사람 단위로 순회하는 대신,
+bank 전체를 하나의 연속 float32 행렬로 묶어서 한 번의 GEMM으로 매칭합니다.
+
+구조:
+- matrix: (R, 512) float32, 모든 임베딩 (사람별로 연속 배치)
+- owners: (R,) int32, 각 행의 소유자 인덱스 (person_ids의 인덱스)
+- offsets: (P + 1,) int64, 사람별 행 시작 위치 (offsets[p] ~ offsets[p + 1])
+- person_ids: 길이 P의 person_id 리스트
+
+매칭:
+1. sims = queries @ matrix.T  (한 번의 GEMM)
+2. np.maximum.reduceat(sims, offsets[:-1])  (사람별 최대값 = segmented max)
+3. argpartition으로 best / second / top-k 선택
+
+압축 모드 (quantization="float16" / "int8"):
+- float32 행렬 대신 float16 코드 또는 행별 스케일 int8 코드만 보관 (2~4배 절감)
+- 1차 스캔은 코드로 근사 점수 계산 (블록 단위로 float32 변환 후 GEMM)
+- 근사 점수 상위 인물만 float32 원본 행으로 정확히 재채점
+- float32 원본 행은 메모리에 두지 않고 임시 파일에 packed 행렬로 써서 memmap으로 읽음
+  (재채점 후보 인물의 행만 페이지 캐시로 읽히므로 상주 메모리는 코드 크기 수준)
+"""
+import tempfile
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+UNKNOWN_ID = "unknown"
+
+QUANTIZATION_MODES = ("none", "float16", "int8")
+SCAN_BLOCK_ROWS = 8192  # 압축 코드를 float32로 풀어서 계산할 블록 크기 (캐시 상주)
+
+
+def _as_bank(data: np.ndarray) -> np.ndarray:
+    """1D/2D 임베딩을 (N, D) float32 bank로 변환"""
+    bank = np.asarray(data, dtype=np.float32)
+    if bank.ndim == 1:
+        bank = bank.reshape(1, -1)
+    return bank
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """(N, D) 또는 (D,) 벡터를 행 단위 L2 정규화 (float32)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        norm = np.linalg.norm(vectors)
+        return vectors / norm if norm > 0 else vectors
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def quantize_rows(vectors: np.ndarray, mode: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    (N, D) 임베딩을 압축 코드로 변환
+
+    Returns:
+        (codes, scales) - int8은 행별 스케일(max|x| / 127), float16은 scales=None
+    """
+    if mode == "float16":
+        return vectors.astype(np.float16), None
+    if mode == "int8":
+        scales = np.abs(vectors).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales.astype(np.float32)
+    raise ValueError(f"지원하지 않는 quantization 모드: {mode}")
+
+
+def _rerank_store(banks: List[np.ndarray], num_rows: int, dim: int,
+                  rerank_dir: Optional[str] = None) -> np.ndarray:
+    """
+    압축 모드 재채점용 float32 packed 행렬을 임시 파일에 쓰고 읽기 전용 memmap으로 반환
+
+    파일은 만들자마자 삭제된 상태(TemporaryFile)라 memmap이 사라지면 디스크 공간도 회수됩니다.
+    """
+    with tempfile.TemporaryFile(dir=rerank_dir or None) as fh:
+        rows = np.memmap(fh, dtype=np.float32, mode="w+", shape=(num_rows, dim))
+        start = 0
+        for bank in banks:
+            rows[start:start + bank.shape[0]] = bank
+            start += bank.shape[0]
+        rows.flush()
+        del rows
+        return np.memmap(fh, dtype=np.float32, mode="r", shape=(num_rows, dim))
+
+
+def person_centroids(*banks: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """
+    bank별 centroid(평균 후 L2 정규화)를 쌓은 (K, D) 배열 (비어있는 bank는 제외)
+
+    이미 저장된 centroid 벡터(1D, centroid_base.npy 등)를 넘기면 정규화만 해서 사용합니다.
+    """
+    rows = []
+    for bank in banks:
+        if bank is None:
+            continue
+        bank = _as_bank(bank)
+        if bank.shape[0] == 0:
+            continue
+        rows.append(normalize_rows(bank.mean(axis=0)))
+    return np.stack(rows) if rows else None
+
+
+class GalleryIndex:
+    """
+    하나의 bank(base/masked/dynamic)를 연속 행렬로 묶은 검색 인덱스
+
+    인덱스는 생성 후 수정하지 않습니다 (bank가 바뀌면 새로 생성).
+    """
+
+    def __init__(self, matrix: Optional[np.ndarray], owners: np.ndarray,
+                 offsets: np.ndarray, person_ids: List[str],
+                 quantization: str = "none", codes: Optional[np.ndarray] = None,
+                 scales: Optional[np.ndarray] = None,
+                 rerank_rows: Optional[np.ndarray] = None,
+                 rerank_persons: int = 8, rerank_dir: Optional[str] = None):
+        self.matrix = matrix
+        self.owners = owners
+        self.offsets = offsets
+        self.person_ids = person_ids
+        self.quantization = quantization
+        self.codes = codes
+        self.scales = scales
+        self.rerank_persons = rerank_persons
+        self.rerank_dir = rerank_dir
+        self._rerank_rows = rerank_rows  # 압축 모드 재채점용 (R, 512) float32 memmap (디스크)
+        self._positions = {pid: i for i, pid in enumerate(person_ids)}
+
+    @classmethod
+    def from_gallery(cls, gallery: Dict[str, np.ndarray],
+                     person_ids: Optional[List[str]] = None,
+                     quantization: str = "none",
+                     rerank_persons: int = 8,
+                     rerank_dir: Optional[str] = None) -> "GalleryIndex":
+        """
+        {person_id: bank} 딕셔너리로부터 인덱스 생성
+
+        Args:
+            gallery: {person_id: (N, 512) 또는 (512,) 배열}
+            person_ids: 포함할 person_id 목록 (None이면 전체, 순서 유지)
+            quantization: "none" (float32), "float16", "int8"
+            rerank_persons: 압축 모드에서 float32로 재채점할 후보 인물 수
+            rerank_dir: 압축 모드 재채점용 float32 행을 둘 디렉터리 (None이면 시스템 임시 디렉터리)
+
+        Returns:
+            GalleryIndex (빈 bank를 가진 인물은 제외)
+        """
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"지원하지 않는 quantization 모드: {quantization}")
+        if person_ids is None:
+            person_ids = list(gallery.keys())
+
+        banks = []
+        kept_ids = []
+        for pid in person_ids:
+            data = gallery.get(pid)
+            if data is None:
+                continue
+            bank = _as_bank(data)
+            if bank.shape[0] == 0:
+                continue
+            banks.append(bank)
+            kept_ids.append(pid)
+
+        if not banks:
+            return cls.empty()
+
+        counts = np.array([b.shape[0] for b in banks], dtype=np.int64)
+        offsets = np.zeros(len(banks) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        owners = np.repeat(np.arange(len(banks), dtype=np.int32), counts)
+
+        if quantization == "none":
+            matrix = np.ascontiguousarray(np.vstack(banks), dtype=np.float32)
+            return cls(matrix, owners, offsets, kept_ids)
+
+        # 압축 모드: 인물별로 양자화 (float32 packed 행렬은 메모리에 만들지 않음)
+        code_parts, scale_parts = [], []
+        for bank in banks:
+            codes, scales = quantize_rows(bank, quantization)
+            code_parts.append(codes)
+            if scales is not None:
+                scale_parts.append(scales)
+        codes = np.ascontiguousarray(np.vstack(code_parts))
+        scales = np.concatenate(scale_parts) if scale_parts else None
+        rerank_rows = _rerank_store(banks, int(offsets[-1]), codes.shape[1], rerank_dir)
+        return cls(None, owners, offsets, kept_ids, quantization=quantization,
+                   codes=codes, scales=scales, rerank_rows=rerank_rows,
+                   rerank_persons=rerank_persons, rerank_dir=rerank_dir)
+
+    @classmethod
+    def empty(cls, dim: int = 512) -> "GalleryIndex":
+        """빈 인덱스"""
+        return cls(np.empty((0, dim), dtype=np.float32),
+                   np.empty(0, dtype=np.int32),
+                   np.zeros(1, dtype=np.int64),
+                   [])
+
+    def __len__(self) -> int:
+        """등록된 인물 수"""
+        return len(self.person_ids)
+
+    def __contains__(self, person_id: str) -> bool:
+        return person_id in self._positions
+
+    @property
+    def dim(self) -> int:
+        return int((self.matrix if self.matrix is not None else self.codes).shape[1])
+
+    @property
+    def num_rows(self) -> int:
+        """전체 임베딩 수"""
+        return int(self.offsets[-1])
+
+    @property
+    def nbytes(self) -> int:
+        """상주 메모리 크기 (스캔용 행렬 또는 압축 코드 + 스케일, owners, offsets)"""
+        scan = self.matrix if self.matrix is not None else self.codes
+        extra = self.scales.nbytes if self.scales is not None else 0
+        return int(scan.nbytes + extra + self.owners.nbytes + self.offsets.nbytes)
+
+    @property
+    def rerank_nbytes(self) -> int:
+        """압축 모드 재채점용 float32 행의 디스크(memmap) 크기 - 상주 메모리에는 포함되지 않음"""
+        return int(self._rerank_rows.nbytes) if self._rerank_rows is not None else 0
+
+    def _person_rows(self, pos: int) -> np.ndarray:
+        """인물 위치의 float32 행 (float32 모드는 matrix, 압축 모드는 재채점용 memmap)"""
+        rows = self.matrix if self.matrix is not None else self._rerank_rows
+        return rows[self.offsets[pos]:self.offsets[pos + 1]]
+
+    def bank(self, person_id: str) -> Optional[np.ndarray]:
+        """person_id의 bank (float32 모드는 matrix의 view, 압축 모드는 재채점용 memmap의 view)"""
+        pos = self._positions.get(person_id)
+        if pos is None:
+            return None
+        return self._person_rows(pos)
+
+    def subset(self, person_ids: List[str]) -> "GalleryIndex":
+        """
+        일부 인물만 포함한 인덱스 생성 (용의자 모드용)
+
+        행 슬라이스만 복사하므로 원본 딕셔너리에서 다시 묶는 것보다 저렴합니다.
+        """
+        banks = {}
+        for pid in person_ids:
+            bank = self.bank(pid)
+            if bank is not None:
+                banks[pid] = bank
+        return GalleryIndex.from_gallery(banks, [pid for pid in person_ids if pid in banks],
+                                         quantization=self.quantization,
+                                         rerank_persons=self.rerank_persons,
+                                         rerank_dir=self.rerank_dir)
+
+    def _row_scores(self, queries: np.ndarray) -> np.ndarray:
+        """(F, R) 행별 유사도 - float32는 GEMM 한 번, 압축 모드는 블록 단위 근사값"""
+        if self.matrix is not None:
+            return queries @ self.matrix.T
+        sims = np.empty((queries.shape[0], self.num_rows), dtype=np.float32)
+        for start in range(0, self.num_rows, SCAN_BLOCK_ROWS):
+            block = self.codes[start:start + SCAN_BLOCK_ROWS].astype(np.float32)
+            sims[:, start:start + block.shape[0]] = queries @ block.T
+        if self.scales is not None:
+            sims *= self.scales
+        return sims
+
+    def person_scores(self, queries: np.ndarray) -> np.ndarray:
+        """
+        사람별 최대 유사도 계산 (압축 모드에서는 근사값)
+
+        Args:
+            queries: (F, 512) L2 정규화된 쿼리 임베딩
+
+        Returns:
+            (F, P) 사람별 최대 코사인 유사도
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries.reshape(1, -1)
+        if len(self) == 0:
+            return np.empty((queries.shape[0], 0), dtype=np.float32)
+        sims = self._row_scores(queries)  # (F, R) - 한 번의 GEMM
+        return np.maximum.reduceat(sims, self.offsets[:-1], axis=1)
+
+    def _rerank(self, queries: np.ndarray, approx: np.ndarray) -> List[Tuple[str, float, float]]:
+        """압축 모드: 근사 점수 상위 인물만 float32 원본 행(memmap)으로 정확히 재채점"""
+        num_candidates = min(max(self.rerank_persons, 2), len(self))
+        candidates = np.argpartition(-approx, num_candidates - 1, axis=1)[:, :num_candidates]
+        results = []
+        for f in range(queries.shape[0]):
+            exact = sorted(
+                ((float((self._person_rows(p) @ queries[f]).max()), int(p)) for p in candidates[f]),
+                reverse=True,
+            )
+            second = exact[1][0] if len(exact) > 1 else 0.0
+            results.append((self.person_ids[exact[0][1]], exact[0][0], second))
+        return results
+
+    def match_candidates(self, query: np.ndarray, person_ids: List[str]) -> Tuple[str, float, float]:
+        """
+        후보 인물들의 행만 정확히 비교 (coarse-to-fine 2단계 매칭용)
+
+        Args:
+            query: (512,) L2 정규화된 임베딩
+            person_ids: 후보 person_id 목록 (인덱스에 없는 인물은 무시)
+
+        Returns:
+            (best_person_id, best_sim, second_sim) - 후보 안에서의 best / second
+        """
+        positions = [self._positions[pid] for pid in person_ids if pid in self._positions]
+        if not positions:
+            return UNKNOWN_ID, 0.0, 0.0
+        if self._rerank_rows is not None:
+            scores = np.array([float((self._person_rows(p) @ query).max()) for p in positions],
+                              dtype=np.float32)
+        else:
+            rows = np.concatenate([np.arange(self.offsets[p], self.offsets[p + 1]) for p in positions])
+            counts = np.array([self.offsets[p + 1] - self.offsets[p] for p in positions])
+            segments = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            scores = np.maximum.reduceat(self.matrix[rows] @ query, segments)
+        order = np.argsort(-scores)[:2]
+        second = float(scores[order[1]]) if order.shape[0] > 1 else 0.0
+        return self.person_ids[positions[order[0]]], float(scores[order[0]]), second
+
+    def search(self, query: np.ndarray, normalized: bool = False) -> Tuple[str, float, float]:
+        """
+        단일 쿼리 매칭
+
+        Args:
+            query: (512,) 임베딩
+            normalized: True면 이미 L2 정규화된 것으로 간주
+
+        Returns:
+            (best_person_id, best_sim, second_sim) - 기존 match_with_bank_detailed와 동일
+        """
+        if len(self) == 0:
+            return UNKNOWN_ID, 0.0, 0.0
+        if not normalized:
+            query = normalize_rows(query)
+        return self.match_batch(query)[0]
+
+    def match_batch(self, queries: np.ndarray) -> List[Tuple[str, float, float]]:
+        """
+        여러 얼굴을 한 번에 매칭 (프레임 단위 배치)
+
+        Args:
+            queries: (F, 512) L2 정규화된 임베딩
+
+        Returns:
+            [(best_person_id, best_sim, second_sim), ...] 길이 F
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if len(self) == 0:
+            return [(UNKNOWN_ID, 0.0, 0.0)] * queries.shape[0]
+        scores = self.person_scores(queries)
+        if self._rerank_rows is not None:
+            return self._rerank(queries, scores)
+        return self.best_and_second(scores)
+
+    def topk(self, query: np.ndarray, k: int = 5, normalized: bool = False) -> List[Tuple[str, float]]:
+        """
+        단일 쿼리의 상위 k명 (압축 모드에서는 근사 점수 기준)
+
+        Returns:
+            [(person_id, sim), ...] 유사도 내림차순
+        """
+        if len(self) == 0:
+            return []
+        if not normalized:
+            query = normalize_rows(query)
+        scores = self.person_scores(query)[0]
+        k = min(k, scores.shape[0])
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.person_ids[i], float(scores[i])) for i in top]
+
+    def best_and_second(self, scores: np.ndarray) -> List[Tuple[str, float, float]]:
+        """
+        (F, P) 사람별 점수에서 각 쿼리의 best / second 추출
+
+        Returns:
+            [(best_person_id, best_sim, second_sim), ...] 길이 F
+        """
+        num_persons = scores.shape[1]
+        if num_persons == 0:
+            return [(UNKNOWN_ID, 0.0, 0.0)] * scores.shape[0]
+        if num_persons == 1:
+            return [(self.person_ids[0], float(s), 0.0) for s in scores[:, 0]]
+
+        top = np.argpartition(-scores, 1, axis=1)[:, :2]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        return [
+            (self.person_ids[int(top[f, 0])], float(top_scores[f, 0]), float(top_scores[f, 1]))
+            for f in range(scores.shape[0])
+        ]
@@ -0,0 +1,208 @@
+# backend/services/gallery_store.py
+"""
+Gallery Store (버전 스냅샷 기반 단일 갤러리 저장소)
+
+인물 정보와 base/masked/dynamic bank(+ 인물별 centroid)를 하나의 불변 스냅샷으로 묶어서 보관합니다.
+
+- 읽기: gallery_store.snapshot()으로 현재 스냅샷을 잡고 그대로 사용 (락 없음)
+  스냅샷은 생성 후 수정되지 않으므로 매칭 도중 등록/삭제가 일어나도 안전합니다.
+- 쓰기: with gallery_store.batch() as batch: ... 안에서 변경을 모은 뒤
+  블록이 끝날 때 새 스냅샷 하나로 교체 (copy-on-write, 참조 교체는 원자적)
+  중첩된 batch()는 바깥 batch에 합쳐져서 스냅샷이 한 번만 발행됩니다.
+
+모듈 전역 dict를 이름으로 import하면 재로딩 후 옛 dict를 보게 되므로,
+모든 모듈은 항상 gallery_store를 통해 현재 스냅샷에 접근해야 합니다.
+"""
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional, Set
+import numpy as np
+
+# centroid: 인물별 bank centroid (2단계 매칭의 1차 후보 선별용)
+# dynamic_angles: dynamic bank 행별 각도 코드 (angles_dynamic.json, angle_partition.encode_angles)
+BANK_TYPES = ("base", "masked", "dynamic", "centroid", "dynamic_angles")
+
+
+class GallerySnapshot:
+    """
+    특정 시점의 갤러리 (불변)
+
+    Attributes:
+        version: 스냅샷 버전 (발행할 때마다 1씩 증가)
+        epoch: 전체 재로딩 횟수
+        persons: 인물 정보 dict 튜플 (persons_cache 호환 형식)
+        persons_by_id: {person_id: 인물 정보} 읽기 전용 매핑 (O(1) 조회)
+        banks: {bank_type: {person_id: (N, 512) bank}} 읽기 전용 매핑
+        person_versions: {person_id: 해당 인물이 마지막으로 바뀐 version}
+    """
+
+    __slots__ = ("version", "epoch", "persons", "persons_by_id", "banks", "person_versions",
+                 "_person_dict", "_bank_dicts")
+
+    def __init__(self, version: int, epoch: int, persons: Dict[str, Dict],
+                 banks: Dict[str, Dict[str, np.ndarray]], person_versions: Dict[str, int],
+                 persons_tuple: Optional[tuple] = None):
+        self.version = version
+        self.epoch = epoch
+        self._person_dict = persons
+        self.persons = persons_tuple if persons_tuple is not None else tuple(persons.values())
+        self.persons_by_id = MappingProxyType(persons)
+        self._bank_dicts = banks  # 다음 스냅샷이 바뀌지 않은 bank dict를 그대로 공유
+        self.banks = MappingProxyType({bt: MappingProxyType(banks[bt]) for bt in BANK_TYPES})
+        self.person_versions = MappingProxyType(person_versions)
+
+    @classmethod
+    def empty(cls) -> "GallerySnapshot":
+        return cls(0, 0, {}, {bt: {} for bt in BANK_TYPES}, {})
+
+    def person(self, person_id: str) -> Optional[Dict]:
+        return self.persons_by_id.get(person_id)
+
+    def bank(self, bank_type: str, person_id: str) -> Optional[np.ndarray]:
+        return self.banks[bank_type].get(person_id)
+
+
+class GalleryBatch:
+    """
+    다음 스냅샷에 반영할 변경 모음 (gallery_store.batch() 안에서만 사용)
+
+    처음 수정하는 bank 종류만 dict를 복사합니다 (copy-on-write).
+    """
+
+    def __init__(self, base: GallerySnapshot):
+        self._base = base
+        self._banks: Dict[str, Dict[str, np.ndarray]] = {}
+        self._persons: Optional[Dict[str, Dict]] = None
+        self.changed_ids: Set[str] = set()
+        self.full_reload = False
+
+    def _writable(self, bank_type: str) -> Dict[str, np.ndarray]:
+        if bank_type not in self._banks:
+            self._banks[bank_type] = dict(self._base.banks[bank_type])
+        return self._banks[bank_type]
+
+    def bank(self, bank_type: str, person_id: str) -> Optional[np.ndarray]:
+        """이 batch의 변경까지 반영된 bank 조회"""
+        if bank_type in self._banks:
+            return self._banks[bank_type].get(person_id)
+        return self._base.bank(bank_type, person_id)
+
+    def set_bank(self, bank_type: str, person_id: str, bank: Optional[np.ndarray]):
+        """bank 교체 (None 또는 빈 bank면 제거)"""
+        banks = self._writable(bank_type)
+        if bank is None or bank.shape[0] == 0:
+            if person_id not in banks:
+                return
+            del banks[person_id]
+        else:
+            banks[person_id] = bank
+        self.changed_ids.add(person_id)
+
+    def person(self, person_id: str) -> Optional[Dict]:
+        """이 batch의 변경까지 반영된 인물 정보 조회"""
+        if self._persons is not None:
+            return self._persons.get(person_id)
+        return self._base.person(person_id)
+
+    def set_person(self, person: Dict):
+        """인물 정보 추가/교체 (person["id"] 기준)"""
+        self._writable_persons()[person["id"]] = person
+        self.changed_ids.add(person["id"])
+
+    def remove_person(self, person_id: str):
+        """인물 정보와 모든 bank 제거"""
+        if self.person(person_id) is not None:
+            del self._writable_persons()[person_id]
+            self.changed_ids.add(person_id)
+        for bank_type in BANK_TYPES:
+            self.set_bank(bank_type, person_id, None)
+
+    def replace_all(self, persons: List[Dict], banks: Dict[str, Dict[str, np.ndarray]]):
+        """전체 재로딩 (모든 인물/bank 교체)"""
+        self._persons = {p["id"]: p for p in persons}
+        self._banks = {bt: dict(banks.get(bt, {})) for bt in BANK_TYPES}
+        self.full_reload = True
+
+    def _writable_persons(self) -> Dict[str, Dict]:
+        if self._persons is None:
+            self._persons = dict(self._base._person_dict)
+        return self._persons
+
+    @property
+    def changed(self) -> bool:
+        return self.full_reload or bool(self.changed_ids)
+
+
+class GalleryStore:
+    """갤러리 스냅샷을 발행하는 단일 저장소"""
+
+    def __init__(self):
+        self._snapshot = GallerySnapshot.empty()
+        self._write_lock = threading.RLock()
+        self._active_batch: Optional[GalleryBatch] = None
+        self._listeners: List[Callable[[GallerySnapshot, Optional[Set[str]]], None]] = []
+
+    def snapshot(self) -> GallerySnapshot:
+        """현재 스냅샷 (락 없이 읽음)"""
+        return self._snapshot
+
+    def subscribe(self, listener: Callable[[GallerySnapshot, Optional[Set[str]]], None]):
+        """
+        스냅샷 발행 알림 등록
+
+        listener(snapshot, changed_ids) - 전체 재로딩이면 changed_ids=None
+        """
+        self._listeners.append(listener)
+
+    @contextmanager
+    def batch(self):
+        """
+        쓰기 batch (블록이 정상 종료되면 변경을 새 스냅샷 하나로 발행)
+
+        사용 예시:
+            with gallery_store.batch() as batch:
+                batch.set_bank("dynamic", person_id, bank)
+        """
+        with self._write_lock:
+            if self._active_batch is not None:
+                # 중첩 호출: 바깥 batch에 합침
+                yield self._active_batch
+                return
+            batch = GalleryBatch(self._snapshot)
+            self._active_batch = batch
+            try:
+                yield batch
+            finally:
+                self._active_batch = None
+            if batch.changed:
+                self._publish(batch)
+
+    def _publish(self, batch: GalleryBatch):
+        current = self._snapshot
+        version = current.version + 1
+        banks = {bt: batch._banks.get(bt, current._bank_dicts[bt]) for bt in BANK_TYPES}
+
+        if batch.full_reload:
+            epoch = current.epoch + 1
+            person_versions = {pid: version for bt in BANK_TYPES for pid in banks[bt]}
+            changed_ids = None
+        else:
+            epoch = current.epoch
+            person_versions = dict(current.person_versions)
+            for pid in batch.changed_ids:
+                person_versions[pid] = version
+            changed_ids = set(batch.changed_ids)
+
+        if batch._persons is not None:
+            self._snapshot = GallerySnapshot(version, epoch, batch._persons, banks, person_versions)
+        else:
+            self._snapshot = GallerySnapshot(version, epoch, current._person_dict, banks, person_versions,
+                                             persons_tuple=current.persons)
+
+        for listener in self._listeners:
+            listener(self._snapshot, changed_ids)
+
+
+# 애플리케이션 전역 저장소 (모든 모듈이 이 인스턴스를 공유)
+gallery_store = GalleryStore()
@@ -0,0 +1,193 @@
+# backend/services/inference_server.py
+"""
+스트림 간 동적 배치 Inference 서버
+
+모든 /ws/detect 연결의 프레임을 하나의 asyncio 큐로 모아서
+micro-batch(최대 INFERENCE_MAX_BATCH장, 첫 프레임 이후 최대 INFERENCE_MAX_WAIT_MS 대기)로
+detection + recognition을 실행하고, 결과를 각 연결의 대기 중인 코루틴에 돌려줍니다.
+
+- inference는 전용 스레드(워커 수만큼)에서 실행되므로 이벤트 루프(다른 연결의 송수신)를 막지 않습니다.
+- 큐는 FIFO이고 배치는 워커들이 차례로 구성하며, 워커가 여러 개여도 결과는 배치 순서대로 돌려주므로
+  같은 스트림의 프레임 순서가 유지됩니다.
+- 예상 배치 크기는 최근 ACTIVE_PRODUCER_WINDOW_S 안에 프레임을 보낸 producer 수와 이미 큐에 쌓인 프레임 수 중 큰 값이며,
+  producer가 하나뿐이면 기다리지 않고 바로 실행합니다.
+  producer는 한 번에 한 프레임만 대기시킬 수 있는 단위(/ws/detect 연결 - 수신 루프가 프레임 처리를 기다림)이므로,
+  바이너리 프로토콜로 여러 stream_id를 보내는 연결도 하나로 셉니다.
+- 프레임마다 detection 입력 크기(스트림별 적응형 크기), 탐지 영역(트랙 주변 ROI),
+  스트림의 RecognitionCache(임베딩 재사용)와 FramePreprocessor(조건부 전처리),
+  축소 디코딩한 프레임의 ScaledFrame(작은 얼굴은 원본 해상도에서 recognition)을 함께 넘길 수 있습니다.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import INFERENCE_MAX_BATCH, INFERENCE_MAX_WAIT_MS, INFERENCE_WORKERS
+from backend.services.face_detection import detect_faces_in_frames
+
+ACTIVE_PRODUCER_WINDOW_S = 1.0  # 이 시간 안에 프레임을 보낸 producer만 예상 배치 크기에 포함
+
+
+class InferenceServer:
+    """프레임 → (faces, processed_shape) 동적 배치 처리기"""
+
+    def __init__(self, max_batch: int = INFERENCE_MAX_BATCH, max_wait_ms: float = INFERENCE_MAX_WAIT_MS,
+                 expected_batch: Optional[Callable[[], int]] = None,
+                 infer_fn: Callable[..., List] = detect_faces_in_frames,
+                 workers: int = INFERENCE_WORKERS):
+        """
+        Args:
+            max_batch: 한 배치의 최대 프레임 수
+            max_wait_ms: 첫 프레임 이후 다음 프레임을 기다리는 최대 시간
+            workers: 동시에 실행할 배치 수 (inference 스레드 수)
+            expected_batch: 현재 기대 배치 크기 - 이만큼 모이면 바로 실행 (None이면 최근 프레임을 보낸 producer 수)
+            infer_fn: (프레임 리스트, 프레임별 detection 입력 크기, ROI, RecognitionCache, FramePreprocessor, ScaledFrame)
+                      → 프레임별 결과 리스트
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.expected_batch = expected_batch
+        self.infer_fn = infer_fn
+        self.workers = max(1, workers)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._collect_lock: Optional[asyncio.Lock] = None
+        self._delivered: Optional[asyncio.Future] = None  # 직전 배치의 결과 전달 완료
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._producer_seen: Dict[int, float] = {}  # {producer: 마지막 제출 시각}
+        self.stats: Dict[str, float] = {"batches": 0, "frames": 0, "infer_ms": 0.0}
+
+    def configure(self, max_batch: Optional[int] = None, workers: Optional[int] = None):
+        """배치 크기 / 워커 수 변경 (auto-tuner 결과 적용, 서버 시작 전에 호출)"""
+        if max_batch is not None:
+            self.max_batch = max(1, max_batch)
+        if workers is not None:
+            self.workers = max(1, workers)
+
+    def _ensure_started(self):
+        if self._workers and not all(task.done() for task in self._workers):
+            return
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._collect_lock = asyncio.Lock()
+        self._delivered = loop.create_future()
+        self._delivered.set_result(None)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._workers = [loop.create_task(self._run()) for _ in range(self.workers)]
+
+    async def submit(self, frame: np.ndarray, det_size: Optional[Tuple[int, int]] = None,
+                     rois: Optional[List[Tuple[int, int, int, int]]] = None, rec_cache=None, preprocessor=None,
+                     source=None, producer: Optional[int] = None):
+        """
+        프레임 한 장 제출 → 배치 처리 후 이 프레임의 결과 반환
+
+        Args:
+            frame: BGR 프레임
+            det_size: detection 입력 크기 (None이면 기본 크기)
+            rois: 탐지 영역 (None이면 전체 프레임)
+            rec_cache: 스트림의 RecognitionCache (None이면 모든 얼굴 recognition)
+            preprocessor: 스트림의 FramePreprocessor (None이면 기본 전처리)
+            source: frame을 축소 디코딩한 ScaledFrame (None이면 frame이 원본)
+            producer: 프레임을 보낸 producer(연결)의 식별자 - 결과를 받기 전에는 다음 프레임을 보내지 않는 단위
+                      (예상 배치 크기 계산용, None이면 세지 않음)
+
+        Returns:
+            (faces, (processed_height, processed_width))
+        """
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        if producer is not None:
+            self._producer_seen[producer] = loop.time()
+        future = loop.create_future()
+        await self._queue.put((frame, det_size, rois, rec_cache, preprocessor, source, future))
+        return await future
+
+    def active_producers(self) -> int:
+        """최근 ACTIVE_PRODUCER_WINDOW_S 안에 프레임을 제출한 producer 수"""
+        cutoff = asyncio.get_running_loop().time() - ACTIVE_PRODUCER_WINDOW_S
+        self._producer_seen = {key: seen for key, seen in self._producer_seen.items() if seen >= cutoff}
+        return len(self._producer_seen)
+
+    def _batch_target(self) -> int:
+        expected = self.expected_batch() if self.expected_batch is not None else self.active_producers()
+        # 이미 큐에 쌓인 프레임(첫 프레임 포함)은 기다리지 않고 모두 가져갈 수 있도록
+        return max(1, min(self.max_batch, max(expected, self._queue.qsize() + 1)))
+
+    async def _collect(self) -> List[Tuple]:
+        """
+        첫 프레임을 기다린 뒤 max_batch / max_wait 안에서 배치 구성
+
+        항목: (frame, det_size, rois, rec_cache, preprocessor, source, future)
+        """
+        batch = [await self._queue.get()]
+        target = self._batch_target()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < target:
+            # 이미 쌓인 프레임은 기다리지 않고 가져감
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # 배치 구성은 워커들이 차례로 (큐 순서 = 배치 순서)
+            async with self._collect_lock:
+                batch = await self._collect()
+                previous, delivered = self._delivered, loop.create_future()
+                self._delivered = delivered
+            # 기다리는 동안 연결이 끊긴(취소된) 프레임은 제외
+            batch = [item for item in batch if not item[-1].done()]
+            results, error = None, None
+            t0 = time.perf_counter()
+            if batch:
+                try:
+                    # 항목의 future를 뺀 필드별 리스트 → infer_fn(frames, det_sizes, rois, rec_caches, preprocessors, sources)
+                    columns = [list(column) for column in zip(*(item[:-1] for item in batch))]
+                    results = await loop.run_in_executor(self._executor, self.infer_fn, *columns)
+                except Exception as e:
+                    print(f"⚠️ Inference 배치 처리 오류 ({len(batch)}프레임): {e}")
+                    error = e
+            # 앞 배치의 결과가 전달된 뒤에 전달 (워커가 여러 개여도 스트림별 순서 유지)
+            await previous
+            if results is not None:
+                self.stats["batches"] += 1
+                self.stats["frames"] += len(batch)
+                self.stats["infer_ms"] += (time.perf_counter() - t0) * 1000
+            for i, (*_, future) in enumerate(batch):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(results[i])
+            delivered.set_result(None)
+
+    def summary(self) -> Dict[str, float]:
+        """배치 통계 (평균 배치 크기, 프레임당 inference 시간)"""
+        batches = max(self.stats["batches"], 1)
+        frames = max(self.stats["frames"], 1)
+        return {
+            "workers": self.workers,
+            "max_batch": self.max_batch,
+            "batches": int(self.stats["batches"]),
+            "frames": int(self.stats["frames"]),
+            "avg_batch_size": round(self.stats["frames"] / batches, 2),
+            "infer_ms_per_frame": round(self.stats["infer_ms"] / frames, 3),
+        }
+
+
+# 애플리케이션 전역 서버 (모든 /ws/detect 연결이 공유, 활성 연결 수만큼 모이면 바로 실행)
+inference_server = InferenceServer()
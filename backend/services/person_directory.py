@@ -0,0 +1,89 @@
+# backend/services/person_directory.py
+"""
+Person Directory (인물 메타데이터 / 등록 이미지 캐시)
+
+- 인물 정보: 현재 갤러리 스냅샷의 {person_id: person_data} 매핑으로 O(1) 조회 (매칭 hot path용)
+- 등록 이미지: person_id별로 이미지 URL / 경로 / os.stat 결과를 한 번만 찾아서 캐시
+  등록(enroll) / 삭제 시 해당 인물만 다시 찾고, 전체 재로딩 시에는 전부 비웁니다.
+"""
+import os
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from backend.services.gallery_store import gallery_store, GallerySnapshot
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+ENROLL_IMAGES_DIR = PROJECT_ROOT / "images" / "enroll"
+
+# 지원하는 이미지 확장자 (person_id와 같은 파일명을 우선 사용)
+IMAGE_EXTS = [".jpg", ".jpeg", ".png", ".JPG", ".JPEG", ".PNG"]
+
+
+class EnrollImage:
+    """등록 이미지 한 장의 캐시된 정보"""
+
+    __slots__ = ("url", "path", "stat")
+
+    def __init__(self, url: str, path: Path, stat: os.stat_result):
+        self.url = url
+        self.path = path
+        self.stat = stat
+
+
+class PersonDirectory:
+    """person_id → 인물 정보 / 등록 이미지 캐시"""
+
+    def __init__(self, enroll_dir: Path = ENROLL_IMAGES_DIR):
+        self.enroll_dir = enroll_dir
+        self._images: Dict[str, Optional[EnrollImage]] = {}  # None = 이미지 없음 (음성 캐시)
+
+    def on_gallery_published(self, snapshot: GallerySnapshot, changed_ids: Optional[Set[str]]):
+        """GalleryStore 발행 알림 → 전체 재로딩이면 이미지 캐시 초기화"""
+        if changed_ids is None:
+            self._images = {}
+
+    def get(self, person_id: str) -> Optional[Dict]:
+        """person_id로 인물 정보 조회 (O(1))"""
+        return gallery_store.snapshot().person(person_id)
+
+    def __len__(self) -> int:
+        return len(gallery_store.snapshot().persons)
+
+    def image(self, person_id: str) -> Optional[EnrollImage]:
+        """등록 이미지 정보 (처음 조회할 때만 파일 시스템 확인)"""
+        if person_id not in self._images:
+            self._images[person_id] = self._find_image(person_id)
+        return self._images[person_id]
+
+    def image_url(self, person_id: str) -> Optional[str]:
+        """등록 이미지 URL (/api/images/enroll/{person_id}/{filename})"""
+        image = self.image(person_id)
+        return image.url if image is not None else None
+
+    def refresh_image(self, person_id: str):
+        """등록 이미지가 바뀐 경우 (enroll) 다시 찾기"""
+        self._images[person_id] = self._find_image(person_id)
+
+    def forget(self, person_id: str):
+        """삭제된 인물의 이미지 캐시 제거"""
+        self._images.pop(person_id, None)
+
+    def _find_image(self, person_id: str) -> Optional[EnrollImage]:
+        enroll_dir = self.enroll_dir / person_id
+        if not enroll_dir.is_dir():
+            return None
+        candidates = [enroll_dir / f"{person_id}{ext}" for ext in IMAGE_EXTS]
+        for ext in IMAGE_EXTS:
+            candidates.extend(sorted(enroll_dir.glob(f"*{ext}")))
+        for img_file in candidates:
+            try:
+                stat = img_file.stat()
+            except OSError:
+                continue
+            return EnrollImage(f"/api/images/enroll/{person_id}/{img_file.name}", img_file, stat)
+        return None
+
+
+# 애플리케이션 전역 디렉터리 (갤러리 스냅샷과 동기화)
+person_directory = PersonDirectory()
+gallery_store.subscribe(person_directory.on_gallery_published)
@@ -0,0 +1,141 @@
+# backend/services/recognition_cache.py
+"""
+트랙별 임베딩 / 매칭 결과 재사용
+
+10fps 스트림에서 가만히 서 있는 사람은 매 프레임 같은 얼굴을 다시 임베딩하고 갤러리 전체와 다시 비교합니다.
+스트림마다 직전 프레임 얼굴의 임베딩과 매칭 결과(base / masked / dynamic 테이블 행)를 기억해 두고,
+새 얼굴이 아래 조건을 모두 만족하면 recognition과 갤러리 매칭을 건너뛰고 그대로 사용합니다.
+
+- 임베딩을 계산한 때의 박스 대비 중심 이동 / 크기 변화가 REC_CACHE_MAX_MOVE(얼굴 크기 대비) 이하
+- 자세가 같음: estimate_face_angle의 angle_type이 같고 yaw 변화가 REC_CACHE_MAX_YAW_DELTA 이하
+- 화질 등급(estimate_face_quality)과 가림 여부(check_face_occlusion)가 같음
+- 임베딩이 REC_CACHE_TTL_MS보다 오래되지 않음 (주기적 강제 갱신)
+
+매칭 결과는 같은 용의자 인덱스(data_loader.get_suspect_indexes가 돌려준 객체)일 때만 재사용하므로,
+선택 인물이 바뀌거나 bank가 갱신되면 임베딩만 재사용하고 매칭은 다시 합니다.
+좌표는 전처리된(업스케일) 프레임 기준입니다.
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+
+from backend.config import REC_CACHE_MAX_MOVE, REC_CACHE_MAX_YAW_DELTA, REC_CACHE_TTL_MS
+from backend.utils.bbox_utils import is_same_face_region, calculate_bbox_center_distance
+from backend.utils.image_utils import estimate_face_angle, estimate_face_quality, check_face_occlusion
+
+REFRESH_REASONS = ("new", "moved", "pose", "quality", "occlusion", "expired")
+
+
+class RecognitionCache:
+    """스트림 하나의 얼굴별 임베딩 / 매칭 결과 캐시"""
+
+    def __init__(self, max_move: float = REC_CACHE_MAX_MOVE,
+                 max_yaw_delta: float = REC_CACHE_MAX_YAW_DELTA,
+                 ttl_ms: float = REC_CACHE_TTL_MS):
+        self.max_move = max_move
+        self.max_yaw_delta = max_yaw_delta
+        self.ttl = ttl_ms / 1000.0
+        # 직전 프레임 얼굴 순서대로:
+        # {"bbox", "angle_type", "yaw", "quality", "clear", "embedding", "created", "matches": (indexes, rows) 또는 None}
+        self.entries: List[Dict] = []
+        self._hits: List[bool] = []
+        self.stats: Dict[str, int] = {"faces": 0, "embedding_hits": 0, "match_lookups": 0, "match_hits": 0,
+                                      **{f"refresh_{reason}": 0 for reason in REFRESH_REASONS}}
+
+    def _describe(self, face, img_shape: Tuple[int, int]) -> Dict:
+        bbox = [float(v) for v in face.bbox[:4]]
+        angle_type, yaw = estimate_face_angle(face)
+        return {
+            "bbox": bbox,
+            "angle_type": angle_type,
+            "yaw": float(yaw) if yaw is not None else 0.0,
+            "quality": estimate_face_quality(bbox, img_shape),
+            "clear": check_face_occlusion(face, bbox),
+        }
+
+    def _refresh_reason(self, state: Dict, entry: Dict, now: float) -> Optional[str]:
+        """entry를 재사용할 수 없는 이유 (재사용 가능하면 None)"""
+        size = max(entry["bbox"][2] - entry["bbox"][0], entry["bbox"][3] - entry["bbox"][1], 1.0)
+        new_size = max(state["bbox"][2] - state["bbox"][0], state["bbox"][3] - state["bbox"][1])
+        if (calculate_bbox_center_distance(entry["bbox"], state["bbox"]) > size * self.max_move
+                or abs(new_size - size) > size * self.max_move):
+            return "moved"
+        if state["angle_type"] != entry["angle_type"] or abs(state["yaw"] - entry["yaw"]) > self.max_yaw_delta:
+            return "pose"
+        if state["quality"] != entry["quality"]:
+            return "quality"
+        if state["clear"] != entry["clear"]:
+            return "occlusion"
+        if now - entry["created"] > self.ttl:
+            return "expired"
+        return None
+
+    def reuse(self, faces: List, img_shape: Tuple[int, int]) -> List[bool]:
+        """
+        탐지된 얼굴마다 직전 임베딩 재사용 여부 결정 (재사용하면 face.embedding 설정)
+
+        recognition 전에 호출하고, recognition 후에 update(faces)를 호출합니다.
+
+        Returns:
+            얼굴별 재사용 여부 (False인 얼굴만 recognition 실행)
+        """
+        now = time.monotonic()
+        available = list(self.entries)
+        hits, pending = [], []
+        for face in faces:
+            state = self._describe(face, img_shape)
+            # 같은 얼굴 영역의 직전 항목 중 가장 가까운 것
+            candidates = [entry for entry in available
+                          if entry["embedding"] is not None and is_same_face_region(entry["bbox"], state["bbox"])]
+            entry = min(candidates, key=lambda e: calculate_bbox_center_distance(e["bbox"], state["bbox"]),
+                        default=None)
+            reason = "new" if entry is None else self._refresh_reason(state, entry, now)
+            self.stats["faces"] += 1
+            if reason is None:
+                available.remove(entry)
+                face.embedding = entry["embedding"]
+                self.stats["embedding_hits"] += 1
+                pending.append(entry)
+                hits.append(True)
+            else:
+                self.stats[f"refresh_{reason}"] += 1
+                pending.append({**state, "embedding": None, "created": now, "matches": None})
+                hits.append(False)
+        self.entries = pending
+        self._hits = hits
+        return hits
+
+    def update(self, faces: List):
+        """recognition 후 새로 계산한 임베딩 저장 (reuse()와 같은 얼굴 리스트)"""
+        for face, entry, hit in zip(faces, self.entries, self._hits):
+            if not hit:
+                entry["embedding"] = face.embedding
+
+    def cached_matches(self, indexes: tuple) -> List[Optional[Tuple]]:
+        """
+        얼굴별 재사용 가능한 (base, masked, dynamic) 매칭 행 (없으면 None)
+
+        Args:
+            indexes: 이번 프레임의 용의자 인덱스 (같은 객체일 때만 재사용)
+        """
+        rows = []
+        for entry, hit in zip(self.entries, self._hits):
+            matches = entry["matches"]
+            rows.append(matches[1] if hit and matches is not None and matches[0] is indexes else None)
+        self.stats["match_lookups"] += len(rows)
+        self.stats["match_hits"] += sum(1 for row in rows if row is not None)
+        return rows
+
+    def store_matches(self, indexes: tuple, rows: List[Tuple]):
+        """이번 프레임의 얼굴별 (base, masked, dynamic) 매칭 행 저장"""
+        for entry, row in zip(self.entries, rows):
+            entry["matches"] = (indexes, row)
+
+    def summary(self) -> Dict:
+        faces = max(self.stats["faces"], 1)
+        lookups = max(self.stats["match_lookups"], 1)
+        return {
+            **self.stats,
+            "embedding_hit_rate": round(self.stats["embedding_hits"] / faces, 4),
+            "match_hit_rate": round(self.stats["match_hits"] / lookups, 4),
+            "active_tracks": len(self.entries),
+        }
@@ -0,0 +1,158 @@
+# backend/services/roi_detection.py
+"""
+트랙 주변 ROI detection (키프레임 사이 프레임)
+
+같은 사람 몇 명이 오래 머무는 CCTV 화면에서 매 프레임 전체(업스케일된 프레임)를 탐지하는 대신:
+- 키프레임: ROI_KEYFRAME_INTERVAL 프레임마다, 또는 장면 전환(직전 프레임 대비 썸네일 평균 밝기 차이가
+  ROI_SCENE_CHANGE_THRESHOLD 이상)일 때 전체 프레임 탐지
+- 그 사이 프레임: 직전 프레임에서 찾은 얼굴(트랙) 박스를 ROI_EXPAND만큼 넓힌 영역만 ROI_DET_SIZE detector로 탐지하고
+  박스 / 랜드마크를 프레임 좌표로 되돌림 (backend/utils/model_profile.py의 _detect_in_rois)
+
+- 겹치는 ROI는 하나로 합칩니다 (같은 얼굴을 두 번 탐지하지 않도록).
+- ROI 합이 프레임의 ROI_MAX_AREA_RATIO를 넘으면 전체 프레임 탐지가 더 싸므로 키프레임으로 처리합니다.
+- 트랙이 없으면 다음 키프레임까지 탐지하지 않습니다 (새로 들어온 얼굴은 최대 ROI_KEYFRAME_INTERVAL 프레임 뒤에 찾음).
+- ROI에서 얼굴을 못 찾은 트랙은 ROI_TRACK_TTL 프레임 동안 같은 위치로 유지합니다 (블러 / 일시적 미검출).
+
+좌표는 모두 전처리된(업스케일) 프레임 기준입니다 (detect_faces_in_frames의 processed_shape).
+"""
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from backend.config import (
+    ROI_KEYFRAME_INTERVAL, ROI_EXPAND, ROI_MAX_AREA_RATIO, ROI_SCENE_CHANGE_THRESHOLD, ROI_TRACK_TTL,
+)
+from backend.utils.bbox_utils import is_same_face_region
+
+THUMB_SIZE = (64, 36)  # 장면 전환 비교용 썸네일 (width, height)
+MIN_ROI_PX = 16  # 이보다 작은 영역(프레임 가장자리에 잘린 ROI)은 탐지하지 않음
+
+
+def merge_rois(rects: List[List[int]]) -> List[Tuple[int, int, int, int]]:
+    """겹치는 영역을 하나로 합친 (x1, y1, x2, y2) 리스트"""
+    merged = [list(rect) for rect in rects]
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    merged[i] = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return [tuple(rect) for rect in merged if rect[2] - rect[0] >= MIN_ROI_PX and rect[3] - rect[1] >= MIN_ROI_PX]
+
+
+class RoiDetectionPlanner:
+    """스트림 하나의 키프레임 / ROI 탐지 계획"""
+
+    def __init__(self, keyframe_interval: int = ROI_KEYFRAME_INTERVAL,
+                 expand: float = ROI_EXPAND,
+                 max_area_ratio: float = ROI_MAX_AREA_RATIO,
+                 scene_change_threshold: float = ROI_SCENE_CHANGE_THRESHOLD,
+                 track_ttl: int = ROI_TRACK_TTL):
+        self.keyframe_interval = keyframe_interval
+        self.expand = expand
+        self.max_area_ratio = max_area_ratio
+        self.scene_change_threshold = scene_change_threshold
+        self.track_ttl = track_ttl
+        self.tracks: List[Dict] = []  # {"bbox": [x1, y1, x2, y2], "missed": ROI에서 연속으로 못 찾은 프레임 수}
+        self.frame_shape: Optional[Tuple[int, int]] = None  # 직전 탐지 프레임 (processed height, width)
+        self._thumb: Optional[np.ndarray] = None
+        self._input_shape = None
+        self._since_keyframe = 0
+        self._rois: Optional[List[Tuple[int, int, int, int]]] = None  # 이번 프레임 계획 (None = 키프레임)
+        self.stats = {"keyframes": 0, "roi_frames": 0, "scene_changes": 0, "empty_frames": 0, "roi_area": 0.0}
+
+    def _scene_changed(self, frame: np.ndarray) -> bool:
+        """직전 프레임 대비 장면 전환 여부 (첫 프레임은 False, 프레임 크기가 바뀌면 True)"""
+        thumb = cv2.cvtColor(cv2.resize(frame, THUMB_SIZE, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        previous, self._thumb = self._thumb, thumb.astype(np.float32)
+        input_shape, self._input_shape = self._input_shape, frame.shape
+        if previous is None:
+            return False
+        if input_shape != frame.shape:
+            return True
+        return float(np.mean(np.abs(self._thumb - previous))) / 255.0 >= self.scene_change_threshold
+
+    def _track_rois(self) -> List[Tuple[int, int, int, int]]:
+        height, width = self.frame_shape
+        rects = []
+        for track in self.tracks:
+            x1, y1, x2, y2 = track["bbox"]
+            margin_x, margin_y = (x2 - x1) * self.expand, (y2 - y1) * self.expand
+            rects.append([
+                max(0, int(x1 - margin_x)), max(0, int(y1 - margin_y)),
+                min(width, int(np.ceil(x2 + margin_x))), min(height, int(np.ceil(y2 + margin_y))),
+            ])
+        return merge_rois(rects)
+
+    def plan(self, frame: np.ndarray, force_keyframe: bool = False) -> Optional[List[Tuple[int, int, int, int]]]:
+        """
+        이번 프레임의 탐지 영역 결정
+
+        Args:
+            frame: 원본 BGR 프레임 (장면 전환 비교용)
+            force_keyframe: 클라이언트가 알린 장면 전환 (탐색 등) → 전체 프레임 탐지
+
+        Returns:
+            None이면 전체 프레임 탐지(키프레임), 아니면 전처리된 프레임 좌표의 ROI 리스트 (빈 리스트 = 탐지 생략)
+        """
+        scene_changed = self._scene_changed(frame) or force_keyframe
+        if scene_changed:
+            self.stats["scene_changes"] += 1
+        rois = None
+        if (self.frame_shape is not None and not scene_changed
+                and self._since_keyframe + 1 < self.keyframe_interval):
+            rois = self._track_rois()
+            area = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in rois)
+            area_ratio = area / float(self.frame_shape[0] * self.frame_shape[1])
+            if area_ratio > self.max_area_ratio:
+                rois = None
+            else:
+                self.stats["roi_area"] += area_ratio
+
+        self._rois = rois
+        if rois is None:
+            self._since_keyframe = 0
+            self.stats["keyframes"] += 1
+        else:
+            self._since_keyframe += 1
+            self.stats["roi_frames"] += 1
+            if not rois:
+                self.stats["empty_frames"] += 1
+        return rois
+
+    def observe(self, faces: List, frame_shape: Tuple[int, int]):
+        """
+        탐지 결과로 트랙 갱신
+
+        Args:
+            faces: 이번 프레임의 Face 리스트 (bbox는 frame_shape 좌표)
+            frame_shape: detection에 넣은 프레임 (height, width)
+        """
+        self.frame_shape = tuple(frame_shape[:2])
+        tracks = [{"bbox": [float(v) for v in face.bbox[:4]], "missed": 0} for face in faces]
+        if self._rois is not None:
+            # ROI에서 못 찾은 트랙은 TTL 동안 유지 (같은 위치의 얼굴을 찾았으면 새 박스로 대체)
+            for track in self.tracks:
+                if track["missed"] < self.track_ttl and \
+                        not any(is_same_face_region(track["bbox"], found["bbox"]) for found in tracks):
+                    tracks.append({"bbox": track["bbox"], "missed": track["missed"] + 1})
+        self.tracks = tracks
+
+    def summary(self) -> Dict:
+        roi_frames = max(self.stats["roi_frames"], 1)
+        return {
+            "keyframes": self.stats["keyframes"],
+            "roi_frames": self.stats["roi_frames"],
+            "empty_frames": self.stats["empty_frames"],
+            "scene_changes": self.stats["scene_changes"],
+            "avg_roi_area_ratio": round(self.stats["roi_area"] / roi_frames, 4),
+            "active_tracks": len(self.tracks),
+        }
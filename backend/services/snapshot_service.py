@@ -0,0 +1,201 @@
+# backend/services/snapshot_service.py
+"""
+alert 스냅샷 서비스
+
+기존에는 alert 프레임마다 이벤트 루프에서 프레임 전체를 JPEG(품질 85)로 인코딩하고 base64로 응답에 넣었으므로,
+수배자가 화면에 머무는 동안 매 프레임 수백 KB를 인코딩 / 전송했습니다.
+
+- 얼굴 박스 주변(SNAPSHOT_CROP_MARGIN)만 잘라서 전용 스레드 풀에서 인코딩하고 id로 메모리에 보관
+  (SNAPSHOT_MAX_ITEMS개 / SNAPSHOT_MAX_MB를 넘으면 오래된 것부터 삭제)
+- 응답에는 snapshot_id / snapshot_url만 넣고, 이미지는 GET /api/snapshots/{id}로 받음
+  (인코딩이 끝나기 전에 요청하면 끝날 때까지 기다림)
+- 스트림의 SnapshotScheduler가 인물(트랙)별로 SNAPSHOT_INTERVAL_S에 최대 한 장만 찍음:
+  처음 alert된 프레임은 바로 찍고, 그 뒤로는 간격 동안 본 얼굴 중 가장 좋은 것(snapshot_quality)을 다음 스냅샷으로 사용
+
+트랙은 alert 인물(person_id) 단위입니다 (한 스트림에 같은 수배자는 한 명).
+"""
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from backend.config import (
+    SNAPSHOT_INTERVAL_S, SNAPSHOT_CROP_MARGIN, SNAPSHOT_JPEG_QUALITY, SNAPSHOT_MAX_ITEMS, SNAPSHOT_MAX_MB,
+    SNAPSHOT_WORKERS,
+)
+
+SNAPSHOT_URL = "/api/snapshots/{}"
+FULL_QUALITY_FACE_PX = 150  # estimate_face_quality의 "high" 기준 얼굴 크기
+NON_FRONT_PENALTY = 0.7  # 정면이 아닌 얼굴의 점수 배율
+
+
+def snapshot_quality(detection: Dict) -> float:
+    """스냅샷 후보 점수: 신뢰도 x 얼굴 크기(FULL_QUALITY_FACE_PX까지) x 정면 여부"""
+    x1, y1, x2, y2 = detection["bbox"][:4]
+    size = min(max(min(x2 - x1, y2 - y1), 0), FULL_QUALITY_FACE_PX) / FULL_QUALITY_FACE_PX
+    frontal = 1.0 if detection.get("angle_type") == "front" else NON_FRONT_PENALTY
+    return float(detection.get("confidence") or 0) * size * frontal
+
+
+def crop_face(image: np.ndarray, bbox, margin: float = SNAPSHOT_CROP_MARGIN) -> np.ndarray:
+    """얼굴 박스를 margin(얼굴 크기 대비)만큼 넓혀 자른 영역 (프레임 밖은 잘라냄)"""
+    height, width = image.shape[:2]
+    x1, y1, x2, y2 = [float(v) for v in bbox[:4]]
+    margin_x, margin_y = (x2 - x1) * margin, (y2 - y1) * margin
+    left, top = max(0, int(x1 - margin_x)), max(0, int(y1 - margin_y))
+    right, bottom = min(width, int(np.ceil(x2 + margin_x))), min(height, int(np.ceil(y2 + margin_y)))
+    if right <= left or bottom <= top:
+        return image
+    return image[top:bottom, left:right]
+
+
+class SnapshotService:
+    """스냅샷 인코딩(스레드 풀) + id별 메모리 보관"""
+
+    def __init__(self, workers: int = SNAPSHOT_WORKERS, max_items: int = SNAPSHOT_MAX_ITEMS,
+                 max_mb: float = SNAPSHOT_MAX_MB, quality: int = SNAPSHOT_JPEG_QUALITY,
+                 margin: float = SNAPSHOT_CROP_MARGIN):
+        self.workers = max(1, workers)
+        self.max_items = max(1, max_items)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.quality = quality
+        self.margin = margin
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()  # 오래된 것부터
+        self._pending: Dict[str, Future] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats: Dict[str, float] = {"submitted": 0, "encoded": 0, "failed": 0, "evicted": 0, "encode_ms": 0.0}
+
+    def submit(self, load_image: Callable[[], np.ndarray], bbox) -> str:
+        """
+        스냅샷 인코딩 예약 → snapshot_id (인코딩은 스레드 풀에서 실행, 바로 반환)
+
+        Args:
+            load_image: 원본 해상도 BGR 프레임을 돌려주는 함수 (축소 디코딩한 프레임은 여기서 원본 디코딩)
+            bbox: 원본 프레임 좌표의 얼굴 박스
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="snapshot")
+        snapshot_id = uuid.uuid4().hex
+        with self._lock:
+            self._pending[snapshot_id] = self._executor.submit(self._encode, snapshot_id, load_image, list(bbox))
+            self.stats["submitted"] += 1
+        return snapshot_id
+
+    def _encode(self, snapshot_id: str, load_image: Callable[[], np.ndarray], bbox):
+        t0 = time.perf_counter()
+        data = None
+        try:
+            crop = crop_face(load_image(), bbox, self.margin)
+            success, buffer = cv2.imencode(".jpg", crop, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            if success and buffer is not None and len(buffer) > 0:
+                data = buffer.tobytes()
+            else:
+                print(f"⚠️ 스냅샷 인코딩 실패: {snapshot_id}")
+        except Exception as e:
+            print(f"❌ 스냅샷 생성 중 오류 발생: {e}")
+        with self._lock:
+            self._pending.pop(snapshot_id, None)
+            if data is None:
+                self.stats["failed"] += 1
+                return
+            self._items[snapshot_id] = data
+            self._bytes += len(data)
+            self.stats["encoded"] += 1
+            self.stats["encode_ms"] += (time.perf_counter() - t0) * 1000
+            while len(self._items) > self.max_items or (self._bytes > self.max_bytes and len(self._items) > 1):
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.stats["evicted"] += 1
+
+    async def get(self, snapshot_id: str) -> Optional[bytes]:
+        """스냅샷 JPEG 바이트 (인코딩 중이면 끝날 때까지 대기, 없거나 삭제됐으면 None)"""
+        with self._lock:
+            data = self._items.get(snapshot_id)
+            future = self._pending.get(snapshot_id)
+        if data is None and future is not None:
+            await asyncio.wrap_future(future)
+            with self._lock:
+                data = self._items.get(snapshot_id)
+        return data
+
+    def summary(self) -> Dict:
+        encoded = max(self.stats["encoded"], 1)
+        with self._lock:
+            return {
+                "submitted": self.stats["submitted"],
+                "encoded": self.stats["encoded"],
+                "failed": self.stats["failed"],
+                "evicted": self.stats["evicted"],
+                "pending": len(self._pending),
+                "stored": len(self._items),
+                "stored_mb": round(self._bytes / (1024 * 1024), 2),
+                "avg_encode_ms": round(self.stats["encode_ms"] / encoded, 2),
+                "avg_kb": round(self._bytes / max(len(self._items), 1) / 1024, 1),
+            }
+
+
+class SnapshotScheduler:
+    """스트림 하나의 인물(트랙)별 스냅샷 간격 / 최고 화질 후보 관리"""
+
+    def __init__(self, service: Optional[SnapshotService] = None, interval_s: float = SNAPSHOT_INTERVAL_S):
+        self.service = service or snapshot_service
+        self.interval = interval_s
+        # {person_id: {"last": 마지막 스냅샷 시각, "seen": 마지막 alert 시각, "best": 간격 동안 가장 좋은 후보 또는 None}}
+        self.tracks: Dict[str, Dict] = {}
+        self.stats = {"alerts": 0, "snapshots": 0, "from_best": 0}
+
+    def capture(self, detections: List[Dict], load_image: Callable[[], np.ndarray],
+                now: Optional[float] = None) -> List[Dict]:
+        """
+        alert 얼굴(status == "criminal")마다 스냅샷 여부 결정 → 찍은 얼굴의 detection에 snapshot_id / snapshot_url 추가
+
+        Args:
+            detections: process_detection(+ temporal filter) 결과의 detections (bbox는 원본 프레임 좌표)
+            load_image: 이 프레임의 원본 해상도 BGR 이미지를 돌려주는 함수 (스냅샷을 찍을 때만 호출)
+
+        Returns:
+            이번 프레임에서 예약한 스냅샷 [{"person_id", "snapshot_id", "snapshot_url"}]
+        """
+        now = time.monotonic() if now is None else now
+        # 간격 동안 보이지 않은 트랙은 잊음 (다시 나타나면 바로 스냅샷)
+        self.tracks = {key: track for key, track in self.tracks.items() if now - track["seen"] < self.interval}
+        taken = []
+        for detection in detections:
+            person_id = detection.get("person_id")
+            if detection.get("status") != "criminal" or not person_id:
+                continue
+            self.stats["alerts"] += 1
+            candidate = {"score": snapshot_quality(detection), "bbox": list(detection["bbox"][:4]),
+                         "load_image": load_image}
+            track = self.tracks.get(person_id)
+            if track is not None and now - track["last"] < self.interval:
+                if track["best"] is None or candidate["score"] > track["best"]["score"]:
+                    track["best"] = candidate
+                track["seen"] = now
+                continue
+            best = candidate
+            if track is not None and track["best"] is not None and track["best"]["score"] > candidate["score"]:
+                best = track["best"]
+                self.stats["from_best"] += 1
+            snapshot_id = self.service.submit(best["load_image"], best["bbox"])
+            self.tracks[person_id] = {"last": now, "seen": now, "best": None}
+            self.stats["snapshots"] += 1
+            detection["snapshot_id"] = snapshot_id
+            detection["snapshot_url"] = SNAPSHOT_URL.format(snapshot_id)
+            taken.append({"person_id": person_id, "snapshot_id": snapshot_id,
+                          "snapshot_url": detection["snapshot_url"]})
+        return taken
+
+    def summary(self) -> Dict:
+        return {**self.stats, "active_tracks": len(self.tracks)}
+
+
+snapshot_service = SnapshotService()
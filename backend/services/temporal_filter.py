@@ -2,12 +2,12 @@
 """
 Temporal Consistency 필터 서비스
 """
-from typing import Dict
+from typing import Dict, Optional
 from fastapi import WebSocket
 from backend.utils.websocket_manager import connection_states
 
 
-def apply_temporal_filter(websocket: WebSocket, result: Dict) -> Dict:
+def apply_temporal_filter(websocket: WebSocket, result: Dict, state: Optional[Dict] = None) -> Dict:
     """
     개선된 Temporal Filter: Hysteresis 임계값 + 윈도우 기반 투표
     
@@ -19,6 +19,7 @@ def apply_temporal_filter(websocket: WebSocket, result: Dict) -> Dict:
     Args:
         websocket: WebSocket 연결 객체
         result: process_detection의 반환값
+        state: 스트림 상태 (None이면 연결 상태, 바이너리 프로토콜의 stream_id별 상태)
     
     Returns:
         temporal filter가 적용된 result
@@ -31,7 +32,8 @@ def apply_temporal_filter(websocket: WebSocket, result: Dict) -> Dict:
     if websocket not in connection_states:
         return result
     
-    state = connection_states[websocket]
+    if state is None:
+        state = connection_states[websocket]
     match_history = state.get("match_history", {})  # {person_id: [(confidence, matched), ...]}
     
     # 현재 프레임의 detection을 person_id별로 매핑
@@ -0,0 +1,198 @@
+# backend/utils/auto_tuner.py
+"""
+시작 시 호스트 자동 튜닝 (ORT 스레드 수 / inference 배치 크기 / 워커 수)
+
+8코어 엣지 장비와 64코어 서버는 최적 조합이 다르므로, 로드된 모델로 합성 프레임을 돌려
+작은 그리드를 측정하고 지연시간 목표(AUTOTUNE_LATENCY_MS, 배치 p95) 안에서 처리량이 가장 높은 조합을 고릅니다.
+결과는 호스트 프로파일 파일(HOST_PROFILE_PATH)에 저장되고, 이후 부팅에서는 호스트/모델 지문이 같으면
+측정 없이 파일을 그대로 사용합니다.
+
+- AUTOTUNE_ENABLED=1: 프로파일 파일이 없거나 지문이 다르면 측정 (AUTOTUNE_FORCE=1이면 항상 측정)
+- AUTOTUNE_ENABLED=0: 맞는 프로파일 파일이 있으면 적용만 하고 측정하지 않음
+- 환경 변수로 직접 지정한 값(ORT_INTRA_OP_THREADS, INFERENCE_MAX_BATCH, INFERENCE_WORKERS)은 튜닝하지 않음
+- INFERENCE_BATCHING_ENABLED=0이면 프레임을 한 장씩 처리하므로 배치 1 / 워커 1로 고정하고
+  스레드 수만 프레임 한 장의 지연시간(p95)으로 고름 (배치 크기 / 워커 수는 적용되지 않음)
+"""
+import os
+import json
+import time
+import platform
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import product
+from typing import Dict, List, Optional
+
+import numpy as np
+import onnxruntime as ort
+
+from backend.config import (
+    AUTOTUNE_ENABLED, AUTOTUNE_FORCE, AUTOTUNE_LATENCY_MS, AUTOTUNE_BUDGET_SEC, AUTOTUNE_ITERATIONS,
+    AUTOTUNE_FACES_PER_FRAME, HOST_PROFILE_PATH, INSIGHTFACE_MODEL,
+    ORT_INTRA_OP_THREADS, INFERENCE_MAX_BATCH, INFERENCE_WORKERS, INFERENCE_BATCHING_ENABLED,
+)
+from backend.utils.device_config import apply_session_options
+from backend.utils.model_profile import recognition_batch_size, stage_timings
+
+
+def _available_cores() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def host_fingerprint(app, device_id: int) -> Dict:
+    """프로파일 재사용 여부를 판단하는 호스트 / 모델 지문"""
+    rec_model = app.models.get("recognition")
+    return {
+        "hostname": platform.node(),
+        "cores": _available_cores(),
+        "device_id": device_id,
+        "providers": app.det_model.session.get_providers(),
+        "model": getattr(app, "model_pack", INSIGHTFACE_MODEL),
+        "profile": getattr(app, "profile", None),
+        "det_size": list(getattr(app, "det_size", ())),
+        "recognition": os.path.basename(rec_model.model_file) if rec_model is not None else None,
+        "onnxruntime": ort.__version__,
+        "inference_batching": INFERENCE_BATCHING_ENABLED,
+    }
+
+
+def _grid() -> List[Dict[str, int]]:
+    """측정할 (intra_op_threads, inference_max_batch, inference_workers) 조합"""
+    cores = _available_cores()
+    if ORT_INTRA_OP_THREADS > 0:
+        threads = [ORT_INTRA_OP_THREADS]
+    else:
+        threads = sorted({t for t in (1, 2, 4, cores // 2, cores) if 1 <= t <= cores})
+    if not INFERENCE_BATCHING_ENABLED:
+        # 프레임별 처리 경로: 배치 / 워커 수는 쓰이지 않으므로 프레임 한 장 기준으로만 측정
+        batches, workers = [1], [1]
+    else:
+        batches = [INFERENCE_MAX_BATCH] if "INFERENCE_MAX_BATCH" in os.environ else [1, 4, 8]
+        workers = [INFERENCE_WORKERS] if "INFERENCE_WORKERS" in os.environ else [1, 2]
+    grid = []
+    for t, b, w in product(threads, batches, workers):
+        if t * w <= max(cores, t):  # 워커 x 스레드가 코어 수를 넘지 않도록
+            grid.append({"intra_op_threads": t, "inference_max_batch": b, "inference_workers": w})
+    return grid
+
+
+def _run_batch(app, frames: List[np.ndarray], crops: List[np.ndarray]) -> float:
+    """합성 배치 한 번 (프레임별 detection + 모든 얼굴 recognition 배치) → 지연시간 ms"""
+    rec_model = app.models.get("recognition")
+    t0 = time.perf_counter()
+    for frame in frames:
+        app.det_model.detect(frame, max_num=0, metric="default")
+    if rec_model is not None and crops:
+        batch_size = recognition_batch_size(rec_model)
+        for start in range(0, len(crops), batch_size):
+            rec_model.get_feat(crops[start:start + batch_size])
+    return (time.perf_counter() - t0) * 1000
+
+
+def _measure(app, setting: Dict[str, int], frame: np.ndarray, crop: np.ndarray) -> Dict:
+    """한 조합의 처리량(frames/s)과 배치 지연시간 p95 측정"""
+    apply_session_options(app, verbose=False, intra_op_threads=setting["intra_op_threads"])
+    batch, workers = setting["inference_max_batch"], setting["inference_workers"]
+    frames = [frame] * batch
+    crops = [crop] * (batch * AUTOTUNE_FACES_PER_FRAME)
+    _run_batch(app, frames[:1], crops[:1])  # 워밍업
+
+    def worker(_):
+        return [_run_batch(app, frames, crops) for _ in range(AUTOTUNE_ITERATIONS)]
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = [ms for result in pool.map(worker, range(workers)) for ms in result]
+    elapsed = time.perf_counter() - t0
+    return {
+        **setting,
+        "fps": round(batch * len(latencies) / elapsed, 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 2),
+    }
+
+
+def tune(app, device_id: int, verbose: bool = True) -> Dict:
+    """
+    그리드 측정 후 최적 조합 선택
+
+    Returns:
+        {"settings": {...}, "results": [...]} - 목표 지연시간을 만족하는 조합이 없으면 지연시간이 가장 짧은 조합
+        (배치 처리를 끈 경우에는 항상 프레임 한 장의 지연시간이 가장 짧은 스레드 수)
+    """
+    det_w, det_h = getattr(app, "det_size", (640, 640))
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (det_h, det_w, 3), dtype=np.uint8)
+    crop = rng.integers(0, 255, (112, 112, 3), dtype=np.uint8)
+
+    grid = _grid()
+    if verbose:
+        print(f"⏱️ 호스트 자동 튜닝 시작: {len(grid)}개 조합 (목표 p95 {AUTOTUNE_LATENCY_MS:.0f}ms, 예산 {AUTOTUNE_BUDGET_SEC:.0f}s)")
+        if not INFERENCE_BATCHING_ENABLED:
+            print("   ℹ️ INFERENCE_BATCHING_ENABLED=0 → 배치 1 / 워커 1 고정, 스레드 수만 프레임 한 장 지연시간으로 선택")
+    started = time.perf_counter()
+    results = []
+    for setting in grid:
+        if results and time.perf_counter() - started > AUTOTUNE_BUDGET_SEC:
+            if verbose:
+                print(f"   ⚠️ 시간 예산 초과: {len(results)}/{len(grid)}개 조합만 측정")
+            break
+        result = _measure(app, setting, frame, crop)
+        results.append(result)
+        if verbose:
+            print(f"   threads={result['intra_op_threads']:>2}, batch={result['inference_max_batch']}, "
+                  f"workers={result['inference_workers']} → {result['fps']:>7.2f} fps, p95 {result['p95_ms']:.1f}ms")
+
+    within = [r for r in results if r["p95_ms"] <= AUTOTUNE_LATENCY_MS]
+    if not INFERENCE_BATCHING_ENABLED or not within:
+        best = min(results, key=lambda r: r["p95_ms"])
+    else:
+        best = max(within, key=lambda r: r["fps"])
+    settings = {key: best[key] for key in ("intra_op_threads", "inference_max_batch", "inference_workers")}
+    return {"settings": settings, "results": results}
+
+
+def load_or_tune_host_profile(app, device_id: int, verbose: bool = True) -> Optional[Dict[str, int]]:
+    """
+    호스트 프로파일 적용 (맞는 파일이 있으면 재사용, 없으면 AUTOTUNE_ENABLED일 때 측정 후 저장)
+
+    ORT 스레드 수는 여기서 세션에 적용하고, 배치 크기 / 워커 수는 반환값으로 호출자가 적용합니다.
+
+    Returns:
+        {"intra_op_threads", "inference_max_batch", "inference_workers"} 또는 None (프로파일 없음)
+    """
+    fingerprint = host_fingerprint(app, device_id)
+    profile = None
+    if HOST_PROFILE_PATH.exists() and not AUTOTUNE_FORCE:
+        try:
+            with open(HOST_PROFILE_PATH, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get("fingerprint") == fingerprint:
+                profile = saved
+                if verbose:
+                    print(f"📄 호스트 프로파일 재사용: {HOST_PROFILE_PATH.name} ({saved.get('measured_at')})")
+            elif verbose:
+                print(f"ℹ️ 호스트 프로파일 지문 불일치 (호스트/모델 변경) → {'재측정' if AUTOTUNE_ENABLED else '무시'}")
+        except Exception as e:
+            print(f"⚠️ 호스트 프로파일 로드 실패: {e}")
+
+    if profile is None:
+        if not AUTOTUNE_ENABLED:
+            return None
+        profile = {"fingerprint": fingerprint, "measured_at": datetime.now().isoformat(), **tune(app, device_id, verbose)}
+        stage_timings.reset()  # 튜닝 중 기록된 단계별 시간 제외
+        HOST_PROFILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(HOST_PROFILE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(profile, f, indent=2, ensure_ascii=False)
+        if verbose:
+            print(f"💾 호스트 프로파일 저장: {HOST_PROFILE_PATH}")
+
+    settings = profile["settings"]
+    apply_session_options(app, verbose=verbose, intra_op_threads=settings["intra_op_threads"])
+    if verbose and INFERENCE_BATCHING_ENABLED:
+        print(f"✅ 튜닝 설정 적용: threads={settings['intra_op_threads']}, "
+              f"batch={settings['inference_max_batch']}, workers={settings['inference_workers']}")
+    elif verbose:
+        print(f"✅ 튜닝 설정 적용: threads={settings['intra_op_threads']} "
+              f"(INFERENCE_BATCHING_ENABLED=0 → 배치 크기 / 워커 수는 적용하지 않음)")
+    return settings
@@ -6,10 +6,37 @@ GPU 사용 가능 여부를 확인하고 적절한 ctx_id를 반환합니다.
 import os
 import sys
 import warnings
-import onnxruntime as ort
-from typing import Optional
+from typing import Dict, List, Optional
 from pathlib import Path
 
+from backend.config import (
+    ORT_INTRA_OP_THREADS, ORT_INTER_OP_THREADS, ORT_GRAPH_OPT_LEVEL, ORT_EXECUTION_MODE,
+    ORT_PROVIDERS, CPU_AFFINITY, OPENCV_THREADS, BLAS_THREADS,
+)
+
+# BLAS 스레드 수는 NumPy(BLAS 라이브러리)가 로드되기 전에 환경 변수로 지정해야 적용됨
+# (onnxruntime import가 NumPy를 로드하므로 그 전에 설정, 이미 로드된 경우는 threadpoolctl로 보정)
+BLAS_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+if BLAS_THREADS > 0:
+    for _name in BLAS_THREAD_ENV_VARS:
+        os.environ.setdefault(_name, str(BLAS_THREADS))
+
+import onnxruntime as ort
+
+GRAPH_OPT_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+# 실제 적용된 런타임 설정 (get_device_info에서 보고)
+_runtime_settings: Dict[str, object] = {}
+
 def _find_cuda_path() -> Optional[str]:
     """
     시스템에 설치된 CUDA 경로를 찾습니다.
@@ -154,12 +181,137 @@ def safe_prepare_insightface(app, device_id: int, det_size: tuple = (640, 640),
             print(f"✅ CPU 초기화 성공")
         return -1
 
+def _parse_cpu_list(spec: str) -> List[int]:
+    """ "0-3,6" → [0, 1, 2, 3, 6] """
+    cpus = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    return sorted(set(cpus))
+
+
+def configure_cpu_runtime(verbose: bool = True) -> Dict[str, object]:
+    """
+    CPU affinity와 OpenCV / BLAS 스레드 풀 설정 (모델 로드 전에 한 번 호출)
+    
+    Returns:
+        dict: 적용된 설정 (affinity, opencv_threads, blas_threads)
+    """
+    # 1. CPU affinity (Linux만 지원, 다른 OS는 경고만)
+    if CPU_AFFINITY:
+        try:
+            os.sched_setaffinity(0, _parse_cpu_list(CPU_AFFINITY))
+        except (AttributeError, OSError, ValueError) as e:
+            if verbose:
+                print(f"⚠️ CPU affinity 설정 실패 ({CPU_AFFINITY}): {e}")
+    if hasattr(os, "sched_getaffinity"):
+        _runtime_settings["cpu_affinity"] = sorted(os.sched_getaffinity(0))
+    
+    # 2. OpenCV 스레드 (ORT와 코어를 나눠 쓰도록)
+    try:
+        import cv2
+        if OPENCV_THREADS >= 0:
+            cv2.setNumThreads(OPENCV_THREADS)
+        _runtime_settings["opencv_threads"] = cv2.getNumThreads()
+    except ImportError:
+        pass
+    
+    # 3. BLAS 스레드 (이미 로드된 BLAS 라이브러리는 threadpoolctl로 제한 - 선택 의존성)
+    if BLAS_THREADS > 0:
+        try:
+            from threadpoolctl import threadpool_limits
+            threadpool_limits(limits=BLAS_THREADS, user_api="blas")
+        except ImportError:
+            pass
+    try:
+        from threadpoolctl import threadpool_info
+        _runtime_settings["blas_threads"] = {info["internal_api"]: info["num_threads"]
+                                             for info in threadpool_info() if info["user_api"] == "blas"}
+    except ImportError:
+        _runtime_settings["blas_threads"] = {name: os.getenv(name) for name in BLAS_THREAD_ENV_VARS}
+    
+    if verbose:
+        print(f"🧵 스레드 설정: OpenCV={_runtime_settings.get('opencv_threads')}, "
+              f"BLAS={_runtime_settings.get('blas_threads')}, "
+              f"affinity={len(_runtime_settings.get('cpu_affinity', [])) or '기본'}개 CPU")
+    return dict(_runtime_settings)
+
+
+def build_session_options(intra_op_threads: Optional[int] = None,
+                          inter_op_threads: Optional[int] = None) -> ort.SessionOptions:
+    """config의 ORT_* 설정으로 SessionOptions 생성 (스레드 수는 인자로 덮어쓰기 가능 - auto-tuner용)"""
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = ORT_INTRA_OP_THREADS if intra_op_threads is None else intra_op_threads
+    options.inter_op_num_threads = ORT_INTER_OP_THREADS if inter_op_threads is None else inter_op_threads
+    options.graph_optimization_level = GRAPH_OPT_LEVELS.get(ORT_GRAPH_OPT_LEVEL, ort.GraphOptimizationLevel.ORT_ENABLE_ALL)
+    options.execution_mode = EXECUTION_MODES.get(ORT_EXECUTION_MODE, ort.ExecutionMode.ORT_SEQUENTIAL)
+    return options
+
+
+def get_session_providers(device_id: int) -> List[str]:
+    """
+    사용할 Execution Provider 목록 (ORT_PROVIDERS가 있으면 그 중 사용 가능한 것만)
+    
+    Returns:
+        list: 우선순위 순 provider 이름 (항상 CPUExecutionProvider로 끝남)
+    """
+    available = ort.get_available_providers()
+    if ORT_PROVIDERS:
+        providers = [p for p in ORT_PROVIDERS if p in available]
+    elif device_id >= 0:
+        providers = [p for p in ("CUDAExecutionProvider",) if p in available]
+    else:
+        providers = []
+    if "CPUExecutionProvider" not in providers:
+        providers.append("CPUExecutionProvider")
+    return providers
+
+
+def apply_session_options(app, verbose: bool = True, intra_op_threads: Optional[int] = None,
+                          inter_op_threads: Optional[int] = None):
+    """
+    FaceAnalysis의 모델별 ORT 세션을 SessionOptions를 적용해 다시 생성
+    
+    InsightFace는 모델 로드 시 providers만 전달하고 SessionOptions는 전달하지 않으므로,
+    prepare() 이후 같은 모델 파일 / provider로 세션을 재생성합니다.
+    """
+    options = build_session_options(intra_op_threads, inter_op_threads)
+    providers = None
+    # 입력 크기별 detector(app.det_models)도 함께 (같은 객체는 한 번만)
+    task_models = {id(m): m for m in list(app.models.values()) + list(getattr(app, "det_models", {}).values())}
+    for task_model in task_models.values():
+        model_file = getattr(task_model, "model_file", None)
+        session = getattr(task_model, "session", None)
+        if model_file is None or session is None:
+            continue
+        providers = session.get_providers()
+        task_model.session = ort.InferenceSession(model_file, sess_options=options, providers=providers)
+    
+    _runtime_settings.update({
+        "intra_op_num_threads": options.intra_op_num_threads,
+        "inter_op_num_threads": options.inter_op_num_threads,
+        "graph_optimization_level": ORT_GRAPH_OPT_LEVEL,
+        "execution_mode": ORT_EXECUTION_MODE,
+        "session_providers": providers,
+    })
+    if verbose:
+        print(f"⚙️ ORT 세션 설정: intra={options.intra_op_num_threads or '기본'}, "
+              f"inter={options.inter_op_num_threads or '기본'}, opt={ORT_GRAPH_OPT_LEVEL}, "
+              f"mode={ORT_EXECUTION_MODE}, providers={providers}")
+
+
 def get_device_info() -> dict:
     """
     현재 디바이스 정보를 반환합니다.
     
     Returns:
-        dict: 디바이스 정보 (device_id, device_type, providers)
+        dict: 디바이스 정보 (device_id, device_type, providers, 적용된 세션/스레드 설정)
     """
     device_id = get_device_id()
     
@@ -175,5 +327,7 @@ def get_device_info() -> dict:
     return {
         "device_id": device_id,
         "device_type": device_type,
-        "providers": providers
+        "providers": providers,
+        "configured_providers": ORT_PROVIDERS or None,
+        **_runtime_settings,
     }
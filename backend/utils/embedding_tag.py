@@ -0,0 +1,73 @@
+# backend/utils/embedding_tag.py
+"""
+갤러리 임베딩 모델 태그
+
+임베딩 공간은 recognition 모델마다 다르므로 (buffalo_l의 w600k_r50 ↔ buffalo_s의 w600k_mbf),
+다른 모델로 만든 bank를 섞어 쓰면 유사도가 의미 없어집니다.
+인물 폴더(outputs/embeddings/<person_id>/)에 만든 모델을 model.json으로 기록하고,
+로드할 때 현재 모델과 다르면 그 인물의 bank를 거부합니다.
+
+- 같은 recognition 모델 파일을 쓰는 팩(buffalo_s ↔ buffalo_sc)과 INT8 팩(<name>_int8)은 호환으로 봅니다.
+- 태그가 없는 기존 폴더는 (예전 기본 모델로 만든 것으로 보고) 그대로 로드합니다.
+"""
+import os
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from backend.config import INSIGHTFACE_MODEL, QUANTIZED_PACK_SUFFIX
+
+TAG_FILENAME = "model.json"
+
+# 현재 로드된 모델의 태그 (create_face_analysis에서 설정)
+_active_tag: Dict[str, Optional[str]] = {"model": INSIGHTFACE_MODEL, "recognition": None}
+
+
+def set_active_model(app):
+    """로드된 FaceAnalysis로 현재 임베딩 태그 설정"""
+    pack = getattr(app, "model_pack", INSIGHTFACE_MODEL)
+    if pack.endswith(QUANTIZED_PACK_SUFFIX):
+        pack = pack[:-len(QUANTIZED_PACK_SUFFIX)]
+    rec_model = app.models.get("recognition")
+    _active_tag["model"] = pack
+    _active_tag["recognition"] = os.path.basename(rec_model.model_file) if rec_model is not None else None
+
+
+def current_tag() -> Dict[str, Optional[str]]:
+    return dict(_active_tag)
+
+
+def read_tag(person_dir: Path) -> Optional[Dict]:
+    tag_path = person_dir / TAG_FILENAME
+    if not tag_path.exists():
+        return None
+    try:
+        with open(tag_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"  ⚠️ 모델 태그 로드 실패 ({person_dir.name}): {e}")
+        return None
+
+
+def write_tag(person_dir: Path):
+    """인물 폴더에 현재 모델 태그 기록 (base bank를 새로 만들 때 호출)"""
+    person_dir.mkdir(parents=True, exist_ok=True)
+    with open(person_dir / TAG_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump(current_tag(), f, indent=2, ensure_ascii=False)
+
+
+def tag_mismatch(person_dir: Path) -> Optional[str]:
+    """
+    인물 폴더의 임베딩이 현재 모델과 호환되지 않으면 이유 문자열, 호환되면(또는 태그 없음) None
+    """
+    tag = read_tag(person_dir)
+    if tag is None:
+        return None
+    current = current_tag()
+    if tag.get("recognition") and current["recognition"]:
+        if tag["recognition"] == current["recognition"]:
+            return None
+        return f"recognition {tag['recognition']} ≠ {current['recognition']} (팩 {tag.get('model')} → {current['model']})"
+    if tag.get("model") == current["model"]:
+        return None
+    return f"모델 팩 {tag.get('model')} ≠ {current['model']}"
@@ -0,0 +1,85 @@
+# backend/utils/frame_protocol.py
+"""
+/ws/detect 바이너리 프레임 프로토콜
+
+JSON 프로토콜은 프레임마다 base64 data URL 문자열을 보내므로 JPEG보다 약 33% 크고,
+json.loads → 문자열 분리 → base64 디코딩 → imdecode 과정에서 여러 번 복사됩니다.
+바이너리 메시지는 고정 헤더(20바이트, little-endian) 뒤에 JPEG 바이트를 그대로 붙이고,
+서버는 받은 버퍼를 복사 없이 np.frombuffer로 감싸서 바로 imdecode 합니다.
+
+    offset  size  field
+    0       4     magic       b"EYSF"
+    4       1     version     1
+    5       1     flags       FLAG_VIDEO_TIME | FLAG_SCENE_CUT
+    6       2     stream_id   uint16 (한 연결에서 여러 카메라를 보낼 때 구분, 스트림별 tracking / 캐시 상태 분리)
+    8       4     frame_id    uint32
+    12      8     video_time  float64 초 (FLAG_VIDEO_TIME이 없으면 무시)
+    20      ...   JPEG 바이트
+
+suspect_ids 설정 / ping 등 나머지 메시지와 서버 응답은 기존 JSON 텍스트 메시지를 그대로 사용합니다.
+"""
+import struct
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+FRAME_MAGIC = b"EYSF"
+FRAME_VERSION = 1
+FRAME_HEADER = struct.Struct("<4sBBHId")
+
+FLAG_VIDEO_TIME = 0x01  # video_time 필드 사용
+FLAG_SCENE_CUT = 0x02  # 클라이언트가 알려주는 장면 전환 (탐색 / 카메라 전환) → 다음 탐지는 전체 프레임
+
+
+def parse_frame_header(buffer: bytes) -> Dict:
+    """
+    바이너리 메시지 헤더 파싱
+
+    Returns:
+        {"stream_id", "frame_id", "video_time"(없으면 None), "flags"}
+
+    Raises:
+        ValueError: 헤더가 짧거나 magic / version이 다를 때
+    """
+    if len(buffer) < FRAME_HEADER.size:
+        raise ValueError(f"Frame header too short ({len(buffer)} bytes)")
+    magic, version, flags, stream_id, frame_id, video_time = FRAME_HEADER.unpack_from(buffer)
+    if magic != FRAME_MAGIC:
+        raise ValueError("Invalid frame magic")
+    if version != FRAME_VERSION:
+        raise ValueError(f"Unsupported frame protocol version: {version}")
+    return {
+        "stream_id": stream_id,
+        "frame_id": frame_id,
+        "video_time": video_time if flags & FLAG_VIDEO_TIME else None,
+        "flags": flags,
+    }
+
+
+def split_binary_frame(buffer: bytes) -> Tuple[Dict, np.ndarray]:
+    """바이너리 메시지 → (헤더, JPEG 바이트 np.uint8 배열 - 받은 버퍼를 복사 없이 참조)"""
+    header = parse_frame_header(buffer)
+    return header, np.frombuffer(buffer, dtype=np.uint8, offset=FRAME_HEADER.size)
+
+
+def decode_binary_frame(buffer: bytes) -> Tuple[Dict, Optional[np.ndarray]]:
+    """
+    바이너리 메시지 → (헤더, BGR 프레임) - JPEG는 받은 버퍼에서 복사 없이 디코딩
+
+    Returns:
+        (parse_frame_header 결과, 디코딩 실패 시 None)
+    """
+    header, jpeg = split_binary_frame(buffer)
+    frame = cv2.imdecode(jpeg, cv2.IMREAD_COLOR) if jpeg.size > 0 else None
+    return header, frame
+
+
+def encode_binary_frame(jpeg: bytes, frame_id: int, stream_id: int = 0,
+                        video_time: Optional[float] = None, flags: int = 0) -> bytes:
+    """JPEG 바이트 → 바이너리 메시지 (테스트 클라이언트 / 벤치마크용)"""
+    if video_time is not None:
+        flags |= FLAG_VIDEO_TIME
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, flags, stream_id, frame_id & 0xFFFFFFFF,
+                               float(video_time) if video_time is not None else 0.0)
+    return header + bytes(jpeg)
@@ -4,10 +4,17 @@
 """
 
 import base64
+import threading
 import cv2
 import numpy as np
 from typing import Optional
 
+# 전처리 커널 / CLAHE는 한 번만 생성 (CLAHE 객체는 내부 버퍼를 가지므로 스레드별로 하나)
+SHARPEN_KERNEL = np.array([[-1, -1, -1],
+                           [-1,  9, -1],
+                           [-1, -1, -1]], dtype=np.float32) * 0.5
+_clahe_local = threading.local()
+
 def l2_normalize(vec: np.ndarray) -> np.ndarray:
     """벡터를 L2 정규화"""
     norm = np.linalg.norm(vec)
@@ -49,31 +56,48 @@ def preprocess_image_for_detection(image: np.ndarray, min_size: int = 640) -> np
         # 고품질 업스케일링 (INTER_LANCZOS4 사용)
         upscaled = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LANCZOS4)
         
-        # 샤프닝 필터 적용 (선명도 향상)
-        kernel = np.array([[-1, -1, -1],
-                          [-1,  9, -1],
-                          [-1, -1, -1]]) * 0.5
-        sharpened = cv2.filter2D(upscaled, -1, kernel)
-        
-        # 약간의 대비 향상
-        lab = cv2.cvtColor(sharpened, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        l = clahe.apply(l)
-        enhanced = cv2.merge([l, a, b])
-        enhanced = cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
-        
-        return enhanced
+        # 샤프닝 필터 적용 (선명도 향상) + 약간의 대비 향상
+        return enhance_contrast(sharpen_image(upscaled))
     
     return image
 
-def base64_to_image(base64_string: str) -> Optional[np.ndarray]:
-    """Base64 문자열을 OpenCV 이미지로 변환"""
+
+def sharpen_image(image: np.ndarray) -> np.ndarray:
+    """샤프닝 필터 (SHARPEN_KERNEL 재사용)"""
+    return cv2.filter2D(image, -1, SHARPEN_KERNEL)
+
+
+def _get_clahe():
+    clahe = getattr(_clahe_local, "clahe", None)
+    if clahe is None:
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        _clahe_local.clahe = clahe
+    return clahe
+
+
+def enhance_contrast(image: np.ndarray) -> np.ndarray:
+    """LAB 밝기 채널에 CLAHE 적용 (스레드별 CLAHE 객체 재사용)"""
+    lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+    l, a, b = cv2.split(lab)
+    l = _get_clahe().apply(l)
+    return cv2.cvtColor(cv2.merge([l, a, b]), cv2.COLOR_LAB2BGR)
+
+def base64_to_buffer(base64_string: str) -> Optional[np.ndarray]:
+    """Base64 문자열(data URL 가능)을 인코딩된 이미지 바이트(np.uint8)로 변환"""
     try:
         if "base64," in base64_string:
             base64_string = base64_string.split("base64,")[1]
-        image_bytes = base64.b64decode(base64_string)
-        np_arr = np.frombuffer(image_bytes, np.uint8)
+        return np.frombuffer(base64.b64decode(base64_string), np.uint8)
+    except Exception as e:
+        print(f"⚠️ 이미지 디코딩 오류: {e}")
+        return None
+
+def base64_to_image(base64_string: str) -> Optional[np.ndarray]:
+    """Base64 문자열을 OpenCV 이미지로 변환"""
+    np_arr = base64_to_buffer(base64_string)
+    if np_arr is None:
+        return None
+    try:
         image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
         return image
     except Exception as e:
@@ -0,0 +1,158 @@
+# backend/utils/jpeg_decode.py
+"""
+detection 해상도에 맞춘 JPEG 축소 디코딩
+
+카메라는 1080p / 4K JPEG를 보내지만 detector는 INSIGHTFACE_DET_SIZE(예: 640x640)에 맞춰 줄인 이미지만 씁니다.
+cv2.IMREAD_REDUCED_COLOR_2/4/8은 libjpeg(-turbo)의 DCT 스케일링으로 처음부터 1/2, 1/4, 1/8 크기로 디코딩하므로
+전체 디코딩 + 축소보다 빠르고 프레임 메모리도 1/4 ~ 1/64로 줄어듭니다.
+
+- 축소 배율: 축소한 프레임이 detector 입력(비율 유지)보다 작아지지 않는 가장 큰 배율
+  → detection에 들어가는 픽셀은 전체 디코딩과 같은 해상도
+- 짧은 변이 MIN_REDUCE_SHORT_SIDE 미만인 프레임(저해상도 CCTV)은 원본 그대로 디코딩
+  (전처리 업스케일 / 보정 대상이라 축소하지 않음)
+- 원본 해상도 픽셀은 ScaledFrame.full()을 처음 부를 때만 디코딩 (작은 얼굴의 recognition 정렬)
+- JPEG가 아니거나(PNG 등) 헤더를 읽을 수 없으면 원본 그대로 디코딩
+
+cv2로는 JPEG의 일부 영역만 디코딩할 수 없으므로 원본이 필요한 프레임은 전체를 한 번 디코딩하고 캐시합니다.
+"""
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from backend.config import INSIGHTFACE_DET_SIZE, DECODE_SCALE_MAX_FACTOR, DECODE_FULL_RES_FACE_SIZE
+
+MIN_REDUCE_SHORT_SIDE = 640  # preprocess_image_for_detection의 min_size (이보다 작은 프레임은 전처리 대상)
+REDUCED_MODES = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+# SOF0 ~ SOF15 (DHT=C4, JPG=C8, DAC=CC 제외)
+SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+decode_stats: Dict[str, float] = {"frames": 0, "reduced": 0, "full_decodes": 0, "decode_ms": 0.0, "full_decode_ms": 0.0,
+                                  "decoded_bytes": 0, "full_bytes": 0}
+
+
+def jpeg_size(buffer) -> Optional[Tuple[int, int]]:
+    """JPEG 헤더(SOF)의 (height, width) - 디코딩 없이 마커만 읽음, JPEG가 아니면 None"""
+    view = memoryview(buffer).cast("B")
+    if len(view) < 4 or view[0] != 0xFF or view[1] != 0xD8:
+        return None
+    pos = 2
+    while pos + 9 <= len(view):
+        if view[pos] != 0xFF:
+            return None
+        marker = view[pos + 1]
+        if marker == 0xFF:  # 채움 바이트
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # 길이 필드 없는 마커
+            pos += 2
+            continue
+        if marker in SOF_MARKERS:
+            return (view[pos + 5] << 8) | view[pos + 6], (view[pos + 7] << 8) | view[pos + 8]
+        pos += 2 + ((view[pos + 2] << 8) | view[pos + 3])
+    return None
+
+
+def reduction_factor(shape: Tuple[int, int], det_size: Tuple[int, int] = INSIGHTFACE_DET_SIZE,
+                     max_factor: int = DECODE_SCALE_MAX_FACTOR) -> int:
+    """
+    원본 (height, width) → 축소 디코딩 배율 (1, 2, 4, 8)
+
+    detector는 프레임을 비율을 유지해 det_size 안에 맞추므로,
+    축소한 프레임이 그 크기 이상이면 detection 결과는 원본 디코딩과 같은 해상도에서 나옵니다.
+    """
+    height, width = shape[:2]
+    if min(height, width) < MIN_REDUCE_SHORT_SIDE:
+        return 1
+    limit = max(width / det_size[0], height / det_size[1])  # 원본 → detector 입력 축소 비율의 역수
+    for factor in (8, 4, 2):
+        if factor <= max_factor and factor <= limit:
+            return factor
+    return 1
+
+
+class ScaledFrame:
+    """축소 디코딩한 프레임 + 원본 JPEG (원본 해상도는 full()을 처음 부를 때 디코딩)"""
+
+    def __init__(self, jpeg: np.ndarray, image: np.ndarray, full_shape: Tuple[int, int], factor: int):
+        self.jpeg = jpeg  # 받은 JPEG 바이트 (스냅샷은 다시 인코딩하지 않고 그대로 사용)
+        self.image = image  # detection용 프레임 (factor == 1이면 원본)
+        self.full_shape = tuple(full_shape)  # 원본 (height, width)
+        self.factor = factor
+        self._full: Optional[np.ndarray] = image if factor == 1 else None
+        self._lock = threading.Lock()
+
+    @property
+    def reduced(self) -> bool:
+        return self.factor > 1
+
+    def full(self) -> np.ndarray:
+        """원본 해상도 BGR 프레임 (디코딩 실패 시 축소 프레임)"""
+        with self._lock:
+            if self._full is None:
+                t0 = time.perf_counter()
+                full = cv2.imdecode(self.jpeg, cv2.IMREAD_COLOR)
+                decode_stats["full_decodes"] += 1
+                decode_stats["full_decode_ms"] += (time.perf_counter() - t0) * 1000
+                self._full = full if full is not None else self.image
+            return self._full
+
+    def recognition_input(self, img: np.ndarray, face,
+                          min_face_size: float = DECODE_FULL_RES_FACE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        recognition 정렬(norm_crop)에 쓸 (이미지, 랜드마크)
+
+        Args:
+            img: detection에 넣은 프레임 (face 좌표 기준, 축소 프레임)
+            face: 탐지된 Face
+
+        Returns:
+            축소 프레임에서 얼굴이 min_face_size보다 작으면 원본 프레임과 원본 좌표 랜드마크, 아니면 (img, face.kps)
+        """
+        x1, y1, x2, y2 = face.bbox[:4]
+        if not self.reduced or max(x2 - x1, y2 - y1) >= min_face_size:
+            return img, face.kps
+        scale = np.array([self.full_shape[1] / img.shape[1], self.full_shape[0] / img.shape[0]], dtype=np.float32)
+        return self.full(), face.kps * scale
+
+
+def decode_for_detection(jpeg: np.ndarray, det_size: Tuple[int, int] = INSIGHTFACE_DET_SIZE,
+                         max_factor: int = DECODE_SCALE_MAX_FACTOR) -> Optional[ScaledFrame]:
+    """
+    JPEG 버퍼(np.uint8) → detection 해상도로 디코딩한 ScaledFrame (디코딩 실패 시 None)
+    """
+    if jpeg.size == 0:
+        return None
+    t0 = time.perf_counter()
+    size = jpeg_size(jpeg)
+    factor = reduction_factor(size, det_size, max_factor) if size is not None else 1
+    image = cv2.imdecode(jpeg, REDUCED_MODES[factor] if factor > 1 else cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    if factor == 1:
+        full_shape = image.shape[:2]
+    else:
+        # EXIF 방향 정보가 있으면 디코딩 결과가 회전되어 있으므로 SOF 크기도 맞춰 돌림
+        full_shape = size if (image.shape[0] > image.shape[1]) == (size[0] > size[1]) else (size[1], size[0])
+    decode_stats["frames"] += 1
+    decode_stats["reduced"] += int(factor > 1)
+    decode_stats["decode_ms"] += (time.perf_counter() - t0) * 1000
+    decode_stats["decoded_bytes"] += image.nbytes
+    decode_stats["full_bytes"] += full_shape[0] * full_shape[1] * 3
+    return ScaledFrame(jpeg, image, full_shape, factor)
+
+
+def decode_summary() -> Dict:
+    """/api/health용 디코딩 통계"""
+    frames = max(decode_stats["frames"], 1)
+    return {
+        "frames": decode_stats["frames"],
+        "reduced_rate": round(decode_stats["reduced"] / frames, 4),
+        "avg_decode_ms": round(decode_stats["decode_ms"] / frames, 2),
+        "full_decodes": decode_stats["full_decodes"],
+        "avg_full_decode_ms": round(decode_stats["full_decode_ms"] / max(decode_stats["full_decodes"], 1), 2),
+        "avg_frame_mb": round(decode_stats["decoded_bytes"] / frames / 1e6, 2),
+        "avg_full_frame_mb": round(decode_stats["full_bytes"] / frames / 1e6, 2),
+    }
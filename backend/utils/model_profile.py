@@ -0,0 +1,377 @@
+# backend/utils/model_profile.py
+"""
+InsightFace 모델 구성 프로파일 + 단계별 실행 시간 측정
+
+buffalo_l에는 detection / recognition 외에 2D/3D 랜드마크, 성별/나이 모델이 들어 있고
+FaceAnalysis.get()은 로드된 모든 모델을 얼굴마다 실행합니다.
+인식 파이프라인은 bbox, kps(detection)와 embedding(recognition)만 사용하므로
+프로파일로 로드/실행할 모델을 고릅니다 (allowed_modules).
+
+프로파일:
+- recognition-only: detection + recognition (기본값)
+- with-landmarks: + landmark_2d_106, landmark_3d_68 (face.landmark_2d_106, face.pose 필요 시)
+- full: 모든 모델 (genderage 포함, 기존 동작)
+
+get_faces_batched()는 FaceAnalysis.get()과 같은 Face 객체를 돌려주지만,
+recognition은 프레임의 모든 얼굴 crop을 (F, 3, 112, 112) 하나로 묶어 session.run 한 번으로 실행합니다.
+
+INSIGHTFACE_QUANTIZED=1이면 backend/quantize_models.py로 만든 INT8 모델 팩(<name>_int8)을 로드합니다.
+"""
+import os
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import INSIGHTFACE_MODEL, INSIGHTFACE_DET_SIZE, INSIGHTFACE_PROFILE
+from backend.config import INSIGHTFACE_ROOT, INSIGHTFACE_QUANTIZED, QUANTIZED_PACK_SUFFIX
+from backend.config import RECOGNITION_BATCH_ENABLED, RECOGNITION_MAX_BATCH, ROI_DET_SIZE
+from backend.utils.device_config import (
+    get_device_id, safe_prepare_insightface, get_session_providers, apply_session_options,
+)
+from backend.utils.embedding_tag import set_active_model
+
+MODEL_PROFILES = {
+    "recognition-only": ["detection", "recognition"],
+    "with-landmarks": ["detection", "recognition", "landmark_2d_106", "landmark_3d_68"],
+    "full": None,  # allowed_modules=None → 모든 모델
+}
+DEFAULT_PROFILE = "recognition-only"
+QUANTIZATION_MANIFEST = "quantization.json"  # INT8 팩의 원본 / 전처리 정보
+
+
+class StageTimings:
+    """모델 단계별 누적 실행 시간 (detection은 프레임당, recognition_batch는 배치당, 나머지는 얼굴당 1회 호출)"""
+
+    def __init__(self):
+        self._stats: Dict[str, list] = {}  # {stage: [calls, total_ms]}
+
+    def record(self, stage: str, elapsed_ms: float):
+        stat = self._stats.setdefault(stage, [0, 0.0])
+        stat[0] += 1
+        stat[1] += elapsed_ms
+
+    def reset(self):
+        self._stats = {}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """{stage: {"calls", "total_ms", "avg_ms"}}"""
+        return {
+            stage: {"calls": calls, "total_ms": round(total, 3), "avg_ms": round(total / calls, 3)}
+            for stage, (calls, total) in self._stats.items()
+        }
+
+
+# 애플리케이션 전역 단계별 시간 (instrument_stage_timing으로 계측한 모델이 기록)
+stage_timings = StageTimings()
+
+
+def _timed(stage: str, fn, timings: StageTimings):
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings.record(stage, (time.perf_counter() - t0) * 1000)
+    return wrapper
+
+
+def instrument_stage_timing(app, timings: StageTimings = stage_timings):
+    """
+    FaceAnalysis의 모델별 실행 함수를 감싸서 단계별 시간 기록
+
+    detection은 det_model.detect, 나머지 모델은 model.get (얼굴당 호출)을 측정하고,
+    "total"에는 app.get 전체 시간을 기록합니다.
+    """
+    for taskname, task_model in app.models.items():
+        method = "detect" if taskname == "detection" else "get"
+        setattr(task_model, method, _timed(taskname, getattr(task_model, method), timings))
+    app.get = _timed("total", app.get, timings)
+    return app
+
+
+def resolve_profile(profile: Optional[str]) -> str:
+    """프로파일 이름 확인 (알 수 없는 이름이면 기본 프로파일)"""
+    profile = profile or INSIGHTFACE_PROFILE
+    if profile not in MODEL_PROFILES:
+        print(f"⚠️ 알 수 없는 모델 프로파일: {profile} → {DEFAULT_PROFILE} 사용 (가능: {', '.join(MODEL_PROFILES)})")
+        return DEFAULT_PROFILE
+    return profile
+
+
+def model_pack_dir(name: str) -> Path:
+    """InsightFace 모델 팩 디렉토리 (<INSIGHTFACE_ROOT>/models/<name>)"""
+    return Path(os.path.expanduser(INSIGHTFACE_ROOT)) / "models" / name
+
+
+def resolve_model_pack(name: str, quantized: bool = INSIGHTFACE_QUANTIZED) -> str:
+    """로드할 모델 팩 이름 (quantized면 INT8 팩, 아직 만들지 않았으면 FP32 팩)"""
+    if not quantized or name.endswith(QUANTIZED_PACK_SUFFIX):
+        return name
+    int8_name = name + QUANTIZED_PACK_SUFFIX
+    if (model_pack_dir(int8_name) / QUANTIZATION_MANIFEST).exists():
+        return int8_name
+    print(f"⚠️ INT8 모델 팩이 없습니다: {model_pack_dir(int8_name)} → FP32 팩 사용 "
+          f"(생성: python backend/quantize_models.py --model {name})")
+    return name
+
+
+def restore_preprocessing(app, name: str):
+    """
+    INT8 팩 모델의 입력 정규화 값(input_mean / input_std)을 FP32 원본 값으로 복원
+
+    ArcFaceONNX는 그래프 앞부분 노드 이름(Sub / Mul)으로 정규화 방식을 추정하는데,
+    양자화로 노드가 바뀌면 추정이 달라질 수 있으므로 양자화 시 기록한 값을 사용합니다.
+    """
+    manifest_path = model_pack_dir(name) / QUANTIZATION_MANIFEST
+    if not manifest_path.exists():
+        return
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    for task_model in app.models.values():
+        entry = manifest.get("models", {}).get(os.path.basename(task_model.model_file))
+        if entry is not None and entry.get("input_mean") is not None:
+            task_model.input_mean = entry["input_mean"]
+            task_model.input_std = entry["input_std"]
+
+
+def create_face_analysis(profile: Optional[str] = None, name: str = INSIGHTFACE_MODEL,
+                         det_size: Tuple[int, int] = INSIGHTFACE_DET_SIZE,
+                         device_id: Optional[int] = None,
+                         timings: Optional[StageTimings] = stage_timings,
+                         quantized: Optional[bool] = None) -> Tuple[object, int]:
+    """
+    프로파일에 맞는 FaceAnalysis 생성 + prepare (GPU 실패 시 CPU fallback) + ORT 세션 설정 적용
+
+    Args:
+        profile: MODEL_PROFILES 이름 (None이면 INSIGHTFACE_PROFILE)
+        name: InsightFace 모델 팩 이름 (INSIGHTFACE_QUANTIZED면 INT8 팩으로 대체)
+        det_size: detection 입력 크기
+        device_id: None이면 get_device_id()
+        timings: 단계별 시간 기록 대상 (None이면 계측 안 함)
+        quantized: INT8 팩 사용 여부 (None이면 INSIGHTFACE_QUANTIZED)
+
+    Returns:
+        (FaceAnalysis, 실제 사용된 device_id)
+    """
+    from insightface.app import FaceAnalysis
+
+    profile = resolve_profile(profile)
+    name = resolve_model_pack(name, INSIGHTFACE_QUANTIZED if quantized is None else quantized)
+    if device_id is None:
+        device_id = get_device_id()
+    app = FaceAnalysis(name=name, root=INSIGHTFACE_ROOT, allowed_modules=MODEL_PROFILES[profile],
+                       providers=get_session_providers(device_id))
+    restore_preprocessing(app, name)
+    actual_device_id = safe_prepare_insightface(app, device_id, det_size=det_size)
+    apply_session_options(app)  # 스레드 수 / 그래프 최적화 / 실행 모드 적용
+    app.profile = profile
+    app.model_pack = name
+    set_active_model(app)  # 갤러리 임베딩 모델 태그 (backend/utils/embedding_tag.py)
+    print(f"🧩 모델 프로파일: {profile} ({name}, det_size={det_size}, 로드된 모델: {', '.join(app.models.keys())})")
+    if timings is not None:
+        instrument_stage_timing(app, timings)
+    return app, actual_device_id
+
+
+def prepare_detector_sizes(app, sizes: List[Tuple[int, int]],
+                           timings: Optional[StageTimings] = stage_timings) -> Dict[Tuple[int, int], object]:
+    """
+    detection 입력 크기별 detector를 미리 생성 (app.det_models = {(width, height): detector})
+
+    크기마다 별도 ORT 세션을 두고 한 번씩 실행해 두므로, 스트림이 입력 크기를 바꿔도
+    세션 재생성이나 메모리 재할당 없이 바로 실행됩니다. 기존 detector는 app.det_size에 그대로 사용합니다.
+    """
+    from insightface.model_zoo import model_zoo
+
+    base = app.det_model
+    det_models = {tuple(app.det_size): base}
+    ctx_id = 0 if any(p != "CPUExecutionProvider" for p in base.session.get_providers()) else -1
+    for size in sizes:
+        size = tuple(size)
+        if size in det_models:
+            continue
+        detector = model_zoo.get_model(base.model_file, providers=base.session.get_providers())
+        detector.prepare(ctx_id, input_size=size, det_thresh=base.det_thresh, nms_thresh=base.nms_thresh)
+        det_models[size] = detector
+    app.det_models = det_models
+    apply_session_options(app, verbose=False)  # 새 detector에도 스레드 / 그래프 최적화 설정 적용
+    for size, detector in det_models.items():
+        detector.detect(np.zeros((size[1], size[0], 3), dtype=np.uint8), max_num=0, metric="default")  # 워밍업
+        if timings is not None and detector is not base:
+            detector.detect = _timed("detection", detector.detect, timings)
+    print(f"🔍 detection 입력 크기별 세션 준비: {', '.join(f'{w}x{h}' for w, h in sorted(det_models))}")
+    return det_models
+
+
+def detector_for(app, det_size: Optional[Tuple[int, int]] = None):
+    """입력 크기에 맞는 detector (미리 만들지 않은 크기면 기본 detector)"""
+    if det_size is None:
+        return app.det_model
+    return getattr(app, "det_models", {}).get(tuple(det_size), app.det_model)
+
+
+def recognition_batch_size(rec_model) -> int:
+    """recognition 모델이 받을 수 있는 batch 크기 (입력 batch 차원이 고정이면 그 값)"""
+    batch_dim = rec_model.session.get_inputs()[0].shape[0]
+    if isinstance(batch_dim, int) and batch_dim > 0:
+        return min(batch_dim, RECOGNITION_MAX_BATCH)
+    return RECOGNITION_MAX_BATCH
+
+
+def _embed_aligned(rec_model, aligned: List[np.ndarray], faces: List, timings: Optional[StageTimings]):
+    """aligned crop들을 recognition 배치 크기로 나눠 실행하고 face.embedding에 저장"""
+    batch_size = recognition_batch_size(rec_model)
+    for start in range(0, len(aligned), batch_size):
+        t0 = time.perf_counter()
+        feats = rec_model.get_feat(aligned[start:start + batch_size])
+        if timings is not None:
+            timings.record("recognition_batch", (time.perf_counter() - t0) * 1000)
+        for face, feat in zip(faces[start:start + batch_size], feats):
+            face.embedding = feat.flatten()
+
+
+def recognize_batch(rec_model, img: np.ndarray, faces: List, timings: Optional[StageTimings] = stage_timings):
+    """
+    얼굴들의 aligned crop을 NCHW 배치로 묶어 embedding 계산 (face.embedding에 저장)
+
+    ArcFaceONNX.get()과 같은 정렬(norm_crop)과 전처리(get_feat의 blobFromImages)를 사용하므로
+    얼굴별로 호출한 결과와 같은 embedding을 얻습니다.
+    """
+    from insightface.utils import face_align
+
+    aligned = [face_align.norm_crop(img, landmark=face.kps, image_size=rec_model.input_size[0]) for face in faces]
+    _embed_aligned(rec_model, aligned, faces, timings)
+
+
+def _detect_in_rois(detector, img: np.ndarray, rois: List[Tuple[int, int, int, int]]):
+    """ROI(x1, y1, x2, y2)별 detection → 프레임 좌표로 옮긴 (bboxes, kpss)"""
+    all_bboxes, all_kpss = [], []
+    for x1, y1, x2, y2 in rois:
+        bboxes, kpss = detector.detect(img[y1:y2, x1:x2], max_num=0, metric="default")
+        if bboxes.shape[0] == 0:
+            continue
+        bboxes = bboxes.copy()
+        bboxes[:, [0, 2]] += x1
+        bboxes[:, [1, 3]] += y1
+        all_bboxes.append(bboxes)
+        if kpss is not None:
+            all_kpss.append(kpss + np.array([x1, y1], dtype=kpss.dtype))
+    if not all_bboxes:
+        return np.zeros((0, 5), dtype=np.float32), None
+    return np.concatenate(all_bboxes), (np.concatenate(all_kpss) if all_kpss else None)
+
+
+def _detect_faces(app, img: np.ndarray, max_num: int, det_size: Optional[Tuple[int, int]] = None,
+                  rois: Optional[List[Tuple[int, int, int, int]]] = None) -> List:
+    """
+    detection + recognition 외 모델(랜드마크 등) 얼굴별 실행 → embedding 없는 Face 리스트
+
+    rois가 주어지면 전체 프레임 대신 그 영역들만 ROI_DET_SIZE detector로 탐지합니다 (빈 리스트면 탐지 안 함).
+    """
+    from insightface.app.common import Face
+
+    if rois is not None:
+        bboxes, kpss = _detect_in_rois(detector_for(app, ROI_DET_SIZE), img, rois)
+    else:
+        bboxes, kpss = detector_for(app, det_size).detect(img, max_num=max_num, metric="default")
+    faces = []
+    for i in range(bboxes.shape[0]):
+        face = Face(bbox=bboxes[i, 0:4], kps=kpss[i] if kpss is not None else None, det_score=bboxes[i, 4])
+        for taskname, task_model in app.models.items():
+            if taskname in ("detection", "recognition"):
+                continue
+            task_model.get(img, face)
+        faces.append(face)
+    return faces
+
+
+def get_faces_multi(app, imgs: List[np.ndarray], max_num: int = 0,
+                    timings: Optional[StageTimings] = stage_timings,
+                    det_sizes: Optional[List[Optional[Tuple[int, int]]]] = None,
+                    rois: Optional[List[Optional[List[Tuple[int, int, int, int]]]]] = None,
+                    rec_caches: Optional[List[Optional[object]]] = None,
+                    sources: Optional[List[Optional[object]]] = None) -> List[List]:
+    """
+    여러 프레임 처리: 프레임별 detection → 모든 프레임의 얼굴을 recognition 한 배치로 실행
+
+    Args:
+        det_sizes: 프레임별 detection 입력 크기 (None이면 기본 크기, prepare_detector_sizes로 준비한 크기 사용)
+        rois: 프레임별 탐지 영역 리스트 (None이면 전체 프레임, 트랙 주변 ROI detection)
+        rec_caches: 프레임별 RecognitionCache (재사용하는 얼굴은 recognition 생략, None이면 모든 얼굴 실행)
+        sources: 프레임별 ScaledFrame (축소 디코딩한 프레임의 작은 얼굴은 원본 해상도에서 정렬, None이면 img에서 정렬)
+
+    Returns:
+        프레임별 Face 리스트 (imgs와 같은 순서)
+    """
+    if det_sizes is None:
+        det_sizes = [None] * len(imgs)
+    if rois is None:
+        rois = [None] * len(imgs)
+    if rec_caches is None:
+        rec_caches = [None] * len(imgs)
+    if sources is None:
+        sources = [None] * len(imgs)
+    rec_model = app.models.get("recognition")
+    if not RECOGNITION_BATCH_ENABLED or rec_model is None:
+        if (all(size is None for size in det_sizes) and all(frame_rois is None for frame_rois in rois)
+                and all(cache is None for cache in rec_caches) and all(source is None for source in sources)):
+            return [app.get(img, max_num=max_num) for img in imgs]
+        # 입력 크기 / ROI / 재사용 캐시 / 축소 디코딩이 지정되면 detection만 따로 실행하고 recognition은 얼굴별 실행
+        from insightface.utils import face_align
+
+        results = []
+        for img, size, frame_rois, cache, source in zip(imgs, det_sizes, rois, rec_caches, sources):
+            faces = _detect_faces(app, img, max_num, size, frame_rois)
+            reused = cache.reuse(faces, img.shape[:2]) if cache is not None else [False] * len(faces)
+            if rec_model is not None:
+                for face, hit in zip(faces, reused):
+                    if hit:
+                        continue
+                    if source is None:
+                        rec_model.get(img, face)
+                        continue
+                    rec_img, kps = source.recognition_input(img, face)
+                    aligned = face_align.norm_crop(rec_img, landmark=kps, image_size=rec_model.input_size[0])
+                    face.embedding = rec_model.get_feat(aligned).flatten()
+            if cache is not None:
+                cache.update(faces)
+            results.append(faces)
+        return results
+    from insightface.utils import face_align
+
+    t0 = time.perf_counter()
+    faces_per_frame, all_faces, aligned = [], [], []
+    for img, size, frame_rois, cache, source in zip(imgs, det_sizes, rois, rec_caches, sources):
+        faces = _detect_faces(app, img, max_num, size, frame_rois)
+        faces_per_frame.append(faces)
+        reused = cache.reuse(faces, img.shape[:2]) if cache is not None else [False] * len(faces)
+        for face, hit in zip(faces, reused):
+            if hit:
+                continue
+            rec_img, kps = source.recognition_input(img, face) if source is not None else (img, face.kps)
+            aligned.append(face_align.norm_crop(rec_img, landmark=kps, image_size=rec_model.input_size[0]))
+            all_faces.append(face)
+    if all_faces:
+        _embed_aligned(rec_model, aligned, all_faces, timings)
+    for faces, cache in zip(faces_per_frame, rec_caches):
+        if cache is not None:
+            cache.update(faces)
+    if timings is not None and imgs:
+        frame_ms = (time.perf_counter() - t0) * 1000 / len(imgs)
+        for _ in imgs:
+            timings.record("total", frame_ms)
+    return faces_per_frame
+
+
+def get_faces_batched(app, img: np.ndarray, max_num: int = 0,
+                      timings: Optional[StageTimings] = stage_timings) -> List:
+    """
+    detection → (랜드마크 등 나머지 모델은 얼굴별) → recognition 배치 실행
+
+    FaceAnalysis.get()과 같은 Face 객체 리스트(bbox, kps, det_score, embedding, ...)를 반환합니다.
+    RECOGNITION_BATCH_ENABLED가 꺼져 있거나 recognition 모델이 없으면 app.get()을 그대로 사용합니다.
+    """
+    return get_faces_multi(app, [img], max_num=max_num, timings=timings)[0]
@@ -0,0 +1,70 @@
+# backend/utils/response_schema.py
+"""
+간결한 감지 응답 스키마 (COMPACT_RESPONSE_ENABLED)
+
+process_detection 결과를 그대로 보내면 학습 이벤트마다 512개 float 임베딩(.tolist())이 들어가고,
+얼굴마다 UI가 쓰지 않는 필드(color, yaw_angle, bank_type)가 붙습니다.
+전송용으로만 다음처럼 줄입니다 (결과 dict는 바꾸지 않으므로 학습 이벤트 저장은 그대로 임베딩 사용):
+
+- bbox: 정수 [x1, y1, x2, y2]
+- status: 짧은 코드 (STATUS_CODES, metadata.status 포함) - color는 status로 정해지므로 생략
+- confidence: 소수점 1자리
+- learning_events: person_id / angle_type / bank_type만 (임베딩 없음)
+- color / yaw_angle / bank_type / track_frames는 RESPONSE_DEBUG_FIELDS일 때만 포함
+
+응답 data에 "schema": "compact"를 넣고, 웹 UI는 web/modules/detection.js의 expandDetectionResult로
+기존 형태(status 전체 이름, color)로 되돌려 사용합니다.
+"""
+from typing import Dict
+
+from backend.config import RESPONSE_DEBUG_FIELDS
+
+SCHEMA_NAME = "compact"
+STATUS_CODES = {"criminal": "c", "normal": "n", "unknown": "u"}
+DETECTION_FIELDS = ("name", "person_id", "person_type", "angle_type", "snapshot_id", "snapshot_url")
+DEBUG_FIELDS = ("color", "yaw_angle", "bank_type")
+
+
+def compact_status(status):
+    return STATUS_CODES.get(status, status)
+
+
+def compact_detection(detection: Dict, debug: bool = RESPONSE_DEBUG_FIELDS) -> Dict:
+    """detection 한 개 → 전송용 dict"""
+    compact = {
+        "bbox": [int(round(float(v))) for v in detection["bbox"][:4]],
+        "status": compact_status(detection.get("status")),
+        "confidence": round(float(detection.get("confidence") or 0), 1),
+    }
+    for key in DETECTION_FIELDS + (DEBUG_FIELDS if debug else ()):
+        if detection.get(key) is not None:
+            compact[key] = detection[key]
+    if debug and compact.get("yaw_angle") is not None:
+        compact["yaw_angle"] = round(float(compact["yaw_angle"]), 1)
+    return compact
+
+
+def compact_learning_event(event: Dict, debug: bool = RESPONSE_DEBUG_FIELDS) -> Dict:
+    """학습 이벤트 → 임베딩을 뺀 알림용 dict"""
+    compact = {key: event.get(key) for key in ("person_id", "angle_type", "bank_type")}
+    if debug and event.get("track_frames") is not None:
+        compact["track_frames"] = event["track_frames"]
+    return compact
+
+
+def compact_result(result: Dict, debug: bool = RESPONSE_DEBUG_FIELDS) -> Dict:
+    """
+    process_detection / apply_temporal_filter 결과 → 전송용 dict (result는 수정하지 않음)
+
+    detections / metadata / learning_events 외의 키는 그대로 유지합니다.
+    """
+    compact = dict(result)
+    compact["schema"] = SCHEMA_NAME
+    compact["detections"] = [compact_detection(det, debug) for det in result.get("detections", [])]
+    metadata = result.get("metadata")
+    if metadata:
+        compact["metadata"] = {**metadata, "status": compact_status(metadata.get("status"))}
+        if metadata.get("confidence") is not None:
+            compact["metadata"]["confidence"] = round(float(metadata["confidence"]), 1)
+    compact["learning_events"] = [compact_learning_event(event, debug) for event in result.get("learning_events", [])]
+    return compact
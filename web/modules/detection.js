@@ -4,6 +4,31 @@ import { getAngleDisplayText } from "./utils.js";
 
 const UI = initUI();
 
+// 간결한 응답 스키마(COMPACT_RESPONSE_ENABLED)의 상태 코드 → 기존 상태 이름
+const STATUS_NAMES = { c: 'criminal', n: 'normal', u: 'unknown' };
+const STATUS_COLORS = { criminal: 'red', normal: 'green', unknown: 'yellow' };
+
+// 감지 응답을 기존 형태로 복원 (schema가 compact일 때만, 아니면 그대로 반환)
+export function expandDetectionResult(data) {
+    if (!data || data.schema !== 'compact') {
+        return data;
+    }
+    const expandStatus = status => STATUS_NAMES[status] || status;
+    data.detections = (data.detections || []).map(detection => {
+        const status = expandStatus(detection.status);
+        return {
+            ...detection,
+            status: status,
+            color: detection.color || STATUS_COLORS[status] || 'yellow',
+            name: detection.name || 'Unknown'
+        };
+    });
+    if (data.metadata) {
+        data.metadata = { ...data.metadata, status: expandStatus(data.metadata.status) };
+    }
+    return data;
+}
+
 // 박스를 캔버스에 그리기
 export function drawDetections(detections, videoWidth, videoHeight) {
     // AI 감지가 비활성화되어 있으면 캔버스 클리어하고 리턴
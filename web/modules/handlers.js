@@ -5,7 +5,8 @@ import {
     renderSnapshotCard,
     filterSnapshotsByPerson,
     updateSnapshotCheckboxes,
-    updateSelectedCount
+    updateSelectedCount,
+    downloadSnapshotImage
 } from './snapshots.js';
 import { downloadVideoClip } from './clips.js';
 import { updatePersonCategory, checkFormValidity, closeEnrollModal } from './enroll.js';
@@ -183,10 +184,11 @@ export async function handleDownloadSelectedSnapshots() {
 
     for (let i = 0; i < selectedSnapshots.length; i++) {
         const snapshot = selectedSnapshots[i];
-        const link = document.createElement('a');
-        link.href = snapshot.base64Image;
-        link.download = `${i + 1}_criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`;
-        link.click();
+        try {
+            await downloadSnapshotImage(snapshot, `${i + 1}_criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`);
+        } catch (error) {
+            console.error(`❌ 스냅샷 다운로드 실패: ${snapshot.id}`, error);
+        }
 
         if (i < selectedSnapshots.length - 1) {
             await new Promise(resolve => setTimeout(resolve, 100));
@@ -220,10 +222,11 @@ export async function handleDownloadAllSnapshots() {
 
     for (let i = 0; i < filteredSnapshots.length; i++) {
         const snapshot = filteredSnapshots[i];
-        const link = document.createElement('a');
-        link.href = snapshot.base64Image;
-        link.download = `${i + 1}_criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`;
-        link.click();
+        try {
+            await downloadSnapshotImage(snapshot, `${i + 1}_criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`);
+        } catch (error) {
+            console.error(`❌ 스냅샷 다운로드 실패: ${snapshot.id}`, error);
+        }
 
         await new Promise(resolve => setTimeout(resolve, 300));
     }
@@ -353,7 +356,7 @@ window.downloadClip = function (clipId) {
 };
 
 // 스냅샷 다운로드
-window.downloadSnapshot = function (snapshotId) {
+window.downloadSnapshot = async function (snapshotId) {
     const snapshot = state.snapshots.find(s => s.id === snapshotId);
     if (!snapshot) {
         console.error(`스냅샷을 찾을 수 없습니다: ${snapshotId}`);
@@ -366,8 +369,9 @@ window.downloadSnapshot = function (snapshotId) {
         return `${mins}:${secs.toString().padStart(2, '0')}`;
     };
 
-    const link = document.createElement('a');
-    link.href = snapshot.base64Image;
-    link.download = `criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`;
-    link.click();
+    try {
+        await downloadSnapshotImage(snapshot, `criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`);
+    } catch (error) {
+        console.error(`❌ 스냅샷 다운로드 실패: ${snapshot.id}`, error);
+    }
 };
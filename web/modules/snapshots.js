@@ -22,7 +22,7 @@ export function renderSnapshotCard(snapshot) {
                                ${isSelected ? 'checked' : ''}
                                onchange="toggleSnapshotSelection(${snapshot.id}, this.checked)">
                     </div>
-                    <img src="${snapshot.base64Image}" alt="${displayName}" class="w-full h-48 object-cover cursor-pointer" 
+                    <img src="${snapshot.imageSrc}" alt="${displayName}" class="w-full h-48 object-cover cursor-pointer" 
                          onclick="window.open(this.src)">
                     <div class="p-3">
                         <div class="font-semibold text-sm text-gray-800 tracking-tight">${displayName}</div>
@@ -34,6 +34,22 @@ export function renderSnapshotCard(snapshot) {
     `;
 }
 
+// 스냅샷 이미지 다운로드 (imageSrc는 /api/snapshots/{id} URL 또는 data URL)
+// URL을 그대로 link.href에 넣으면 download 속성이 무시되고 새 탭으로 열리거나
+// 만료된 스냅샷이 오류 페이지로 저장되므로, 이미지를 blob으로 받아서 저장
+export async function downloadSnapshotImage(snapshot, filename) {
+    const response = await fetch(snapshot.imageSrc);
+    if (!response.ok) {
+        throw new Error(`스냅샷 이미지를 받을 수 없습니다 (HTTP ${response.status})`);
+    }
+    const objectUrl = URL.createObjectURL(await response.blob());
+    const link = document.createElement('a');
+    link.href = objectUrl;
+    link.download = filename;
+    link.click();
+    setTimeout(() => URL.revokeObjectURL(objectUrl), 1000);
+}
+
 // 스냅샷 그리드 필터링 함수
 export function filterSnapshotsByPerson(personName) {
     const grid = document.getElementById('snapshotGrid');
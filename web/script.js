@@ -42,7 +42,8 @@ import {
     filterSnapshotsByPerson,
     toggleSnapshotSelection,
     updateSelectedCount,
-    updateSnapshotCheckboxes
+    updateSnapshotCheckboxes,
+    downloadSnapshotImage
 } from './modules/snapshots.js';
 
 import {
@@ -54,7 +55,8 @@ import {
 
 import {
     drawDetections,
-    captureVideoFrame
+    captureVideoFrame,
+    expandDetectionResult
 } from './modules/detection.js';
 
 import {
@@ -534,7 +536,7 @@ function handleWebSocketMessage(message) {
     console.log('📨 WebSocket 메시지 수신:', msgType);
 
     if (msgType === "detection") {
-        const data = message.data;
+        const data = expandDetectionResult(message.data);
         state.lastDetections = data.detections;
         state.lastDetectionTime = Date.now();
 
@@ -567,8 +569,8 @@ function handleWebSocketMessage(message) {
 
         // 2. 선택된 인물들에 대해 처리 (타임라인 마커, 스냅샷, 클립)
         if (detectedSelectedPersons.length > 0) {
-            // 스냅샷 이미지는 공유 (없으면 캡처)
-            let snapshotImage = data.snapshot_base64;
+            // 스냅샷 이미지는 공유 (서버 스냅샷 URL → 기존 base64 → 없으면 캡처)
+            let snapshotImage = data.snapshot_url || data.snapshot_base64;
             if (!snapshotImage) {
                 snapshotImage = captureVideoFrame();
             }
@@ -590,7 +592,7 @@ function handleWebSocketMessage(message) {
                         personName: personName,
                         isCriminal: isCriminal,
                         similarity: personData.confidence || personData.metadata?.confidence || 0,
-                        base64Image: snapshotImage,
+                        imageSrc: personData.snapshot_url || snapshotImage,  // 인물별 얼굴 스냅샷 우선
                         status: isCriminal ? 'criminal' : 'missing'
                     };
                     state.snapshots.push(snapshot);
@@ -653,7 +655,7 @@ function handleWebSocketMessage(message) {
                 };
 
                 // 스냅샷 이미지 가져오기
-                let snapshotImage = data.snapshot_base64;
+                let snapshotImage = data.snapshot_url || data.snapshot_base64;
                 if (!snapshotImage && detectedSelectedPersons.length > 0) {
                     snapshotImage = captureVideoFrame();
                 }
@@ -752,7 +754,7 @@ async function detectFrameToServerHTTP(frameData) {
             throw new Error(`HTTP error! status: ${response.status}, body: ${errorText}`);
         }
 
-        const result = await response.json();
+        const result = expandDetectionResult(await response.json());
 
         if (result && result.success) {
             state.lastDetections = result.detections;
@@ -787,8 +789,8 @@ async function detectFrameToServerHTTP(frameData) {
 
             // 2. 선택된 인물들에 대해 처리 (타임라인 마커, 스냅샷, 클립)
             if (detectedSelectedPersons.length > 0) {
-                // 스냅샷 이미지는 공유 (없으면 캡처)
-                let snapshotImage = result.snapshot_base64;
+                // 스냅샷 이미지는 공유 (서버 스냅샷 URL → 기존 base64 → 없으면 캡처)
+                let snapshotImage = result.snapshot_url || result.snapshot_base64;
                 if (!snapshotImage) {
                     snapshotImage = captureVideoFrame();
                 }
@@ -810,7 +812,7 @@ async function detectFrameToServerHTTP(frameData) {
                             personName: personName,
                             isCriminal: isCriminal,
                             similarity: personData.metadata?.confidence || 0,
-                            base64Image: snapshotImage,
+                            imageSrc: personData.snapshot_url || snapshotImage,  // 인물별 얼굴 스냅샷 우선
                             status: isCriminal ? 'criminal' : 'missing'
                         };
                         state.snapshots.push(snapshot);
@@ -873,7 +875,7 @@ async function detectFrameToServerHTTP(frameData) {
                     };
 
                     // 스냅샷 이미지 가져오기
-                    let snapshotImage = result.snapshot_base64;
+                    let snapshotImage = result.snapshot_url || result.snapshot_base64;
                     if (!snapshotImage && detectedSelectedPersons.length > 0) {
                         snapshotImage = captureVideoFrame();
                     }
@@ -927,7 +929,7 @@ async function detectFrameToServerHTTP(frameData) {
             // 알림 및 로그 업데이트
             if (result.alert) {
                 UI.video.parentElement.classList.add('alert-border');
-                const snapshotImage = result.snapshot_base64 || null;
+                const snapshotImage = result.snapshot_url || result.snapshot_base64 || null;
                 const videoTime = UI.video && !isNaN(UI.video.currentTime) ? UI.video.currentTime : 0;
                 updateDetectionPanel(result.metadata, true, videoTime, snapshotImage);
             } else {
@@ -1772,10 +1774,11 @@ document.getElementById('downloadSelectedBtn')?.addEventListener('click', async
     // 순차적으로 다운로드
     for (let i = 0; i < selectedSnapshots.length; i++) {
         const snapshot = selectedSnapshots[i];
-        const link = document.createElement('a');
-        link.href = snapshot.base64Image;
-        link.download = `${i + 1}_criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`;
-        link.click();
+        try {
+            await downloadSnapshotImage(snapshot, `${i + 1}_criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`);
+        } catch (error) {
+            console.error(`❌ 스냅샷 다운로드 실패: ${snapshot.id}`, error);
+        }
 
         // 다운로드 간 약간의 딜레이 (브라우저가 처리할 시간 제공)
         if (i < selectedSnapshots.length - 1) {
@@ -1812,10 +1815,11 @@ document.getElementById('downloadAllBtn')?.addEventListener('click', async () =>
     // 순차적으로 다운로드
     for (let i = 0; i < filteredSnapshots.length; i++) {
         const snapshot = filteredSnapshots[i];
-        const link = document.createElement('a');
-        link.href = snapshot.base64Image;
-        link.download = `${i + 1}_criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`;
-        link.click();
+        try {
+            await downloadSnapshotImage(snapshot, `${i + 1}_criminal_${snapshot.personName}_${formatTime(snapshot.videoTime).replace(':', '-')}.jpg`);
+        } catch (error) {
+            console.error(`❌ 스냅샷 다운로드 실패: ${snapshot.id}`, error);
+        }
 
         // 브라우저가 따라잡을 시간 주기
         await new Promise(resolve => setTimeout(resolve, 300));
@@ -1992,7 +1996,7 @@ if (dispatchReportBtn) {
                 bestSnapshot = targetSnapshots[0];
                 maxConfidence = parseFloat(bestSnapshot.similarity || 0);
                 timeText = `영상 ${formatTime(bestSnapshot.videoTime)} 지점`;
-                snapshotImgSrc = bestSnapshot.base64Image;
+                snapshotImgSrc = bestSnapshot.imageSrc;
 
                 // 고신뢰도 시점 리스트 (90% 이상)
                 const highConfSnaps = targetSnapshots.filter(snap => parseFloat(snap.similarity || 0) >= 90);